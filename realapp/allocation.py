@@ -0,0 +1,220 @@
+# Copyright (c) 2025, surendhranath
+# For license information, please see license.txt
+
+"""
+Allocation of customer receipts across a booking's milestone invoices.
+
+A receipt (a draft Payment Entry carrying `booking_order`) is spread over
+the booking's open Sales Invoices oldest-due-first. Open invoices are read
+in one query (one query per batch in bulk mode) and the references are
+built in a single pass; anything beyond the total outstanding stays on the
+Payment Entry as an unallocated advance.
+"""
+
+import frappe
+from frappe.utils import cint, flt, getdate, today
+
+from realapp.instrumentation import instrument
+from realapp.realapp.doctype.booking_order.booking_order import ensure_customer_from_party
+
+
+@frappe.whitelist(methods=["POST"])
+@instrument()
+def allocate_payment_entry(payment_entry):
+    """Fill the references of one draft receipt from its booking's open invoices."""
+    pe = frappe.get_doc("Payment Entry", payment_entry)
+    pe.check_permission("write")
+    _validate_receipt(pe)
+
+    invoices = get_open_invoices([pe.booking_order]).get(pe.booking_order, [])
+    apply_allocation(pe, invoices)
+    pe.save()
+    return pe.name
+
+
+@frappe.whitelist(methods=["POST"])
+@instrument()
+def make_receipt(booking_order, amount, mode_of_payment=None, posting_date=None, reference_no=None, reference_date=None):
+    """Draft Payment Entry for a lump-sum receipt, already allocated across the booking's invoices."""
+    frappe.has_permission("Payment Entry", "create", throw=True)
+    bo = frappe.db.get_value(
+        "Booking Order", booking_order, ["company", "party_type", "party", "docstatus"], as_dict=True
+    )
+    if not bo or bo.docstatus != 1:
+        frappe.throw(f"Booking Order {booking_order} must be submitted to receive payments.")
+
+    invoices = get_open_invoices([booking_order]).get(booking_order, [])
+    pe = frappe.get_doc({
+        "doctype": "Payment Entry",
+        "payment_type": "Receive",
+        "company": bo.company,
+        "posting_date": posting_date or today(),
+        "mode_of_payment": mode_of_payment,
+        "party_type": "Customer",
+        "party": _receipt_customer(bo, invoices),
+        "booking_order": booking_order,
+        "paid_amount": flt(amount),
+        "received_amount": flt(amount),
+        "reference_no": reference_no,
+        "reference_date": reference_date or posting_date or today(),
+    })
+    pe.paid_to = _receiving_account(bo.company, mode_of_payment)
+    apply_allocation(pe, invoices)
+    pe.insert()
+    return pe.name
+
+
+@frappe.whitelist(methods=["POST"])
+def enqueue_receipt_allocation(posting_date=None, submit=0):
+    """Allocate a whole day's draft receipts in a background job."""
+    frappe.only_for(("Accounts Manager", "System Manager"))
+    posting_date = str(getdate(posting_date or today()))
+    frappe.enqueue(
+        "realapp.allocation.allocate_pending_receipts",
+        queue="long",
+        job_id=f"realapp-allocate-receipts-{posting_date}",
+        deduplicate=True,
+        enqueue_after_commit=True,
+        posting_date=posting_date,
+        submit=cint(submit),
+    )
+
+
+def allocate_pending_receipts(posting_date=None, submit=False, commit=True):
+    """
+    Bulk mode: allocate every unallocated draft receipt of the day that
+    carries a Booking Order. Open invoices for all of them are prefetched
+    in one query; each receipt is saved (and optionally submitted) on its own
+    so one bad receipt does not hold back the rest.
+    """
+    receipts = frappe.get_all(
+        "Payment Entry",
+        filters={
+            "docstatus": 0,
+            "payment_type": "Receive",
+            "posting_date": getdate(posting_date or today()),
+            "booking_order": ("is", "set"),
+        },
+        fields=["name", "booking_order"],
+        order_by="creation",
+    )
+    if not receipts:
+        return {"allocated": [], "failed": []}
+
+    open_invoices = get_open_invoices({r.booking_order for r in receipts})
+    allocated, failed = [], []
+    for r in receipts:
+        invoices = open_invoices.get(r.booking_order, [])
+        before = [inv.outstanding_amount for inv in invoices]
+        frappe.db.savepoint("realapp_allocation")
+        try:
+            pe = frappe.get_doc("Payment Entry", r.name)
+            if pe.get("references"):
+                continue
+            # receipts of the same booking draw down the same invoices in order
+            apply_allocation(pe, invoices)
+            pe.save(ignore_permissions=True)
+            if submit:
+                pe.submit()
+            allocated.append(pe.name)
+            if commit:
+                frappe.db.commit()
+        except Exception:
+            frappe.db.rollback(save_point="realapp_allocation")
+            for inv, outstanding in zip(invoices, before):
+                inv.outstanding_amount = outstanding
+            frappe.log_error(title=f"Receipt allocation failed for {r.name}")
+            failed.append(r.name)
+
+    return {"allocated": allocated, "failed": failed}
+
+
+def get_open_invoices(booking_orders):
+    """Open milestone invoices per Booking Order, oldest due first."""
+    if not booking_orders:
+        return {}
+
+    out = {}
+    for row in frappe.db.sql(
+        """
+        SELECT name, booking_order, customer, due_date, posting_date, grand_total, rounded_total, outstanding_amount
+        FROM `tabSales Invoice`
+        WHERE docstatus = 1 AND booking_order IN %(booking_orders)s AND outstanding_amount > 0
+        ORDER BY booking_order, due_date, posting_date, name
+        """,
+        {"booking_orders": tuple(booking_orders)},
+        as_dict=True,
+    ):
+        out.setdefault(row.booking_order, []).append(row)
+    return out
+
+
+def allocate(amount, invoices):
+    """[(invoice, allocated_amount)] spreading `amount` over `invoices` in order."""
+    remaining, out = flt(amount, 2), []
+    for inv in invoices:
+        if remaining <= 0:
+            break
+        share = min(remaining, flt(inv.outstanding_amount, 2))
+        if share > 0:
+            out.append((inv, share))
+            remaining = flt(remaining - share, 2)
+    return out
+
+
+def apply_allocation(pe, invoices):
+    """Replace the receipt's references with an oldest-due-first allocation; consumes invoice outstanding."""
+    pe.set("references", [])
+    # a booking's invoices are all billed to one customer; anything else cannot be settled by this receipt
+    invoices = [inv for inv in invoices if inv.customer == pe.party]
+    for inv, share in allocate(pe.paid_amount, invoices):
+        pe.append("references", {
+            "reference_doctype": "Sales Invoice",
+            "reference_name": inv.name,
+            "due_date": inv.due_date,
+            "total_amount": inv.rounded_total or inv.grand_total,
+            "outstanding_amount": inv.outstanding_amount,
+            "allocated_amount": share,
+        })
+        inv.outstanding_amount = flt(inv.outstanding_amount - share, 2)
+
+    if not pe.get("paid_from"):
+        pe.paid_from = _receivable_account(pe)
+
+
+# ----------------- Helpers -----------------
+
+def _validate_receipt(pe):
+    if pe.docstatus != 0:
+        frappe.throw(f"Payment Entry {pe.name} is already submitted.")
+    if pe.payment_type != "Receive" or pe.party_type != "Customer":
+        frappe.throw("Only customer receipts can be allocated to a Booking Order.")
+    if not pe.get("booking_order"):
+        frappe.throw(f"Set the Booking Order on Payment Entry {pe.name} first.")
+
+
+def _receipt_customer(bo, invoices):
+    """The customer the booking is invoiced to; Leads and Opportunities are converted as for invoicing."""
+    if invoices:
+        return invoices[0].customer
+    if bo.party_type == "Customer":
+        return bo.party
+    return ensure_customer_from_party(bo.party, bo.party_type).name
+
+
+def _receivable_account(pe):
+    from erpnext.accounts.party import get_party_account
+
+    return get_party_account("Customer", pe.party, pe.company)
+
+
+def _receiving_account(company, mode_of_payment=None):
+    if mode_of_payment:
+        account = frappe.db.get_value(
+            "Mode of Payment Account", {"parent": mode_of_payment, "company": company}, "default_account"
+        )
+        if account:
+            return account
+    return frappe.get_cached_value("Company", company, "default_bank_account") or frappe.get_cached_value(
+        "Company", company, "default_cash_account"
+    )
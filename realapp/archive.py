@@ -0,0 +1,284 @@
+# Copyright (c) 2025, surendhranath
+# For license information, please see license.txt
+
+"""
+Retention for stale quotes and cancelled bookings.
+
+When archival is enabled in Realapp Settings, `archive_stale_documents` runs
+daily and moves out draft Cost Sheets that no Booking Order refers to, and
+cancelled Booking Orders that no draft or submitted document refers to,
+once they are older than the configured number of days. Each document
+becomes one Realapp Archive entry: its raw rows, child rows and the
+Version, Comment, File and ToDo rows attached to it as compressed JSON, next
+to the few fields needed to find it (doctype, name, project, unit, party).
+A Cost Sheet keeps its `booking_order` only while that booking exists, so
+archiving a booking clears it there and the entry remembers where.
+Documents are taken oldest first in chunks, each chunk in its own
+transaction, and each policy stops after MAX_CHUNKS_PER_POLICY so a large
+backlog drains over several nights without holding up the other doctypes.
+`restore_archived` writes the rows back as they were.
+"""
+
+import base64
+import json
+import zlib
+
+import frappe
+from frappe.utils import add_days, cint, now, now_datetime
+
+from realapp.utils import bulk_insert_rows
+
+MAX_CHUNKS_PER_POLICY = 20
+ARCHIVE_FIELDS = (
+    "reference_doctype",
+    "reference_name",
+    "reason",
+    "document_modified",
+    "project",
+    "unit",
+    "party",
+    "payload",
+)
+# rows attached to a document by (doctype field, name field); archived and restored with it
+DEPENDENTS = {
+    "Version": ("ref_doctype", "docname"),
+    "Comment": ("reference_doctype", "reference_name"),
+    "File": ("attached_to_doctype", "attached_to_name"),
+    "ToDo": ("reference_type", "reference_name"),
+}
+POLICIES = {
+    "Cost Sheet": {
+        "reason": "Stale Draft",
+        "setting": "archive_drafts_after_days",
+        # reached through either link, a booking keeps its quote, even cancelled (it can be amended)
+        "conditions": """
+            d.docstatus = 0
+            AND NOT EXISTS (SELECT 1 FROM `tabBooking Order` bo WHERE bo.name = d.booking_order)
+            AND NOT EXISTS (SELECT 1 FROM `tabBooking Order` bo WHERE bo.cost_sheet = d.name)
+        """,
+    },
+    "Booking Order": {
+        "reason": "Cancelled",
+        "setting": "archive_cancelled_after_days",
+        # anything that can still be saved or amended would fail its link validation;
+        # Cost Sheet.booking_order is cleared instead (see _clear_back_links)
+        "conditions": """
+            d.docstatus = 2
+            AND NOT EXISTS (
+                SELECT 1 FROM `tabBooking Order` bo WHERE bo.amended_from = d.name AND bo.docstatus < 2
+            )
+            AND NOT EXISTS (
+                SELECT 1 FROM `tabSales Invoice` si WHERE si.booking_order = d.name AND si.docstatus < 2
+            )
+            AND NOT EXISTS (
+                SELECT 1 FROM `tabPayment Entry` pe WHERE pe.booking_order = d.name AND pe.docstatus < 2
+            )
+            AND NOT EXISTS (SELECT 1 FROM `tabDemand Letter` dl WHERE dl.booking_order = d.name)
+            AND NOT EXISTS (SELECT 1 FROM `tabInterest Accrual` ia WHERE ia.booking_order = d.name)
+            AND NOT EXISTS (SELECT 1 FROM `tabBank Statement Line` bsl WHERE bsl.booking_order = d.name)
+        """,
+    },
+}
+
+
+def archive_stale_documents(commit=True):
+    """Daily job: archive documents past the retention in Realapp Settings; returns the count per doctype."""
+    settings = frappe.get_cached_doc("Realapp Settings")
+    if not cint(settings.get("enable_archival")):
+        return {}
+
+    batch_size = cint(settings.get("archive_batch_size")) or 500
+    archived = {}
+    for doctype, policy in POLICIES.items():
+        days = cint(settings.get(policy["setting"]))
+        if days <= 0:
+            continue
+        cutoff = add_days(now_datetime(), -days)
+
+        # each policy has its own budget, so a backlog of one doctype does not starve the next
+        for _chunk in range(MAX_CHUNKS_PER_POLICY):
+            names = get_archivable(doctype, cutoff, batch_size)
+            if not names:
+                break
+            archive_documents(doctype, names, policy["reason"])
+            archived[doctype] = archived.get(doctype, 0) + len(names)
+            if commit:
+                frappe.db.commit()
+
+    return archived
+
+
+def get_archivable(doctype, cutoff, limit):
+    # archived rows leave the table, so every chunk starts from the oldest remaining one
+    return frappe.db.sql_list(
+        f"""
+        SELECT d.name FROM `tab{doctype}` d
+        WHERE d.modified < %(cutoff)s AND {POLICIES[doctype]["conditions"]}
+        ORDER BY d.modified, d.name
+        LIMIT %(limit)s
+        """,
+        {"cutoff": cutoff, "limit": limit},
+    )
+
+
+def archive_documents(doctype, names, reason):
+    """Move the documents, their child rows and attached rows into Realapp Archive entries."""
+    names = tuple(names)
+    docs = frappe.db.sql(f"SELECT * FROM `tab{doctype}` WHERE name IN %(names)s", {"names": names}, as_dict=True)
+    children = _child_rows(doctype, names)
+    dependents = _dependent_rows(doctype, names)
+    back_links = _clear_back_links(doctype, names)
+
+    bulk_insert_rows(
+        "Realapp Archive",
+        ARCHIVE_FIELDS,
+        [
+            {
+                "reference_doctype": doctype,
+                "reference_name": d.name,
+                "reason": reason,
+                "document_modified": d.modified,
+                "project": d.get("project"),
+                "unit": d.get("unit"),
+                "party": d.get("party"),
+                "payload": encode_payload({
+                    "doc": d,
+                    "children": children.get(d.name, {}),
+                    "dependents": dependents.get(d.name, {}),
+                    "back_links": back_links.get(d.name, []),
+                }),
+            }
+            for d in docs
+        ],
+    )
+
+    for child_doctype in {df.options for df in frappe.get_meta(doctype).get_table_fields()}:
+        frappe.db.sql(
+            f"DELETE FROM `tab{child_doctype}` WHERE parenttype = %(doctype)s AND parent IN %(names)s",
+            {"doctype": doctype, "names": names},
+        )
+    for dependent, (doctype_field, name_field) in DEPENDENTS.items():
+        frappe.db.sql(
+            f"DELETE FROM `tab{dependent}` WHERE `{doctype_field}` = %(doctype)s AND `{name_field}` IN %(names)s",
+            {"doctype": doctype, "names": names},
+        )
+    frappe.db.sql(f"DELETE FROM `tab{doctype}` WHERE name IN %(names)s", {"names": names})
+    for name in names:
+        frappe.clear_document_cache(doctype, name)
+
+
+def restore_archived(archive):
+    """Write an archived document back from its Realapp Archive entry; returns its doctype and name."""
+    entry = frappe.db.get_value(
+        "Realapp Archive", archive, ["reference_doctype", "reference_name", "payload"], as_dict=True
+    )
+    if not entry:
+        frappe.throw(f"Realapp Archive {archive} not found.")
+    frappe.has_permission(entry.reference_doctype, "create", throw=True)
+    if frappe.db.exists(entry.reference_doctype, entry.reference_name):
+        frappe.throw(f"{entry.reference_doctype} {entry.reference_name} already exists.")
+
+    payload = decode_payload(entry.payload)
+    cost_sheet = entry.reference_doctype == "Booking Order" and payload["doc"].get("cost_sheet")
+    if cost_sheet and not frappe.db.exists("Cost Sheet", cost_sheet):
+        frappe.throw(f"Restore Cost Sheet {cost_sheet} first; Booking Order {entry.reference_name} links to it.")
+
+    _insert_raw(entry.reference_doctype, [payload["doc"]])
+    for child_doctype, rows in payload["children"].items():
+        _insert_raw(child_doctype, rows)
+    for dependent, rows in payload.get("dependents", {}).items():
+        _insert_raw(dependent, rows)
+    _restore_back_links(entry.reference_name, payload.get("back_links") or [])
+
+    # a fresh timestamp keeps it out of the next archival run and puts it back on change feeds
+    frappe.db.set_value(
+        entry.reference_doctype, entry.reference_name, "modified", now(), update_modified=False
+    )
+    frappe.clear_document_cache(entry.reference_doctype, entry.reference_name)
+    frappe.db.delete("Realapp Archive", archive)
+    return {"doctype": entry.reference_doctype, "name": entry.reference_name}
+
+
+def encode_payload(payload):
+    return base64.b64encode(zlib.compress(json.dumps(payload, default=str, separators=(",", ":")).encode())).decode()
+
+
+def decode_payload(payload):
+    return json.loads(zlib.decompress(base64.b64decode(payload)))
+
+
+# ----------------- Helpers -----------------
+
+def _child_rows(doctype, names):
+    """{parent: {child doctype: [raw rows]}} for all table fields, one query per child table."""
+    out = {}
+    for child_doctype in {df.options for df in frappe.get_meta(doctype).get_table_fields()}:
+        for row in frappe.db.sql(
+            f"""
+            SELECT * FROM `tab{child_doctype}`
+            WHERE parenttype = %(doctype)s AND parent IN %(names)s
+            ORDER BY parent, parentfield, idx
+            """,
+            {"doctype": doctype, "names": names},
+            as_dict=True,
+        ):
+            out.setdefault(row.parent, {}).setdefault(child_doctype, []).append(row)
+    return out
+
+
+def _dependent_rows(doctype, names):
+    """{name: {dependent doctype: [raw rows]}} for the DEPENDENTS, one query each."""
+    out = {}
+    for dependent, (doctype_field, name_field) in DEPENDENTS.items():
+        for row in frappe.db.sql(
+            f"""
+            SELECT * FROM `tab{dependent}`
+            WHERE `{doctype_field}` = %(doctype)s AND `{name_field}` IN %(names)s
+            ORDER BY creation
+            """,
+            {"doctype": doctype, "names": names},
+            as_dict=True,
+        ):
+            out.setdefault(row[name_field], {}).setdefault(dependent, []).append(row)
+    return out
+
+
+def _clear_back_links(doctype, names):
+    """Point Cost Sheets away from archived bookings; returns {booking: [cost sheets]} to restore."""
+    if doctype != "Booking Order":
+        return {}
+    rows = frappe.get_all(
+        "Cost Sheet", filters={"booking_order": ("in", names)}, fields=["name", "booking_order"]
+    )
+    if not rows:
+        return {}
+    # not a user edit: the sheet keeps its age for the archival policy
+    frappe.db.sql(
+        "UPDATE `tabCost Sheet` SET booking_order = NULL WHERE name IN %(sheets)s",
+        {"sheets": tuple(r.name for r in rows)},
+    )
+    out = {}
+    for r in rows:
+        frappe.clear_document_cache("Cost Sheet", r.name)
+        out.setdefault(r.booking_order, []).append(r.name)
+    return out
+
+
+def _restore_back_links(booking_order, cost_sheets):
+    if not cost_sheets:
+        return
+    # only sheets that still exist and were not linked to another booking meanwhile
+    for name in frappe.get_all(
+        "Cost Sheet", filters={"name": ("in", cost_sheets), "booking_order": ("is", "not set")}, pluck="name"
+    ):
+        frappe.db.set_value("Cost Sheet", name, "booking_order", booking_order, update_modified=False)
+        frappe.clear_document_cache("Cost Sheet", name)
+
+
+def _insert_raw(doctype, rows):
+    if not rows:
+        return
+    # columns dropped by a later migration are left out; new ones take their defaults
+    columns = set(frappe.db.get_table_columns(doctype))
+    fields = [f for f in rows[0] if f in columns]
+    frappe.db.bulk_insert(doctype, fields, [tuple(r.get(f) for f in fields) for r in rows])
@@ -0,0 +1,343 @@
+# Copyright (c) 2025, surendhranath
+# For license information, please see license.txt
+
+"""
+Deterministic synthetic dataset for benchmarking realapp at site scale.
+
+Values are computed with realapp's own controllers (Unit.calculate_dynamic_fields,
+Cost Sheet schedule spreading) on in-memory documents and written with
+frappe.db.bulk_insert, so millions of rows load without per-document saves.
+Every generated record is prefixed with ``BENCH-`` and can be removed with
+clear_dataset(). Sales Invoices and Payment Entries carry only the columns
+realapp reads (no GL entries); they exist to load reports, not the ledger.
+"""
+
+import random
+
+import frappe
+from frappe.utils import add_days, add_months, flt, getdate, now
+
+from realapp.realapp.doctype.cost_sheet.cost_sheet import compute_before_registration
+
+PREFIX = "BENCH-"
+SCHEME_CODES = [f"C-{i}" for i in range(1, 11)]
+CHUNK_SIZE = 5000
+TOWERS_PER_PROJECT = 5
+
+# production scale ("large"): 20 towers, 15k units, ~120k invoices, ~300k payment references
+SCALES = {
+    "small": frappe._dict(towers=2, floors=10, units_per_floor=10, booked_ratio=0.6, payments_per_invoice=2.5),
+    "medium": frappe._dict(towers=5, floors=20, units_per_floor=20, booked_ratio=0.7, payments_per_invoice=2.5),
+    "large": frappe._dict(towers=20, floors=25, units_per_floor=30, booked_ratio=0.8, payments_per_invoice=2.5),
+}
+
+# tables written by the generator, children before parents for clear_dataset
+GENERATED_TABLES = (
+    ("Payment Entry Reference", "parent"),
+    ("Payment Entry", "name"),
+    ("Sales Invoice Item", "parent"),
+    ("Sales Invoice", "name"),
+    ("Booking Order Payment Schedule", "parent"),
+    ("Booking Order", "name"),
+    ("Cost Sheet Payment Schedule", "parent"),
+    ("Cost Sheet", "name"),
+    ("Customer", "name"),
+    ("Unit", "name"),
+    ("Floor", "name"),
+    ("Tower Milestone", "parent"),
+    ("Block Payment Scheme", "parent"),
+    ("Block", "name"),
+    ("Payment Scheme Detail", "parent"),
+    ("Payment Scheme Template", "name"),
+    ("Item", "name"),
+    ("Project", "name"),
+)
+
+
+def generate_dataset(scale="small", seed=42, company=None):
+    """Build the dataset for `scale` and return the row counts per doctype."""
+    cfg = SCALES[scale]
+    rng = random.Random(seed)
+    has_erpnext = "erpnext" in frappe.get_installed_apps()
+    company = company or frappe.db.get_default("company") or frappe.db.get_value("Company", {})
+
+    clear_dataset()
+    writer = BulkWriter()
+    settings = frappe.get_cached_doc("Realapp Settings")
+
+    items = _write_masters(writer, has_erpnext)
+    template = f"{PREFIX}10x10 Scheme"
+    start = getdate("2024-01-01")
+
+    booking_seq = 0
+    for t in range(1, cfg.towers + 1):
+        project = f"{PREFIX}P{(t - 1) // TOWERS_PER_PROJECT + 1:02d}"
+        if (t - 1) % TOWERS_PER_PROJECT == 0 and has_erpnext:
+            writer.add("Project", {
+                "name": project, "project_name": project, "status": "Open", "company": company,
+            })
+        block = f"{PREFIX}T{t:02d}"
+        milestone_dates = {code: add_months(start, 3 * i + t % 4) for i, code in enumerate(SCHEME_CODES)}
+        _write_block(writer, block, project, template, milestone_dates)
+
+        for f in range(1, cfg.floors + 1):
+            floor = f"{block}-F{f:02d}"
+            writer.add("Floor", {"name": floor, "floor_name": floor, "block": block, "floor_number": f})
+
+            for u in range(1, cfg.units_per_floor + 1):
+                unit = _build_unit(f"{floor}-{u:02d}", floor, block, project, f, settings, rng)
+                booked = rng.random() < cfg.booked_ratio
+                unit.status = "Booked" if booked else "Available"
+                writer.add("Unit", unit.as_dict(no_default_fields=False))
+
+                if booked:
+                    booking_seq += 1
+                    _write_booking(
+                        writer, booking_seq, unit, items, template, milestone_dates, company,
+                        has_erpnext, cfg, rng,
+                    )
+
+    writer.flush()
+    return writer.counts
+
+
+def clear_dataset():
+    """Delete every generated (BENCH-) record."""
+    for doctype, column in GENERATED_TABLES:
+        if frappe.db.table_exists(doctype):
+            frappe.db.sql(f"DELETE FROM `tab{doctype}` WHERE `{column}` LIKE %s", (f"{PREFIX}%",))
+    frappe.db.commit()
+
+
+class BulkWriter:
+    """
+    Buffers rows per doctype and writes them with frappe.db.bulk_insert.
+    Each chunk is written with the union of its rows' keys, so a key that
+    only some rows carry is not lost; the others get NULL.
+    """
+
+    def __init__(self, chunk_size=CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.rows = {}
+        self.counts = {}
+        self.stamp = now()
+
+    def add(self, doctype, row):
+        defaults = {
+            "creation": self.stamp,
+            "modified": self.stamp,
+            "owner": "Administrator",
+            "modified_by": "Administrator",
+            "docstatus": 0,
+        }
+        row = {
+            **defaults,
+            **{
+                k: v
+                for k, v in row.items()
+                if not k.startswith("__") and k != "doctype" and not isinstance(v, list)
+                and not (v is None and k in defaults)
+            },
+        }
+        self.rows.setdefault(doctype, []).append(row)
+        if len(self.rows[doctype]) >= self.chunk_size:
+            self._flush(doctype)
+
+    def flush(self):
+        for doctype in list(self.rows):
+            self._flush(doctype)
+        frappe.db.commit()
+
+    def _flush(self, doctype):
+        rows = self.rows.pop(doctype, [])
+        if not rows:
+            return
+        columns = set(frappe.db.get_table_columns(doctype))
+        fields = sorted({f for r in rows for f in r} & columns)
+        frappe.db.bulk_insert(
+            doctype,
+            fields,
+            [tuple(r.get(f) for f in fields) for r in rows],
+            chunk_size=self.chunk_size,
+        )
+        self.counts[doctype] = self.counts.get(doctype, 0) + len(rows)
+
+
+# ----------------- Builders -----------------
+
+def _write_masters(writer, has_erpnext):
+    items = {}
+    for code in SCHEME_CODES:
+        item = f"{PREFIX}Milestone {code}" if has_erpnext else None
+        if item:
+            writer.add("Item", {
+                "name": item, "item_code": item, "item_name": item, "item_group": "All Item Groups",
+                "stock_uom": "Nos", "is_stock_item": 0, "is_sales_item": 1,
+            })
+        items[code] = item
+
+    template = f"{PREFIX}10x10 Scheme"
+    writer.add("Payment Scheme Template", {"name": template, "scheme_name": template, "is_active": 1})
+    for idx, code in enumerate(SCHEME_CODES, 1):
+        writer.add("Payment Scheme Detail", {
+            **_child(template, "Payment Scheme Template", "payment_scheme_details", idx),
+            "scheme_code": code, "milestone": f"Milestone {code}", "milestone_item": items[code],
+            "particulars": "Booking Specific" if idx == 1 else "Tower Specific", "percentage": 10,
+        })
+    return items
+
+
+def _write_block(writer, block, project, template, milestone_dates):
+    writer.add("Block", {"name": block, "block": block, "tower_name": block, "project": project})
+    writer.add("Block Payment Scheme", {
+        **_child(block, "Block", "available_payment_schemes", 1),
+        "payment_scheme_template": template, "is_default": 1,
+    })
+    for idx, code in enumerate(SCHEME_CODES, 1):
+        writer.add("Tower Milestone", {
+            **_child(block, "Block", "tower_milestones", idx),
+            "scheme_code": code, "milestone": f"Milestone {code}", "milestone_date": milestone_dates[code],
+        })
+
+
+def _build_unit(name, floor, block, project, floor_number, settings, rng):
+    unit = frappe.new_doc("Unit")
+    unit.update({
+        "name": name,
+        "unit_name": name,
+        "floor_name": floor,
+        "block": block,
+        "project": project,
+        "floor_number": floor_number,
+        "salable_area": rng.choice((1250, 1450, 1650, 1850, 2200)),
+        "basic_price_per_sft": rng.choice((6200, 6500, 6800)),
+        "floor_rise_rate": 20 * floor_number,
+        "facing_premium_charges": rng.choice((0, 100)),
+        "corner_premium_charges": rng.choice((0, 0, 150)),
+        "car_parking_amount": 300000,
+        "amenities_charges_per_sft": flt(settings.amenities_charges_per_sft),
+        "infra_charges_per_sft": flt(settings.infra_charges_per_sft),
+        "documentation_charges": flt(settings.documentation_charges),
+        "gst_rate": flt(settings.gst_rate or 5),
+        "tds_rate": flt(settings.tds_rate or 1),
+        "flat_type": rng.choice(("3 BHK", "3 BHK", "4 BHK")),
+        "facing": rng.choice(("East", "North", "West")),
+    })
+    unit.calculate_dynamic_fields()
+    return unit
+
+
+def _write_booking(writer, seq, unit, items, template, milestone_dates, company, has_erpnext, cfg, rng):
+    customer = f"{PREFIX}CUST-{seq:06d}"
+    cost_sheet = f"{PREFIX}CS-{seq:06d}"
+    booking = f"{PREFIX}BO-{seq:06d}"
+    booking_date = add_days(getdate("2024-01-01"), rng.randrange(0, 540))
+
+    if has_erpnext:
+        writer.add("Customer", {
+            "name": customer, "customer_name": f"Buyer {seq:06d}", "customer_type": "Individual",
+            "customer_group": "All Customer Groups", "territory": "All Territories",
+        })
+
+    # Reuse the Cost Sheet controller to spread AOS over the schedule
+    cs = frappe.new_doc("Cost Sheet")
+    for idx, code in enumerate(SCHEME_CODES, 1):
+        cs.append("payment_schedule", {"scheme_code": code, "percentage": 10, "idx": idx})
+    gst_rate, tds_rate = flt(unit.gst_rate or 5), flt(unit.tds_rate or 1)
+    cs._spread_schedule_amounts(unit.aos_value, gst_rate, tds_rate)
+    before_reg = compute_before_registration(unit.salable_area)
+
+    header = {
+        "party_type": "Customer", "party": customer, "unit": unit.name, "project": unit.project, "block": unit.block,
+        "floor_number": unit.floor_number, "salable_area": unit.salable_area,
+        "basic_price_per_sft": unit.basic_price_per_sft, "aos_value": unit.aos_value, "aos_gst": unit.aos_gst,
+        "aos_value_gst": unit.aos_value_gst, "net_payable": unit.net_payable,
+        "grand_total_payable": flt(unit.aos_value_gst + before_reg.before_registration_total, 2),
+        "payment_scheme_template": template,
+    }
+    writer.add("Cost Sheet", {
+        **header, **before_reg, "name": cost_sheet, "naming_series": "COST-.YYYY.-", "cost_sheet_type": "Standard",
+        "value_excluding_bp": unit.value_excluding_bp, "full_unit_value": unit.full_unit_value,
+        "tds_amount": unit.tds_amount, "effective_rate_per_sft": unit.effective_rate_per_sft,
+        "booking_order": booking,
+    })
+    writer.add("Booking Order", {
+        **header, "name": booking, "naming_series": "BO-.YYYY.-", "docstatus": 1, "booking_date": booking_date,
+        "company": company, "cost_sheet": cost_sheet, "advance_paid": 0,
+        "balance_payable": header["grand_total_payable"],
+    })
+
+    for d in cs.payment_schedule:
+        row = {
+            "scheme_code": d.scheme_code, "milestone": f"Milestone {d.scheme_code}",
+            "milestone_item": items[d.scheme_code], "particulars": "Tower Specific", "percentage": 10,
+            "milestone_date": milestone_dates[d.scheme_code], "amount": d.amount, "gst_amount": d.gst_amount,
+            "tds_amount": d.tds_amount, "net_payable": d.net_payable,
+        }
+        writer.add("Cost Sheet Payment Schedule", {
+            **_child(cost_sheet, "Cost Sheet", "payment_schedule", d.idx), **row,
+        })
+        invoice = f"{PREFIX}SI-{seq:06d}-{d.idx:02d}" if has_erpnext else None
+        writer.add("Booking Order Payment Schedule", {
+            **_child(booking, "Booking Order", "payment_schedule", d.idx), **row, "docstatus": 1,
+            "invoice_status": "Invoiced" if invoice else "Not Invoiced",
+            "sales_invoice": invoice, "invoiced_amount": d.amount if invoice else 0,
+        })
+        if invoice:
+            _write_invoice(writer, invoice, booking, customer, unit, d, items, company,
+                           max(booking_date, milestone_dates[d.scheme_code]), cfg, rng)
+
+
+def _write_invoice(writer, invoice, booking, customer, unit, row, items, company, posting_date, cfg, rng):
+    total = flt(row.amount + row.gst_amount, 2)
+
+    # payments: Poisson-ish count around payments_per_invoice, some invoices left open
+    n_payments = max(0, int(rng.gauss(cfg.payments_per_invoice, 1) + 0.5))
+    paid, payments = 0.0, []
+    for p in range(n_payments):
+        share = total / n_payments if rng.random() < 0.85 else total / (n_payments + 1)
+        amount = flt(min(share, total - paid), 2)
+        if amount <= 0:
+            break
+        paid += amount
+        payments.append((p + 1, amount, add_days(posting_date, rng.randrange(0, 60))))
+
+    outstanding = flt(total - paid, 2)
+    writer.add("Sales Invoice", {
+        "name": invoice, "naming_series": "SINV-.YY.-", "docstatus": 1, "company": company,
+        "customer": customer, "customer_name": customer, "booking_order": booking, "realapp_unit": unit.name,
+        "realapp_project": unit.project, "realapp_block": unit.block, "realapp_floor_number": unit.floor_number,
+        "posting_date": posting_date, "due_date": posting_date,
+        "net_total": row.amount, "grand_total": total, "rounded_total": total, "base_grand_total": total,
+        "base_rounded_total": total, "outstanding_amount": outstanding,
+        "status": "Paid" if outstanding <= 0 else "Unpaid",
+    })
+    writer.add("Sales Invoice Item", {
+        **_child(invoice, "Sales Invoice", "items", 1), "docstatus": 1,
+        "item_code": items[row.scheme_code], "item_name": items[row.scheme_code],
+        "milestone_code": row.scheme_code, "description": f"Milestone {row.scheme_code}",
+        "qty": 1, "rate": row.amount, "amount": row.amount, "base_amount": row.amount, "net_amount": row.amount,
+    })
+
+    for p, amount, paid_on in payments:
+        entry = f"{PREFIX}PE-{invoice[len(PREFIX) + 3:]}-{p}"
+        writer.add("Payment Entry", {
+            "name": entry, "naming_series": "ACC-PAY-.YYYY.-", "docstatus": 1, "company": company,
+            "payment_type": "Receive", "party_type": "Customer", "party": customer, "posting_date": paid_on,
+            "paid_amount": amount, "received_amount": amount, "base_paid_amount": amount,
+        })
+        writer.add("Payment Entry Reference", {
+            **_child(entry, "Payment Entry", "references", 1), "docstatus": 1,
+            "reference_doctype": "Sales Invoice", "reference_name": invoice,
+            "total_amount": total, "outstanding_amount": outstanding, "allocated_amount": amount,
+        })
+
+
+def _child(parent, parenttype, parentfield, idx):
+    return {
+        "name": f"{parent}-{parentfield}-{idx}",
+        "parent": parent,
+        "parenttype": parenttype,
+        "parentfield": parentfield,
+        "idx": idx,
+    }
@@ -0,0 +1,173 @@
+# Copyright (c) 2025, surendhranath
+# For license information, please see license.txt
+
+"""
+Concurrent booking load test.
+
+N worker threads, each with its own site connection, repeatedly pick a unit
+from a shared (overlapping) pool and run the launch-day flow:
+make_cost_sheet → insert → make_booking_order → insert → submit → commit.
+Contention on `tabUnit` shows up as lock waits, deadlocks and "not available"
+rejections; the run ends with a check that no unit holds two submitted
+Booking Orders. Created documents are removed afterwards unless keep=True.
+"""
+
+import random
+import threading
+import time
+
+import frappe
+from frappe.utils import today
+
+from realapp.benchmarks.datagen import PREFIX
+
+
+def run_load_test(workers=8, bookings_per_worker=25, pool_size=50, seed=7, keep=False):
+    site, sites_path = frappe.local.site, frappe.local.sites_path
+    company = frappe.db.get_value("Company", {})
+    party = frappe.db.get_value("Customer", {"name": ("like", f"{PREFIX}%")}) or frappe.db.get_value("Customer", {})
+    pool = frappe.get_all(
+        "Unit",
+        filters={"status": "Available", "name": ("like", f"{PREFIX}%")},
+        pluck="name",
+        order_by="name",
+        limit=pool_size,
+    )
+    if not pool:
+        frappe.throw("No Available BENCH- units; run `bench realapp-generate-data` first.")
+
+    status_before = _innodb_status()
+    results = [_WorkerResult() for _ in range(workers)]
+    threads = [
+        threading.Thread(
+            target=_worker,
+            args=(site, sites_path, pool, bookings_per_worker, company, party, random.Random(seed + w), results[w]),
+            name=f"realapp-load-{w}",
+        )
+        for w in range(workers)
+    ]
+
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+    status_after = _innodb_status()
+
+    frappe.db.rollback()
+    booked = sum(r.booked for r in results)
+    report = {
+        "workers": workers,
+        "attempts": workers * bookings_per_worker,
+        "unit_pool": len(pool),
+        "elapsed_sec": round(elapsed, 3),
+        "bookings": booked,
+        "bookings_per_sec": round(booked / elapsed, 2) if elapsed else None,
+        "rejected_unavailable": sum(r.rejected for r in results),
+        "deadlocks": sum(r.deadlocks for r in results),
+        "lock_wait_timeouts": sum(r.lock_timeouts for r in results),
+        "other_errors": sum(r.errors for r in results),
+        "innodb_row_lock_waits": status_after.get("Innodb_row_lock_waits", 0) - status_before.get("Innodb_row_lock_waits", 0),
+        "innodb_row_lock_time_ms": status_after.get("Innodb_row_lock_time", 0) - status_before.get("Innodb_row_lock_time", 0),
+        "innodb_deadlocks": status_after.get("Innodb_deadlocks", 0) - status_before.get("Innodb_deadlocks", 0),
+        "double_booked_units": get_double_booked_units(pool),
+        "sample_errors": [e for r in results for e in r.messages][:10],
+    }
+
+    if not keep:
+        _cleanup([n for r in results for n in r.cost_sheets], [n for r in results for n in r.booking_orders])
+    return report
+
+
+def get_double_booked_units(units):
+    """Units that hold more than one submitted Booking Order."""
+    if not units:
+        return []
+    return frappe.db.sql_list(
+        """
+        SELECT unit FROM `tabBooking Order`
+        WHERE docstatus = 1 AND unit IN %(units)s
+        GROUP BY unit HAVING COUNT(*) > 1
+        """,
+        {"units": tuple(units)},
+    )
+
+
+# ----------------- Helpers -----------------
+
+class _WorkerResult:
+    def __init__(self):
+        self.booked = self.rejected = self.deadlocks = self.lock_timeouts = self.errors = 0
+        self.cost_sheets, self.booking_orders, self.messages = [], [], []
+
+
+def _worker(site, sites_path, pool, iterations, company, party, rng, result):
+    from realapp.realapp.doctype.cost_sheet.cost_sheet import make_booking_order
+    from realapp.realapp.doctype.unit.unit import make_cost_sheet
+
+    frappe.init(site=site, sites_path=sites_path)
+    frappe.connect()
+    frappe.set_user("Administrator")
+    try:
+        for _ in range(iterations):
+            unit = rng.choice(pool)
+            try:
+                cs = make_cost_sheet(unit)
+                cs.update({"cost_sheet_type": "Standard", "party_type": "Customer", "party": party})
+                cs.insert()
+                result.cost_sheets.append(cs.name)
+
+                bo = make_booking_order(cs.name)
+                bo.update({"company": company, "booking_date": today()})
+                bo.insert()
+                result.booking_orders.append(bo.name)
+                bo.submit()
+                frappe.db.commit()
+                result.booked += 1
+            except frappe.QueryDeadlockError as e:
+                frappe.db.rollback()
+                result.deadlocks += 1
+                result.messages.append(f"{unit}: {e}")
+            except frappe.QueryTimeoutError as e:
+                frappe.db.rollback()
+                result.lock_timeouts += 1
+                result.messages.append(f"{unit}: {e}")
+            except frappe.ValidationError:
+                # unit was booked by another worker first: the expected outcome under contention
+                frappe.db.rollback()
+                result.rejected += 1
+            except Exception as e:
+                frappe.db.rollback()
+                result.errors += 1
+                result.messages.append(f"{unit}: {e!r}")
+            finally:
+                frappe.local.document_cache = {}
+                frappe.clear_messages()
+    finally:
+        frappe.destroy()
+
+
+def _innodb_status():
+    rows = frappe.db.sql(
+        "SHOW GLOBAL STATUS WHERE Variable_name IN ('Innodb_row_lock_waits', 'Innodb_row_lock_time', 'Innodb_deadlocks')"
+    )
+    return {name: int(value) for name, value in rows}
+
+
+def _cleanup(cost_sheets, booking_orders):
+    """Remove the harness' documents and release the units they booked."""
+    if booking_orders:
+        units = frappe.get_all(
+            "Booking Order", filters={"name": ("in", booking_orders), "docstatus": 1}, pluck="unit"
+        )
+        frappe.db.delete("Booking Order Payment Schedule", {"parent": ("in", booking_orders)})
+        frappe.db.delete("Booking Order", {"name": ("in", booking_orders)})
+        if units:
+            frappe.db.sql(
+                "UPDATE `tabUnit` SET status = 'Available' WHERE name IN %s AND status = 'Booked'", (tuple(units),)
+            )
+    if cost_sheets:
+        frappe.db.delete("Cost Sheet Payment Schedule", {"parent": ("in", cost_sheets)})
+        frappe.db.delete("Cost Sheet", {"name": ("in", cost_sheets)})
+    frappe.db.commit()
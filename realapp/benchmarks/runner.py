@@ -0,0 +1,165 @@
+# Copyright (c) 2025, surendhranath
+# For license information, please see license.txt
+
+"""
+Benchmark runner for realapp workflows on a generated dataset.
+
+Each benchmark runs its operations inside the current transaction and rolls
+back afterwards, so the dataset is identical for every benchmark and scale.
+Per-operation samples are collected with realapp.instrumentation.measure and
+summarised (count, percentiles, queries per op, ops/sec) into a JSON-ready dict.
+"""
+
+import platform
+import time
+
+import frappe
+from frappe.utils import now, today
+
+from realapp import __version__
+from realapp.benchmarks.datagen import PREFIX, SCALES, generate_dataset
+from realapp.instrumentation import measure, summarize
+
+DEFAULT_ITERATIONS = 20
+
+
+def run_benchmarks(scales=("small",), iterations=DEFAULT_ITERATIONS, seed=42, generate=True):
+    """Generate each dataset size in turn and time the workflows on it."""
+    report = {
+        "realapp_version": __version__,
+        "site": frappe.local.site,
+        "python": platform.python_version(),
+        "started_at": now(),
+        "iterations": iterations,
+        "seed": seed,
+        "scales": {},
+    }
+    for scale in scales:
+        counts = generate_dataset(scale, seed=seed) if generate else {}
+        report["scales"][scale] = {
+            "config": dict(SCALES[scale]),
+            "dataset": counts,
+            "results": {name: _run(fn, iterations) for name, fn in BENCHMARKS.items()},
+        }
+    return report
+
+
+def _run(fn, iterations):
+    samples = []
+    started = time.perf_counter()
+    try:
+        for i in range(iterations):
+            with measure() as sample:
+                ran = fn(i)
+            if ran is False:
+                break
+            samples.append(sample)
+    finally:
+        frappe.db.rollback()
+        frappe.local.document_cache = {}
+
+    elapsed = time.perf_counter() - started
+    if not samples:
+        return {"skipped": True}
+    out = summarize(samples)
+    out["ops_per_sec"] = round(len(samples) / elapsed, 2) if elapsed else None
+    return out
+
+
+# ----------------- Benchmarks -----------------
+
+def _available_units(i):
+    units = frappe.get_all(
+        "Unit",
+        filters={"name": ("like", f"{PREFIX}%"), "status": "Available"},
+        pluck="name",
+        order_by="name",
+        limit=1,
+        limit_start=i,
+    )
+    return units[0] if units else None
+
+
+def bench_unit_repricing(i):
+    unit = _available_units(i)
+    if not unit:
+        return False
+    doc = frappe.get_doc("Unit", unit)
+    doc.basic_price_per_sft = (doc.basic_price_per_sft or 0) + 50
+    doc.save(ignore_permissions=True)
+
+
+def bench_cost_sheet_creation(i):
+    unit = _available_units(i)
+    party = frappe.db.get_value("Customer", {"name": ("like", f"{PREFIX}%")})
+    if not unit or not party:
+        return False
+    frappe.get_doc({
+        "doctype": "Cost Sheet",
+        "cost_sheet_type": "Standard",
+        "party_type": "Customer",
+        "party": party,
+        "unit": unit,
+        "payment_scheme_template": f"{PREFIX}10x10 Scheme",
+    }).insert(ignore_permissions=True)
+
+
+def bench_booking_submit(i):
+    from realapp.realapp.doctype.cost_sheet.cost_sheet import make_booking_order
+
+    unit = _available_units(i)
+    party = frappe.db.get_value("Customer", {"name": ("like", f"{PREFIX}%")})
+    if not unit or not party:
+        return False
+    cs = frappe.get_doc({
+        "doctype": "Cost Sheet",
+        "cost_sheet_type": "Standard",
+        "party_type": "Customer",
+        "party": party,
+        "unit": unit,
+        "payment_scheme_template": f"{PREFIX}10x10 Scheme",
+    }).insert(ignore_permissions=True)
+    bo = make_booking_order(cs.name)
+    bo.company = frappe.db.get_value("Company", {})
+    bo.booking_date = today()
+    bo.insert(ignore_permissions=True)
+    bo.submit()
+
+
+def bench_bulk_invoicing(i):
+    from realapp.realapp.doctype.booking_order.booking_order import make_sales_invoice
+
+    booking = frappe.get_all(
+        "Booking Order",
+        filters={"name": ("like", f"{PREFIX}BO-%"), "docstatus": 1},
+        pluck="name",
+        order_by="name",
+        limit=1,
+        limit_start=i,
+    )
+    if not booking:
+        return False
+    # reset synthetic invoice state so the whole schedule can be invoiced again
+    frappe.db.sql(
+        """UPDATE `tabBooking Order Payment Schedule`
+        SET invoice_status = 'Not Invoiced', sales_invoice = NULL WHERE parent = %s""",
+        (booking[0],),
+    )
+    rows = frappe.get_all("Booking Order Payment Schedule", {"parent": booking[0]}, pluck="name")
+    make_sales_invoice(booking[0], selected_rows=frappe.as_json(rows))
+
+
+def bench_collection_report(i):
+    from realapp.realapp.report.collection_report.collection_report import execute
+
+    block = f"{PREFIX}T{(i % 2) + 1:02d}"
+    execute({"block": block})
+
+
+BENCHMARKS = {
+    "unit_repricing": bench_unit_repricing,
+    "cost_sheet_creation": bench_cost_sheet_creation,
+    "booking_submit": bench_booking_submit,
+    "bulk_invoicing": bench_bulk_invoicing,
+    "collection_report": bench_collection_report,
+}
@@ -0,0 +1,92 @@
+# Copyright (c) 2025, surendhranath
+# For license information, please see license.txt
+
+"""
+Versioned result cache for realapp reports and APIs.
+
+Cached values are keyed on the request parameters plus the current version
+token of every scope they depend on (e.g. ``collections:<project>``).
+Document events bump the affected scopes after commit, which invalidates
+exactly the entries built from that data without scanning Redis.
+"""
+
+import hashlib
+import json
+
+import frappe
+
+VERSION_KEY = "realapp:version:{}"
+DEFAULT_TTL = 6 * 60 * 60
+
+
+def get_cached(namespace, scopes, params, builder, expires_in_sec=DEFAULT_TTL):
+    """Return builder() from cache, rebuilding when any scope version moved."""
+    key = _key(namespace, scopes, params)
+    value = frappe.cache().get_value(key)
+    if value is not None:
+        return value
+
+    value = builder()
+    frappe.cache().set_value(key, value, expires_in_sec=expires_in_sec)
+    return value
+
+
+def get_etag(namespace, scopes, params):
+    """Stable validator for the cached entry; changes whenever the entry would be rebuilt."""
+    return _key(namespace, scopes, params).rsplit(":", 1)[-1]
+
+
+def bump_version(*scopes):
+    """
+    Invalidate every cached entry that depends on one of `scopes`. Bumped now
+    and again after commit, so an entry rebuilt from pre-commit data in
+    between is not served afterwards.
+    """
+    scopes = {s for s in scopes if s}
+    if not scopes:
+        return
+
+    def _bump():
+        for scope in scopes:
+            frappe.cache().set_value(VERSION_KEY.format(scope), frappe.generate_hash(length=10))
+
+    _bump()
+    if getattr(frappe.db, "after_commit", None) is not None:
+        frappe.db.after_commit.add(_bump)
+
+
+def get_version(scope):
+    return frappe.cache().get_value(VERSION_KEY.format(scope)) or "0"
+
+
+def invalidate_collections(*projects):
+    """Bump the scopes used by collection and cash-flow views for the given projects."""
+    bump_version("collections", *(f"collections:{p}" for p in projects if p))
+
+
+def collection_scopes(project=None):
+    return [f"collections:{project}"] if project else ["collections"]
+
+
+def invalidate_inventory(*projects):
+    """Bump the scopes used by unit availability and sales analytics for the given projects."""
+    bump_version("inventory", *(f"inventory:{p}" for p in projects if p))
+
+
+def inventory_scopes(project=None):
+    return [f"inventory:{project}"] if project else ["inventory"]
+
+
+def invalidate_customers(*customers):
+    """Bump the per-customer scopes used by buyer statements."""
+    bump_version(*(f"customer:{c}" for c in customers if c))
+
+
+def customer_scopes(customer):
+    return [f"customer:{customer}"]
+
+
+def _key(namespace, scopes, params):
+    versions = [get_version(s) for s in scopes]
+    digest = hashlib.sha1(json.dumps([versions, params], sort_keys=True, default=str).encode()).hexdigest()
+    return f"realapp:cache:{namespace}:{digest}"
@@ -0,0 +1,117 @@
+# Copyright (c) 2025, surendhranath
+# For license information, please see license.txt
+
+import json
+
+import click
+import frappe
+from frappe.commands import get_site, pass_context
+
+
+@click.command("realapp-generate-data")
+@click.option("--scale", type=click.Choice(["small", "medium", "large"]), default="small", help="Dataset size")
+@click.option("--seed", type=int, default=42, help="Random seed; the same seed gives the same dataset")
+@click.option("--clear", is_flag=True, default=False, help="Only remove previously generated BENCH- data")
+@pass_context
+def generate_data(context, scale, seed, clear):
+    """Generate a deterministic synthetic realapp dataset (BENCH- records)."""
+    from realapp.benchmarks.datagen import clear_dataset, generate_dataset
+
+    site = get_site(context)
+    frappe.init(site=site)
+    frappe.connect()
+    try:
+        if clear:
+            clear_dataset()
+            click.echo("Removed generated BENCH- data")
+            return
+        counts = generate_dataset(scale, seed=seed)
+        click.echo(json.dumps(counts, indent=1))
+    finally:
+        frappe.destroy()
+
+
+@click.command("realapp-benchmark")
+@click.option("--scales", default="small", help="Comma separated dataset sizes, e.g. small,medium,large")
+@click.option("--iterations", type=int, default=20, help="Operations per benchmark")
+@click.option("--seed", type=int, default=42)
+@click.option("--no-generate", is_flag=True, default=False, help="Benchmark the dataset already on the site")
+@click.option("--output", type=click.Path(dir_okay=False, writable=True), help="Write the JSON report to this file")
+@pass_context
+def run_benchmark(context, scales, iterations, seed, no_generate, output):
+    """Time realapp workflows on synthetic datasets and emit a JSON report."""
+    from realapp.benchmarks.runner import run_benchmarks
+
+    site = get_site(context)
+    frappe.init(site=site)
+    frappe.connect()
+    try:
+        report = run_benchmarks(
+            scales=[s.strip() for s in scales.split(",") if s.strip()],
+            iterations=iterations,
+            seed=seed,
+            generate=not no_generate,
+        )
+    finally:
+        frappe.destroy()
+
+    payload = json.dumps(report, indent=1, default=str)
+    if output:
+        with open(output, "w") as f:
+            f.write(payload)
+        click.echo(f"Benchmark report written to {output}")
+    else:
+        click.echo(payload)
+
+
+@click.command("realapp-load-test")
+@click.option("--workers", type=int, default=8, help="Parallel booking workers (threads)")
+@click.option("--bookings-per-worker", type=int, default=25)
+@click.option("--pool-size", type=int, default=50, help="Number of Available units all workers compete for")
+@click.option("--seed", type=int, default=7)
+@click.option("--keep", is_flag=True, default=False, help="Keep the created Cost Sheets and Booking Orders")
+@pass_context
+def load_test(context, workers, bookings_per_worker, pool_size, seed, keep):
+    """Drive concurrent Cost Sheet → Booking Order → submit flows over overlapping units."""
+    from realapp.benchmarks.load_test import run_load_test
+
+    site = get_site(context)
+    frappe.init(site=site)
+    frappe.connect()
+    try:
+        report = run_load_test(
+            workers=workers,
+            bookings_per_worker=bookings_per_worker,
+            pool_size=pool_size,
+            seed=seed,
+            keep=keep,
+        )
+    finally:
+        frappe.destroy()
+
+    click.echo(json.dumps(report, indent=1, default=str))
+    if report["double_booked_units"]:
+        raise SystemExit(1)
+
+
+@click.command("realapp-rebuild-booking-rollups")
+@click.option("--booking-order", "booking_orders", multiple=True, help="Only these Booking Orders (repeatable)")
+@pass_context
+def rebuild_booking_rollups(context, booking_orders):
+    """Recompute Booking Order collection rollups and correct any that drifted."""
+    from realapp.rollups import rebuild_rollups
+
+    site = get_site(context)
+    frappe.init(site=site)
+    frappe.connect()
+    try:
+        corrected = rebuild_rollups(list(booking_orders) or None)
+    finally:
+        frappe.destroy()
+
+    click.echo(f"Corrected rollups on {len(corrected)} Booking Order(s)")
+    for name in corrected[:50]:
+        click.echo(f"  {name}")
+
+
+commands = [generate_data, run_benchmark, load_test, rebuild_booking_rollups]
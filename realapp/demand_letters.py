@@ -0,0 +1,175 @@
+# Copyright (c) 2025, surendhranath
+# For license information, please see license.txt
+
+"""
+Milestone demand letters.
+
+A Demand Letter Run covers one block and one scheme_code. `run_demand_letters`
+selects every submitted booking of the block that carries that milestone in
+its payment schedule, in one query that also drops bookings whose letter is
+already queued or sent. Letters are rendered in chunks (HTML here, PDFs in
+a spawned process pool) and handed to the email outbox with staggered
+`send_after` times so the run never exceeds its emails-per-minute rate.
+Each letter is recorded as a Demand Letter row; `sync_dispatch_status`
+copies the outbox state back onto those rows.
+"""
+
+import frappe
+from frappe.utils import add_to_date, cint, flt, now_datetime
+
+from realapp.utils import bulk_insert_rows, pdf_pool, render_pdf
+
+CHUNK_SIZE = 100
+TEMPLATE = "realapp/templates/demand_letter.html"
+LETTER_FIELDS = (
+    "booking_order",
+    "block",
+    "scheme_code",
+    "milestone",
+    "due_date",
+    "run",
+    "amount",
+    "gst_amount",
+    "tds_amount",
+    "net_payable",
+    "party",
+    "email_id",
+    "status",
+    "email_queue",
+)
+
+
+def run_demand_letters(run):
+    doc = frappe.get_doc("Demand Letter Run", run)
+    doc.db_set("status", "Running")
+    frappe.db.commit()
+
+    letters = get_pending_letters(doc.block, doc.scheme_code)
+    skipped = frappe.db.count(
+        "Demand Letter",
+        {"block": doc.block, "scheme_code": doc.scheme_code, "status": ("in", ("Queued", "Sent"))},
+    )
+    doc.db_set({"total_bookings": len(letters) + skipped, "skipped_count": skipped, "queued_count": 0, "no_email_count": 0})
+
+    rate = max(cint(doc.emails_per_minute), 1)
+    send_from = now_datetime()
+    queued = no_email = 0
+    pool = pdf_pool(doc.workers)
+    try:
+        for start in range(0, len(letters), CHUNK_SIZE):
+            chunk = letters[start:start + CHUNK_SIZE]
+            to_send = [l for l in chunk if l.email_id]
+            htmls = [_render_html(l) for l in to_send]
+            pdfs = pool.map(render_pdf, htmls)
+
+            for letter, html, pdf in zip(to_send, htmls, pdfs):
+                # the outbox releases one letter every 60 / rate seconds
+                send_after = add_to_date(send_from, seconds=queued * 60 / rate)
+                letter.email_queue = _queue_email(letter, html, pdf, send_after)
+                letter.status = "Queued"
+                queued += 1
+            for letter in chunk:
+                if not letter.email_id:
+                    letter.status = "No Email"
+                    no_email += 1
+                letter.run = doc.name
+
+            _replace_letters(chunk)
+            doc.db_set({"queued_count": queued, "no_email_count": no_email})
+            frappe.db.commit()
+            _progress(doc.name, start + len(chunk), len(letters))
+
+        doc.db_set("status", "Completed")
+    except Exception:
+        frappe.db.rollback()
+        doc.db_set("status", "Failed")
+        frappe.log_error(title=f"Demand letter run {doc.name} failed")
+        raise
+    finally:
+        pool.shutdown()
+        frappe.db.commit()
+
+
+def get_pending_letters(block, scheme_code):
+    """One row per booking of the block due for this milestone, minus letters already queued or sent."""
+    return frappe.db.sql(
+        """
+        SELECT
+            bo.name AS booking_order, bo.block, bo.project, bo.unit, bo.company,
+            bo.party_type, bo.party, IFNULL(bo.email_id, '') AS email_id,
+            ps.scheme_code, ps.milestone, ps.milestone_date AS due_date,
+            ps.amount, ps.gst_amount, ps.tds_amount, ps.net_payable,
+            dl.name AS previous_letter
+        FROM `tabBooking Order` bo
+        JOIN `tabBooking Order Payment Schedule` ps
+            ON ps.parent = bo.name AND ps.parenttype = 'Booking Order' AND ps.scheme_code = %(scheme_code)s
+        LEFT JOIN `tabDemand Letter` dl
+            ON dl.booking_order = bo.name AND dl.scheme_code = ps.scheme_code
+        WHERE bo.docstatus = 1 AND bo.block = %(block)s
+          AND IFNULL(dl.status, '') NOT IN ('Queued', 'Sent')
+        ORDER BY bo.name
+        """,
+        {"block": block, "scheme_code": scheme_code},
+        as_dict=True,
+    )
+
+
+def sync_dispatch_status():
+    """Hourly: mark queued letters Sent or Failed from the state of their outbox entry."""
+    frappe.db.sql(
+        """
+        UPDATE `tabDemand Letter` dl
+        JOIN `tabEmail Queue` eq ON eq.name = dl.email_queue
+        SET dl.status = IF(eq.status = 'Sent', 'Sent', 'Failed')
+        WHERE dl.status = 'Queued' AND eq.status IN ('Sent', 'Error', 'Expired', 'Cancelled')
+        """
+    )
+
+
+# ----------------- Helpers -----------------
+
+def _render_html(letter):
+    return frappe.render_template(
+        TEMPLATE,
+        {
+            "letter": letter,
+            "party_name": _party_name(letter),
+            "amounts": {k: flt(letter[k]) for k in ("amount", "gst_amount", "tds_amount", "net_payable")},
+        },
+    )
+
+
+def _party_name(letter):
+    if letter.party_type == "Customer":
+        return frappe.get_cached_value("Customer", letter.party, "customer_name") or letter.party
+    return letter.party
+
+
+def _queue_email(letter, html, pdf, send_after):
+    queue = frappe.sendmail(
+        recipients=[letter.email_id],
+        subject=f"Demand for {letter.milestone or letter.scheme_code} - {letter.unit}",
+        message=html,
+        attachments=[{"fname": f"Demand Letter {letter.booking_order} {letter.scheme_code}.pdf", "fcontent": pdf}],
+        reference_doctype="Booking Order",
+        reference_name=letter.booking_order,
+        send_after=send_after,
+    )
+    return getattr(queue, "name", None)
+
+
+def _replace_letters(letters):
+    # failed and no-email letters of an earlier run are replaced, not duplicated
+    previous = [l.previous_letter for l in letters if l.previous_letter]
+    if previous:
+        frappe.db.delete("Demand Letter", {"name": ("in", previous)})
+    bulk_insert_rows("Demand Letter", LETTER_FIELDS, letters)
+
+
+def _progress(run, done, total):
+    frappe.publish_realtime(
+        "realapp_demand_letter_progress",
+        {"run": run, "progress": done, "total": max(total, 1)},
+        doctype="Demand Letter Run",
+        docname=run,
+    )
@@ -0,0 +1,45 @@
+# Copyright (c) 2025, surendhranath
+# For license information, please see license.txt
+
+"""Payment Entry hooks that keep Booking Order rollups and realapp collection views current."""
+
+import frappe
+
+from realapp.cache import invalidate_collections, invalidate_customers
+from realapp.instrumentation import instrument
+from realapp.rollups import apply_payment
+
+
+@instrument()
+def on_submit(doc, method=None):
+    invoices = _booking_invoices(doc)
+    if invoices:
+        apply_payment(doc, invoices)
+        invalidate_collections(*{inv.realapp_project for inv in invoices.values()})
+        invalidate_customers(*{inv.customer for inv in invoices.values()})
+
+
+@instrument()
+def on_cancel(doc, method=None):
+    invoices = _booking_invoices(doc)
+    if invoices:
+        apply_payment(doc, invoices, sign=-1)
+        invalidate_collections(*{inv.realapp_project for inv in invoices.values()})
+        invalidate_customers(*{inv.customer for inv in invoices.values()})
+
+
+# ----------------- Helpers -----------------
+
+def _booking_invoices(doc):
+    """{invoice: row} for the booking invoices this payment is allocated against."""
+    invoices = [
+        r.reference_name for r in doc.get("references") or [] if r.reference_doctype == "Sales Invoice"
+    ]
+    if not invoices:
+        return {}
+    rows = frappe.get_all(
+        "Sales Invoice",
+        filters={"name": ("in", invoices), "booking_order": ("is", "set")},
+        fields=["name", "booking_order", "customer", "due_date", "realapp_project"],
+    )
+    return {r.name: r for r in rows}
@@ -0,0 +1,105 @@
+# Copyright (c) 2025, surendhranath
+# For license information, please see license.txt
+
+"""Sales Invoice hooks that keep Booking Order schedule rows and rollups in sync."""
+
+import frappe
+from frappe.utils import flt
+
+from realapp.cache import invalidate_collections, invalidate_customers
+from realapp.instrumentation import instrument
+from realapp.rollups import apply_invoice, rebuild_rollups
+
+
+SCHEDULE_DOCTYPE = "Booking Order Payment Schedule"
+
+
+@instrument()
+def validate(doc, method=None):
+    """Block a second invoice for a milestone that is already invoiced."""
+    if not doc.get("booking_order"):
+        return
+
+    for row, _amount in _matched_schedule_rows(doc):
+        if row.invoice_status == "Invoiced" and row.sales_invoice and row.sales_invoice != doc.name:
+            frappe.throw(
+                f"Milestone {row.scheme_code} of Booking Order {doc.booking_order} "
+                f"is already invoiced in {row.sales_invoice}."
+            )
+
+
+@instrument()
+def on_submit(doc, method=None):
+    """Stamp the invoice link, amount and status on the matching schedule rows."""
+    if not doc.get("booking_order"):
+        return
+
+    for row, amount in _matched_schedule_rows(doc):
+        frappe.db.sql(
+            f"""
+            UPDATE `tab{SCHEDULE_DOCTYPE}`
+            SET sales_invoice = %s, invoiced_amount = %s, invoice_status = 'Invoiced'
+            WHERE name = %s
+            """,
+            (doc.name, flt(amount, 2), row.name),
+        )
+    apply_invoice(doc)
+    invalidate_collections(doc.get("realapp_project"))
+    invalidate_customers(doc.customer)
+
+
+@instrument()
+def on_cancel(doc, method=None):
+    """Release every schedule row that pointed at the cancelled invoice and refresh the booking's rollups."""
+    if not doc.get("booking_order"):
+        return
+
+    frappe.db.sql(
+        f"""
+        UPDATE `tab{SCHEDULE_DOCTYPE}`
+        SET sales_invoice = NULL, invoiced_amount = 0, invoice_status = 'Not Invoiced'
+        WHERE parent = %s AND parenttype = 'Booking Order' AND sales_invoice = %s
+        """,
+        (doc.booking_order, doc.name),
+    )
+    # cancelling may also unlink the invoice's payments, so recompute rather than subtract
+    rebuild_rollups([doc.booking_order], commit=False)
+    invalidate_collections(doc.get("realapp_project"))
+    invalidate_customers(doc.customer)
+
+
+# ----------------- Helpers -----------------
+
+def _matched_schedule_rows(doc):
+    """
+    Resolve invoice items to Booking Order schedule rows.
+    Items carry the scheme code in `milestone_code`; older invoices only
+    have the milestone item, so fall back to the first row with that item
+    that is not invoiced yet (several milestones may share one item).
+    """
+    rows = frappe.get_all(
+        SCHEDULE_DOCTYPE,
+        filters={"parent": doc.booking_order, "parenttype": "Booking Order"},
+        fields=["name", "scheme_code", "milestone_item", "sales_invoice", "invoice_status"],
+        order_by="idx asc",
+    )
+    by_code = {r.scheme_code: r for r in rows if r.scheme_code}
+
+    amounts = {}
+    for item in doc.get("items") or []:
+        row = by_code.get(item.get("milestone_code")) or _first_open_row(rows, item.item_code, doc.name, amounts)
+        if not row:
+            continue
+        amounts.setdefault(row.name, [row, 0.0])
+        amounts[row.name][1] += flt(item.amount)
+
+    return [tuple(v) for v in amounts.values()]
+
+
+def _first_open_row(rows, item_code, invoice, taken):
+    candidates = [r for r in rows if item_code and r.milestone_item == item_code]
+    for r in candidates:
+        if r.name not in taken and (not r.sales_invoice or r.sales_invoice == invoice):
+            return r
+    # every row of the item is invoiced elsewhere: return one so validate reports the duplicate
+    return candidates[0] if candidates else None
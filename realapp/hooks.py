@@ -27,6 +27,7 @@ app_license = "gpl-3.0"
 # include js, css files in header of desk.html
 # app_include_css = "/assets/realapp/css/realapp.css"
 # app_include_js = "/assets/realapp/js/realapp.js"
+app_include_js = ["/assets/realapp/js/live_inventory.js", "/assets/realapp/js/unit_query.js"]
 
 # include js, css files in header of web template
 # web_include_css = "/assets/realapp/css/realapp.css"
@@ -44,6 +45,7 @@ app_license = "gpl-3.0"
 
 # include js in doctype views
 # doctype_js = {"doctype" : "public/js/doctype.js"}
+doctype_js = {"Payment Entry": "public/js/payment_entry.js"}
 # doctype_list_js = {"doctype" : "public/js/doctype_list.js"}
 # doctype_tree_js = {"doctype" : "public/js/doctype_tree.js"}
 # doctype_calendar_js = {"doctype" : "public/js/doctype_calendar.js"}
@@ -64,6 +66,14 @@ app_license = "gpl-3.0"
 # 	"Role": "home_page"
 # }
 
+website_route_rules = [
+	{"from_route": "/availability/<project>", "to_route": "availability"},
+]
+
+portal_menu_items = [
+	{"title": "My Bookings", "route": "/my_bookings", "role": "Customer"},
+]
+
 # Generators
 # ----------
 
@@ -145,6 +155,18 @@ app_license = "gpl-3.0"
 # 	}
 # }
 
+doc_events = {
+	"Sales Invoice": {
+		"validate": "realapp.events.sales_invoice.validate",
+		"on_submit": "realapp.events.sales_invoice.on_submit",
+		"on_cancel": "realapp.events.sales_invoice.on_cancel",
+	},
+	"Payment Entry": {
+		"on_submit": "realapp.events.payment_entry.on_submit",
+		"on_cancel": "realapp.events.payment_entry.on_cancel",
+	},
+}
+
 # Scheduled Tasks
 # ---------------
 
@@ -166,6 +188,26 @@ app_license = "gpl-3.0"
 # 	],
 # }
 
+scheduler_events = {
+	"cron": {
+		"* * * * *": [
+			"realapp.live_inventory.flush_pending_inventory",
+		],
+	},
+	"daily": [
+		"realapp.tasks.take_daily_snapshots",
+		"realapp.interest.accrue_late_payment_interest",
+		"realapp.rollups.refresh_overdue",
+		"realapp.archive.archive_stale_documents",
+	],
+	"hourly": [
+		"realapp.demand_letters.sync_dispatch_status",
+	],
+	"monthly": [
+		"realapp.interest.make_interest_debit_notes",
+	],
+}
+
 # Testing
 # -------
 
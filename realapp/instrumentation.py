@@ -0,0 +1,212 @@
+# Copyright (c) 2025, surendhranath
+# For license information, please see license.txt
+
+"""
+Lightweight instrumentation for realapp document hooks and whitelisted methods.
+
+Decorate a hook or API function with ``@instrument()`` to record, for a sampled
+share of requests and jobs, wall time, SQL query count/time and Redis cache
+hits of the outermost instrumented call. Samples are kept in a capped Redis
+list per call site so percentiles always describe the most recent window.
+Tracking is switched on and sampled from Realapp Settings.
+"""
+
+import functools
+import json
+import random
+import time
+from contextlib import contextmanager
+
+import frappe
+from frappe.utils import flt
+
+CACHE_PREFIX = "realapp:perf"
+WINDOW_SIZE = 1000
+PERCENTILES = (50, 90, 99)
+
+
+def instrument(name=None):
+    """Decorator: measure the wrapped function when tracking is enabled and the call is sampled."""
+
+    def decorator(fn):
+        label = name or f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            # a nested call is part of the outermost call's sample, not a sample of its own
+            if getattr(frappe.local, "realapp_perf", None) or not _should_sample():
+                return fn(*args, **kwargs)
+
+            sample = None
+            try:
+                with measure() as sample:
+                    return fn(*args, **kwargs)
+            finally:
+                if sample:
+                    _record(label, sample)
+
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def measure():
+    """
+    Measure the enclosed block unconditionally; yields a dict that holds
+    wall_ms, queries, query_ms and cache_hits once the block exits.
+    """
+    counters = _start()
+    start_counts = dict(counters)
+    sample = {}
+    started = time.perf_counter()
+    try:
+        yield sample
+    finally:
+        sample.update({
+            "wall_ms": round((time.perf_counter() - started) * 1000, 3),
+            "queries": counters["queries"] - start_counts["queries"],
+            "query_ms": round(counters["query_ms"] - start_counts["query_ms"], 3),
+            "cache_hits": counters["cache_hits"] - start_counts["cache_hits"],
+        })
+        _stop()
+
+
+# ----------------- Endpoints -----------------
+
+@frappe.whitelist()
+def get_performance_stats(name=None):
+    """Rolling percentiles per instrumented call site (System Manager only)."""
+    frappe.only_for("System Manager")
+
+    names = [name] if name else sorted(_decode(n) for n in frappe.cache().smembers(f"{CACHE_PREFIX}:names"))
+    out = {}
+    for label in names:
+        samples = [json.loads(_decode(s)) for s in frappe.cache().lrange(_samples_key(label), 0, -1)]
+        if samples:
+            out[label] = summarize(samples)
+    return out
+
+
+@frappe.whitelist(methods=["POST"])
+def reset_performance_stats():
+    frappe.only_for("System Manager")
+    for label in frappe.cache().smembers(f"{CACHE_PREFIX}:names"):
+        frappe.cache().delete_value(_samples_key(_decode(label)))
+    frappe.cache().delete_value(f"{CACHE_PREFIX}:names")
+
+
+def summarize(samples):
+    """Percentile summary of a list of sample dicts."""
+    out = {"count": len(samples)}
+    for metric in ("wall_ms", "queries", "query_ms", "cache_hits"):
+        values = sorted(flt(s.get(metric)) for s in samples)
+        stats = {f"p{p}": _percentile(values, p) for p in PERCENTILES}
+        stats["max"] = values[-1]
+        stats["avg"] = round(sum(values) / len(values), 3)
+        out[metric] = stats
+    return out
+
+
+# ----------------- Helpers -----------------
+
+def _should_sample():
+    """Decided once per request or job; frappe.local is fresh for each."""
+    if not getattr(frappe.local, "site", None) or not getattr(frappe.local, "db", None):
+        return False
+    sampled = getattr(frappe.local, "realapp_perf_sampled", None)
+    if sampled is None:
+        sampled = frappe.local.realapp_perf_sampled = _sample_this_request()
+    return sampled
+
+
+def _sample_this_request():
+    settings = frappe.get_cached_doc("Realapp Settings")
+    if not settings.get("enable_performance_tracking"):
+        return False
+    return random.random() * 100 < flt(settings.get("performance_sample_rate"))
+
+
+def _start():
+    """Install per-request counters on first (outermost) measured call."""
+    state = getattr(frappe.local, "realapp_perf", None)
+    if state:
+        state["depth"] += 1
+        return state["counters"]
+
+    counters = {"queries": 0, "query_ms": 0.0, "cache_hits": 0}
+    db = frappe.local.db
+    original_sql = db.sql
+
+    def counted_sql(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return original_sql(*args, **kwargs)
+        finally:
+            counters["queries"] += 1
+            counters["query_ms"] += (time.perf_counter() - started) * 1000
+
+    db.sql = counted_sql
+    _patch_cache()
+    frappe.local.realapp_perf = {"depth": 1, "counters": counters, "db": db}
+    return counters
+
+
+def _stop():
+    state = frappe.local.realapp_perf
+    state["depth"] -= 1
+    if state["depth"] == 0:
+        # drop the instance attribute so the class method is used again
+        state["db"].__dict__.pop("sql", None)
+        frappe.local.realapp_perf = None
+
+
+def _patch_cache():
+    """Count Redis cache hits for the current thread; patched once per process."""
+    from frappe.utils.redis_wrapper import RedisWrapper
+
+    if getattr(RedisWrapper, "_realapp_perf_patched", False):
+        return
+
+    def counting(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            value = method(self, *args, **kwargs)
+            state = getattr(frappe.local, "realapp_perf", None)
+            if state and value is not None:
+                state["counters"]["cache_hits"] += 1
+            return value
+
+        return wrapper
+
+    RedisWrapper.get_value = counting(RedisWrapper.get_value)
+    RedisWrapper.hget = counting(RedisWrapper.hget)
+    RedisWrapper._realapp_perf_patched = True
+
+
+def _record(label, sample):
+    try:
+        cache = frappe.cache()
+        key = _samples_key(label)
+        cache.lpush(key, json.dumps(sample))
+        cache.ltrim(key, 0, WINDOW_SIZE - 1)
+        cache.sadd(f"{CACHE_PREFIX}:names", label)
+    except Exception:
+        # instrumentation must never break the measured call
+        frappe.log_error(title="Realapp performance sample not recorded")
+
+
+def _samples_key(label):
+    return f"{CACHE_PREFIX}:samples:{label}"
+
+
+def _percentile(values, p):
+    if not values:
+        return 0
+    k = (len(values) - 1) * p / 100.0
+    lo, hi = int(k), min(int(k) + 1, len(values) - 1)
+    return round(values[lo] + (values[hi] - values[lo]) * (k - lo), 3)
+
+
+def _decode(value):
+    return value.decode() if isinstance(value, bytes) else value
@@ -0,0 +1,264 @@
+# Copyright (c) 2025, surendhranath
+# For license information, please see license.txt
+
+"""
+Late-payment interest on overdue booking invoices.
+
+`accrue_late_payment_interest` runs daily: open, overdue milestone invoices
+are read in keyset-paged chunks together with their dated payments, interest
+is computed per invoice by walking the balance between payment dates, and one
+Interest Accrual row per invoice is bulk inserted for the day. The row holds
+the total accrued to date, so the latest row is the current liability.
+`make_interest_debit_notes` bills whatever accrued interest is not yet billed.
+"""
+
+import frappe
+from frappe.utils import add_days, cint, date_diff, flt, getdate, today
+
+from realapp.instrumentation import instrument
+from realapp.utils import bulk_insert_rows
+
+CHUNK_SIZE = 5000
+ACCRUAL_FIELDS = (
+    "accrual_date",
+    "sales_invoice",
+    "booking_order",
+    "customer",
+    "project",
+    "block",
+    "due_date",
+    "interest_from",
+    "outstanding_amount",
+    "overdue_days",
+    "interest_rate",
+    "interest_amount",
+    "billed_interest",
+)
+
+
+def accrue_late_payment_interest(accrual_date=None, commit=True):
+    """Daily job: write today's accrued interest for every overdue booking invoice."""
+    settings = frappe.get_cached_doc("Realapp Settings")
+    rate = flt(settings.get("late_payment_interest_rate"))
+    if not rate or not frappe.db.table_exists("Sales Invoice"):
+        return 0
+
+    accrual_date = getdate(accrual_date or today())
+    grace_days = cint(settings.get("interest_grace_days"))
+    daily_rate = rate / 100 / (360 if settings.get("interest_day_count") == "Actual/360" else 365)
+
+    # re-running a day replaces its rows, except ones already billed
+    frappe.db.sql(
+        "DELETE FROM `tabInterest Accrual` WHERE accrual_date = %s AND IFNULL(debit_note, '') = ''",
+        (accrual_date,),
+    )
+
+    written, after = 0, ""
+    while True:
+        invoices = _overdue_invoices(add_days(accrual_date, -grace_days), after)
+        if not invoices:
+            break
+        after = invoices[-1].name
+
+        rows = compute_accruals(invoices, accrual_date, grace_days, daily_rate, rate)
+        bulk_insert_rows("Interest Accrual", ACCRUAL_FIELDS, rows)
+        written += len(rows)
+        if commit:
+            frappe.db.commit()
+
+    return written
+
+
+def compute_accruals(invoices, accrual_date, grace_days, daily_rate, rate):
+    """Accrual rows for one chunk of invoices; payments and billed interest are fetched once per chunk."""
+    names = [inv.name for inv in invoices]
+    payments = _payments_by_invoice(names, accrual_date)
+    billed = _billed_interest(names)
+    already_written = _already_accrued(names, accrual_date)
+
+    rows = []
+    for inv in invoices:
+        if inv.name in already_written:
+            continue
+        paid = payments.get(inv.name, [])
+        principal = flt(inv.outstanding_amount) + sum(amount for _date, amount in paid)
+        start = add_days(inv.due_date, grace_days)
+        interest = accrue_interest(principal, start, accrual_date, paid, daily_rate)
+        rows.append({
+            "accrual_date": accrual_date,
+            "sales_invoice": inv.name,
+            "booking_order": inv.booking_order,
+            "customer": inv.customer,
+            "project": inv.project,
+            "block": inv.block,
+            "due_date": inv.due_date,
+            "interest_from": start,
+            "outstanding_amount": inv.outstanding_amount,
+            "overdue_days": date_diff(accrual_date, inv.due_date),
+            "interest_rate": rate,
+            "interest_amount": flt(interest, 2),
+            "billed_interest": flt(billed.get(inv.name), 2),
+        })
+    return rows
+
+
+def accrue_interest(principal, start, end, payments, daily_rate):
+    """
+    Simple interest on a declining balance from `start` to `end` (exclusive).
+    `payments` is a date-sorted list of (posting_date, amount); each payment
+    reduces the balance from its posting date onwards.
+    """
+    start, end = getdate(start), getdate(end)
+    balance, cursor, interest = flt(principal), start, 0.0
+    for posting_date, amount in payments:
+        posting_date = getdate(posting_date)
+        if posting_date >= end:
+            break
+        if posting_date > cursor:
+            interest += max(balance, 0) * daily_rate * date_diff(posting_date, cursor)
+            cursor = posting_date
+        balance -= flt(amount)
+
+    if end > cursor:
+        interest += max(balance, 0) * daily_rate * date_diff(end, cursor)
+    return interest
+
+
+# ----------------- Debit notes -----------------
+
+def make_interest_debit_notes(accrual_date=None, commit=True):
+    """Monthly job: bill unbilled accrued interest as one debit note per invoice."""
+    settings = frappe.get_cached_doc("Realapp Settings")
+    if not settings.get("auto_create_interest_debit_notes") or not settings.get("interest_item"):
+        return []
+    return _create_debit_notes(settings.interest_item, accrual_date, commit)
+
+
+@frappe.whitelist(methods=["POST"])
+@instrument()
+def create_interest_debit_notes(accrual_date=None):
+    """Create debit notes for the unbilled interest accrued up to today (or the given date)."""
+    frappe.only_for(("Accounts Manager", "System Manager"))
+    item = frappe.get_cached_doc("Realapp Settings").get("interest_item")
+    if not item:
+        frappe.throw("Set an Interest Item in Realapp Settings first.")
+    return _create_debit_notes(item, accrual_date)
+
+
+def _create_debit_notes(item_code, accrual_date=None, commit=False):
+    """
+    Bill each invoice's latest accrual up to `accrual_date`. Invoices paid off
+    since the last run stop accruing, so their latest row is older than the
+    run date; it still holds the interest accrued up to the payment.
+    """
+    pending = frappe.db.sql(
+        """
+        SELECT ia.name, ia.sales_invoice, ia.booking_order, ia.customer, ia.accrual_date,
+            ia.interest_amount, ia.interest_amount - latest.billed AS amount
+        FROM `tabInterest Accrual` ia
+        JOIN (
+            SELECT sales_invoice, MAX(accrual_date) AS accrual_date, MAX(billed_interest) AS billed
+            FROM `tabInterest Accrual`
+            WHERE accrual_date <= %(accrual_date)s
+            GROUP BY sales_invoice
+        ) latest ON latest.sales_invoice = ia.sales_invoice AND latest.accrual_date = ia.accrual_date
+        WHERE IFNULL(ia.debit_note, '') = '' AND ia.interest_amount - latest.billed >= 1
+        ORDER BY ia.sales_invoice
+        """,
+        {"accrual_date": getdate(accrual_date or today())},
+        as_dict=True,
+    )
+
+    created = []
+    for i, row in enumerate(pending, 1):
+        debit_note = _make_debit_note(row, item_code, row.accrual_date)
+        frappe.db.set_value(
+            "Interest Accrual",
+            row.name,
+            {"debit_note": debit_note, "billed_interest": row.interest_amount},
+            update_modified=False,
+        )
+        created.append(debit_note)
+        if commit and i % 100 == 0:
+            frappe.db.commit()
+
+    return created
+
+
+def _make_debit_note(row, item_code, accrual_date):
+    si = frappe.get_doc({
+        "doctype": "Sales Invoice",
+        "customer": row.customer,
+        "company": frappe.db.get_value("Booking Order", row.booking_order, "company"),
+        "is_debit_note": 1,
+        "return_against": row.sales_invoice,
+        "posting_date": today(),
+        "due_date": today(),
+        "remarks": f"Late payment interest on {row.sales_invoice} up to {accrual_date}",
+        "items": [{"item_code": item_code, "qty": 1, "rate": flt(row.amount, 2)}],
+    })
+    si.insert(ignore_permissions=True)
+    si.submit()
+    return si.name
+
+
+# ----------------- Helpers -----------------
+
+def _overdue_invoices(due_before, after, limit=CHUNK_SIZE):
+    return frappe.db.sql(
+        """
+        SELECT name, customer, booking_order, realapp_project AS project, realapp_block AS block,
+            due_date, outstanding_amount
+        FROM `tabSales Invoice`
+        WHERE docstatus = 1 AND is_return = 0 AND is_debit_note = 0
+          AND IFNULL(booking_order, '') != ''
+          AND outstanding_amount > 0 AND due_date < %(due_before)s
+          AND name > %(after)s
+        ORDER BY name
+        LIMIT %(limit)s
+        """,
+        {"due_before": due_before, "after": after, "limit": limit},
+        as_dict=True,
+    )
+
+
+def _payments_by_invoice(invoices, until):
+    out = {}
+    for invoice, posting_date, amount in frappe.db.sql(
+        """
+        SELECT per.reference_name, pe.posting_date, SUM(per.allocated_amount)
+        FROM `tabPayment Entry Reference` per
+        JOIN `tabPayment Entry` pe ON pe.name = per.parent
+        WHERE per.docstatus = 1 AND per.reference_doctype = 'Sales Invoice'
+          AND per.reference_name IN %(invoices)s AND pe.posting_date < %(until)s
+        GROUP BY per.reference_name, pe.posting_date
+        ORDER BY per.reference_name, pe.posting_date
+        """,
+        {"invoices": tuple(invoices), "until": until},
+    ):
+        out.setdefault(invoice, []).append((posting_date, flt(amount)))
+    return out
+
+
+def _billed_interest(invoices):
+    return dict(
+        frappe.db.sql(
+            """
+            SELECT sales_invoice, MAX(billed_interest)
+            FROM `tabInterest Accrual`
+            WHERE sales_invoice IN %(invoices)s
+            GROUP BY sales_invoice
+            """,
+            {"invoices": tuple(invoices)},
+        )
+    )
+
+
+def _already_accrued(invoices, accrual_date):
+    return set(
+        frappe.get_all(
+            "Interest Accrual",
+            filters={"sales_invoice": ("in", invoices), "accrual_date": accrual_date},
+            pluck="sales_invoice",
+        )
+    )
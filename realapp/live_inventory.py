@@ -0,0 +1,143 @@
+# Copyright (c) 2025, surendhranath
+# For license information, please see license.txt
+
+"""
+Live unit inventory for sales dashboards.
+
+Dashboards load a project's inventory once with `get_inventory_snapshot`
+and then follow the `realapp_inventory` realtime event in the Project's
+document room. Unit status and price changes are pushed to a per-project
+Redis list after commit. The first change in a window enqueues a flush
+job, which drains the list, keeps only the latest state per unit and
+publishes one delta message; changes in the next COALESCE_SEC only append,
+and go out with the first change after the window, or with the per-minute
+`flush_pending_inventory` if the project has gone quiet. No job waits out a
+window. Every message carries the next number of a per-project sequence and
+the snapshot carries the sequence it was taken at, so a client applies
+deltas newer than its snapshot and reloads when it sees a gap.
+"""
+
+import json
+
+import frappe
+from frappe.utils import flt
+
+from realapp.cache import get_cached, inventory_scopes
+from realapp.instrumentation import instrument
+
+EVENT = "realapp_inventory"
+LIVE_FIELDS = ("status", "basic_price_per_sft", "net_payable")
+SNAPSHOT_FIELDS = (
+    "name",
+    "block",
+    "floor_number",
+    "flat_number",
+    "flat_type",
+    "facing",
+    "salable_area",
+    *LIVE_FIELDS,
+)
+PENDING_KEY = "realapp:live:pending:{}"
+FLUSH_KEY = "realapp:live:flush:{}"
+SEQ_KEY = "realapp:live:seq:{}"
+PROJECTS_KEY = "realapp:live:projects"
+# at most one message per project in this many seconds; the flag's expiry closes the window
+COALESCE_SEC = 2
+
+
+@frappe.whitelist()
+@instrument()
+def get_inventory_snapshot(project):
+    """All units of the project as rows of SNAPSHOT_FIELDS, with the sequence number they are current to."""
+    frappe.has_permission("Unit", "read", throw=True)
+    return get_cached("live_inventory", inventory_scopes(project), {"project": project}, lambda: build_snapshot(project))
+
+
+def build_snapshot(project):
+    # read the sequence first: any change missing from the rows below is published with a later number
+    seq = get_sequence(project)
+    units = frappe.db.sql(
+        f"""
+        SELECT {", ".join(f"`{f}`" for f in SNAPSHOT_FIELDS)}
+        FROM `tabUnit`
+        WHERE project = %s
+        ORDER BY block, floor_number, name
+        """,
+        (project,),
+        as_list=True,
+    )
+    return {"project": project, "seq": seq, "fields": SNAPSHOT_FIELDS, "units": [list(u) for u in units]}
+
+
+def publish_unit_change(doc, deleted=False):
+    """Unit hook: queue a delta if a live field changed; published after commit."""
+    if not doc.project or not (deleted or _live_fields_changed(doc)):
+        return
+    delta = [doc.name, None, None, None] if deleted else [doc.name, *(_live_value(doc, f) for f in LIVE_FIELDS)]
+    frappe.db.after_commit.add(lambda: _push(doc.project, delta))
+
+
+def flush_inventory_deltas(project):
+    """Publish every pending delta of the project as one message, latest state per unit."""
+    pipe = frappe.cache().pipeline()
+    # a change pushed after this registers the project again
+    pipe.srem(_key(PROJECTS_KEY), project)
+    pipe.lrange(_key(PENDING_KEY, project), 0, -1)
+    pipe.delete(_key(PENDING_KEY, project))
+    _removed, raw, _deleted = pipe.execute()
+    if not raw:
+        return
+
+    latest = {}
+    for item in raw:
+        delta = json.loads(item)
+        latest[delta[0]] = delta
+
+    frappe.publish_realtime(
+        EVENT,
+        {"project": project, "seq": frappe.cache().incr(_key(SEQ_KEY, project)), "units": list(latest.values())},
+        doctype="Project",
+        docname=project,
+    )
+
+
+def flush_pending_inventory():
+    """Scheduler job: publish what is left of windows that closed without a later change."""
+    for project in frappe.cache().smembers(_key(PROJECTS_KEY)):
+        project = frappe.safe_decode(project)
+        if _open_window(project):
+            flush_inventory_deltas(project)
+
+
+def get_sequence(project):
+    return int(frappe.cache().get(_key(SEQ_KEY, project)) or 0)
+
+
+# ----------------- Helpers -----------------
+
+def _live_fields_changed(doc):
+    if not doc.get_doc_before_save():
+        return True
+    return any(doc.has_value_changed(f) for f in LIVE_FIELDS)
+
+
+def _live_value(doc, field):
+    return doc.get(field) if field == "status" else flt(doc.get(field), 2)
+
+
+def _push(project, delta):
+    pipe = frappe.cache().pipeline()
+    pipe.rpush(_key(PENDING_KEY, project), json.dumps(delta))
+    pipe.sadd(_key(PROJECTS_KEY), project)
+    pipe.execute()
+    # only the first change of a window enqueues a flush; the rest wait for the next one
+    if _open_window(project):
+        frappe.enqueue("realapp.live_inventory.flush_inventory_deltas", queue="short", project=project)
+
+
+def _open_window(project):
+    return bool(frappe.cache().set(_key(FLUSH_KEY, project), 1, nx=True, ex=COALESCE_SEC))
+
+
+def _key(template, project=None):
+    return frappe.cache().make_key(template.format(project))
@@ -0,0 +1,88 @@
+import frappe
+from frappe.utils import flt
+
+from realapp.events.sales_invoice import _first_open_row
+
+def execute():
+    """
+    Backfill invoice_status / sales_invoice / invoiced_amount on Booking Order
+    Payment Schedule rows from already submitted Sales Invoices.
+    Matches on Sales Invoice Item.milestone_code; lines without one go to the
+    first uninvoiced row with that item, as the Sales Invoice hook does.
+    """
+    doctype = "Booking Order Payment Schedule"
+    if not frappe.db.has_column(doctype, "invoice_status"):
+        frappe.logger().warning(f"⚠️ Column 'invoice_status' not found in {doctype}. Skipping backfill.")
+        return
+
+    frappe.db.sql(f"""
+        UPDATE `tab{doctype}`
+        SET invoice_status = 'Not Invoiced'
+        WHERE IFNULL(invoice_status, '') = ''
+    """)
+
+    frappe.db.sql(f"""
+        UPDATE `tab{doctype}` ps
+        JOIN `tabSales Invoice` si
+            ON si.booking_order = ps.parent AND si.docstatus = 1
+        JOIN (
+            SELECT parent, milestone_code, SUM(amount) AS amount
+            FROM `tabSales Invoice Item`
+            WHERE IFNULL(milestone_code, '') != ''
+            GROUP BY parent, milestone_code
+        ) sii ON sii.parent = si.name
+        SET ps.invoice_status = 'Invoiced',
+            ps.sales_invoice = si.name,
+            ps.invoiced_amount = sii.amount
+        WHERE ps.parenttype = 'Booking Order'
+          AND sii.milestone_code = ps.scheme_code
+    """)
+
+    lines = frappe.db.sql("""
+        SELECT si.name AS invoice, si.booking_order, sii.item_code, sii.amount
+        FROM `tabSales Invoice Item` sii
+        JOIN `tabSales Invoice` si ON si.name = sii.parent
+        WHERE si.docstatus = 1 AND IFNULL(si.booking_order, '') != ''
+          AND IFNULL(sii.milestone_code, '') = ''
+        ORDER BY si.posting_date, si.name, sii.idx
+    """, as_dict=True)
+    if lines:
+        for row, invoice, amount in assign_item_lines(lines, _schedule_rows(doctype, {l.booking_order for l in lines})):
+            frappe.db.set_value(doctype, row.name, {
+                "invoice_status": "Invoiced",
+                "sales_invoice": invoice,
+                "invoiced_amount": flt(amount, 2),
+            }, update_modified=False)
+
+    frappe.db.commit()
+    frappe.logger().info(f"✅ Backfilled invoice status on {doctype} rows.")
+
+
+def assign_item_lines(lines, rows_by_booking):
+    """
+    [(row, invoice, amount)] for invoice lines that only carry an item code,
+    oldest invoice first; each line takes the first open row with its item.
+    """
+    assigned = []
+    for line in lines:
+        rows = rows_by_booking.get(line.booking_order) or []
+        # rows this invoice already holds, by milestone code or an earlier line
+        taken = {r.name for r in rows if r.sales_invoice == line.invoice}
+        row = _first_open_row(rows, line.item_code, line.invoice, taken)
+        if not row or row.sales_invoice:
+            continue
+        row.sales_invoice = line.invoice
+        assigned.append((row, line.invoice, flt(line.amount)))
+    return assigned
+
+
+def _schedule_rows(doctype, booking_orders):
+    rows = {}
+    for r in frappe.get_all(
+        doctype,
+        filters={"parenttype": "Booking Order", "parent": ("in", list(booking_orders))},
+        fields=["name", "parent", "scheme_code", "milestone_item", "sales_invoice", "invoice_status"],
+        order_by="parent asc, idx asc",
+    ):
+        rows.setdefault(r.parent, []).append(r)
+    return rows
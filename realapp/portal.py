@@ -0,0 +1,154 @@
+# Copyright (c) 2025, surendhranath
+# For license information, please see license.txt
+
+"""
+Website data: the public availability listing and the buyer portal.
+
+The availability listing (the /availability/<project> page and the
+`get_availability` JSON endpoint) groups a project's Available units by
+block, floor, flat type and facing, with area and price bands instead of
+unit prices. Both the payload and the rendered listing are cached on the
+project's inventory scope, so they are rebuilt only after a Unit of the
+project changes; the JSON endpoint answers conditional GETs with 304.
+
+The buyer portal (/my_bookings) shows the statement of every customer the
+logged-in user is a contact of. Statements come from the set-based
+`get_statement_data` and are cached per customer until one of their
+bookings, invoices or payments changes.
+"""
+
+import json
+import math
+
+import frappe
+from frappe.utils import cint, flt, today
+from werkzeug.wrappers import Response
+
+from realapp.cache import customer_scopes, get_cached, get_etag, inventory_scopes
+from realapp.statements import get_statement_data
+
+PRICE_BAND = 500000
+MAX_AGE_SEC = 60
+LISTING_TEMPLATE = "realapp/templates/includes/availability_listing.html"
+
+
+@frappe.whitelist(allow_guest=True, methods=["GET"])
+def get_availability(project):
+    """Available units of a project by block, floor, flat type and facing; supports If-None-Match."""
+    validate_public_project(project)
+    # taken before the payload, so a change in between yields a newer payload under an older tag, never the reverse
+    etag = get_etag("public_availability", inventory_scopes(project), {"project": project})
+    payload = get_public_availability(project)
+
+    response = Response(json.dumps({"message": payload}, default=str), mimetype="application/json")
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = MAX_AGE_SEC
+    return response.make_conditional(frappe.request)
+
+
+def get_public_availability(project):
+    return get_cached(
+        "public_availability",
+        inventory_scopes(project),
+        {"project": project},
+        lambda: build_availability(project),
+    )
+
+
+def get_availability_listing(project):
+    """Rendered listing for the website page, cached alongside the payload."""
+    return get_cached(
+        "public_availability_html",
+        inventory_scopes(project),
+        {"project": project},
+        lambda: frappe.render_template(LISTING_TEMPLATE, {"availability": get_public_availability(project)}),
+    )
+
+
+def build_availability(project):
+    blocks = {}
+    for r in frappe.db.sql(
+        """
+        SELECT block, floor_number, IFNULL(flat_type, '') AS flat_type, IFNULL(facing, '') AS facing,
+            COUNT(*) AS units,
+            MIN(salable_area) AS area_from, MAX(salable_area) AS area_to,
+            MIN(net_payable) AS price_from, MAX(net_payable) AS price_to
+        FROM `tabUnit`
+        WHERE project = %s AND status = 'Available'
+        GROUP BY block, floor_number, IFNULL(flat_type, ''), IFNULL(facing, '')
+        ORDER BY block, floor_number, flat_type, facing
+        """,
+        (project,),
+        as_dict=True,
+    ):
+        blocks.setdefault(r.block, []).append({
+            "floor": cint(r.floor_number),
+            "flat_type": r.flat_type,
+            "facing": r.facing,
+            "units": cint(r.units),
+            "area_from": flt(r.area_from),
+            "area_to": flt(r.area_to),
+            "price_band": _price_band(r.price_from, r.price_to),
+        })
+
+    return {
+        "project": project,
+        "available_units": sum(row["units"] for rows in blocks.values() for row in rows),
+        "blocks": [{"block": block, "rows": rows} for block, rows in blocks.items()],
+    }
+
+
+# ----------------- Buyer portal -----------------
+
+@frappe.whitelist()
+def get_my_statements():
+    """Statements of the customers the session user is a contact of."""
+    if frappe.session.user == "Guest":
+        raise frappe.PermissionError
+    return get_buyer_statements(get_portal_customers(frappe.session.user))
+
+
+def get_buyer_statements(customers):
+    """Cached statement per customer; on any miss, all of them are built in one set-based pass."""
+    as_on = today()
+    built = {}
+
+    def build(customer):
+        if not built:
+            built.update(get_statement_data(customers, as_on=as_on))
+        return built[customer]
+
+    return [
+        get_cached("buyer_statement", customer_scopes(c), {"customer": c, "as_on": as_on}, lambda c=c: build(c))
+        for c in customers
+    ]
+
+
+def get_portal_customers(user):
+    return frappe.db.sql_list(
+        """
+        SELECT DISTINCT dl.link_name
+        FROM `tabContact` c
+        JOIN `tabDynamic Link` dl ON dl.parent = c.name AND dl.parenttype = 'Contact'
+        WHERE c.user = %s AND dl.link_doctype = 'Customer'
+        ORDER BY dl.link_name
+        """,
+        (user,),
+    )
+
+
+def validate_public_project(project):
+    # the document cache keeps repeat requests off the database
+    if not project or not frappe.get_cached_value("Project", project, "name"):
+        raise frappe.DoesNotExistError(f"Project {project} not found")
+
+
+# ----------------- Helpers -----------------
+
+def _price_band(low, high):
+    """Prices rounded outwards to PRICE_BAND, so listings never expose a unit's exact price."""
+    if not flt(high):
+        return None
+    band_low = math.floor(flt(low) / PRICE_BAND) * PRICE_BAND
+    return [band_low, max(math.ceil(flt(high) / PRICE_BAND) * PRICE_BAND, band_low + PRICE_BAND)]
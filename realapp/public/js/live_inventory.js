@@ -0,0 +1,79 @@
+// Copyright (c) 2025, surendhranath and contributors
+// For license information, please see license.txt
+
+// Snapshot-plus-deltas client for a project's unit inventory.
+//
+//   const live = new realapp.LiveInventory('My Project', (units, changed) => render(units, changed));
+//   live.start();
+//
+// `units` maps unit name to {name, block, ..., status, basic_price_per_sft, net_payable};
+// `changed` lists the unit names touched by the last delta (all of them after a snapshot).
+frappe.provide('realapp');
+
+realapp.LiveInventory = class LiveInventory {
+    constructor(project, on_change) {
+        this.project = project;
+        this.on_change = on_change;
+        this.units = {};
+        this.seq = null;
+        this.buffer = [];
+        this.handler = (data) => this.on_delta(data);
+    }
+
+    start() {
+        frappe.realtime.doc_subscribe('Project', this.project);
+        frappe.realtime.on('realapp_inventory', this.handler);
+        return this.load_snapshot();
+    }
+
+    stop() {
+        frappe.realtime.off('realapp_inventory', this.handler);
+        frappe.realtime.doc_unsubscribe('Project', this.project);
+    }
+
+    load_snapshot() {
+        this.seq = null;
+        return frappe.xcall('realapp.live_inventory.get_inventory_snapshot', { project: this.project }).then((snapshot) => {
+            this.units = {};
+            snapshot.units.forEach((row) => {
+                const unit = {};
+                snapshot.fields.forEach((field, i) => { unit[field] = row[i]; });
+                this.units[unit.name] = unit;
+            });
+            this.seq = snapshot.seq;
+            this.on_change(this.units, Object.keys(this.units));
+
+            // deltas that arrived while the snapshot was loading
+            const pending = this.buffer.filter((d) => d.seq > this.seq);
+            this.buffer = [];
+            pending.sort((a, b) => a.seq - b.seq).forEach((d) => this.on_delta(d));
+        });
+    }
+
+    on_delta(data) {
+        if (data.project !== this.project) return;
+        if (this.seq === null) {
+            this.buffer.push(data);
+            return;
+        }
+        if (data.seq <= this.seq) return;
+        if (data.seq > this.seq + 1) {
+            // a message was missed; start again from a fresh snapshot
+            this.buffer.push(data);
+            this.load_snapshot();
+            return;
+        }
+
+        const changed = [];
+        data.units.forEach(([name, status, basic_price_per_sft, net_payable]) => {
+            if (status === null) {
+                delete this.units[name];
+            } else {
+                this.units[name] = Object.assign(this.units[name] || { name }, { status, basic_price_per_sft, net_payable });
+            }
+            changed.push(name);
+        });
+        this.seq = data.seq;
+        this.on_change(this.units, changed);
+    }
+};
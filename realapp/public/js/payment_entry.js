@@ -0,0 +1,30 @@
+// Copyright (c) 2025, surendhranath and contributors
+// For license information, please see license.txt
+
+frappe.ui.form.on('Payment Entry', {
+    refresh(frm) {
+        if (frm.doc.docstatus === 0 && frm.doc.payment_type === 'Receive' && frm.doc.booking_order && !frm.is_new()) {
+            frm.add_custom_button(__('Allocate to Booking Invoices'), () => {
+                frappe.call({
+                    method: 'realapp.allocation.allocate_payment_entry',
+                    args: { payment_entry: frm.doc.name },
+                    freeze: true,
+                    callback() {
+                        frm.reload_doc();
+                    }
+                });
+            });
+        }
+    },
+
+    booking_order(frm) {
+        if (!frm.doc.booking_order) return;
+        frappe.db.get_value('Booking Order', frm.doc.booking_order, ['party_type', 'party']).then(r => {
+            const bo = r.message || {};
+            if (bo.party_type === 'Customer' && !frm.doc.party) {
+                frm.set_value('party_type', 'Customer');
+                frm.set_value('party', bo.party);
+            }
+        });
+    }
+});
@@ -0,0 +1,15 @@
+// Copyright (c) 2025, surendhranath and contributors
+// For license information, please see license.txt
+
+// Unit link query shared by the Cost Sheet and Booking Order forms:
+//
+//   frm.set_query('unit', () => realapp.sellable_unit_query(frm));
+//
+// Only units that can still be sold, within the form's project once it is known.
+frappe.provide('realapp');
+
+realapp.sellable_unit_query = function (frm) {
+    const filters = {};
+    if (frm.doc.project) filters.project = frm.doc.project;
+    return { query: 'realapp.realapp.doctype.unit.unit.sellable_unit_query', filters };
+};
@@ -0,0 +1,18 @@
+# Copyright (c) 2025, surendhranath and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class BankStatementLine(Document):
+	def validate(self):
+		if self.payment_entry and self.has_value_changed("sales_invoice"):
+			frappe.throw(f"Line {self.line_no} is already posted as {self.payment_entry}.")
+		if self.approved and not self.sales_invoice:
+			frappe.throw(f"Line {self.line_no} needs a Sales Invoice before it can be approved.")
+
+
+def on_doctype_update():
+	# review screens and the posting job page through one batch at a time
+	frappe.db.add_index("Bank Statement Line", ["batch", "approved", "line_no"])
@@ -0,0 +1,44 @@
+// Copyright (c) 2025, surendhranath and contributors
+// For license information, please see license.txt
+
+frappe.ui.form.on('Bank Statement Match Batch', {
+    setup(frm) {
+        frm.set_query('bank_account', () => ({
+            filters: { company: frm.doc.company, account_type: ['in', ['Bank', 'Cash']], is_group: 0 }
+        }));
+    },
+
+    refresh(frm) {
+        if (frm.is_new()) return;
+
+        if (['Draft', 'Matched', 'Failed'].includes(frm.doc.status)) {
+            frm.add_custom_button(__('Match Lines'), () => {
+                frm.call('start_matching').then(() => frm.reload_doc());
+            }, __('Actions'));
+        }
+        if (['Matched', 'Failed'].includes(frm.doc.status) && frm.doc.approved_lines) {
+            frm.add_custom_button(__('Post Approved'), () => {
+                frappe.confirm(
+                    __('Create and submit Payment Entries for {0} approved lines?', [frm.doc.approved_lines]),
+                    () => frm.call('post_approved').then(() => frm.reload_doc())
+                );
+            }, __('Actions'));
+        }
+        if (frm.doc.total_lines) {
+            frm.add_custom_button(__('Review Lines'), () => {
+                frappe.set_route('List', 'Bank Statement Line', { batch: frm.doc.name });
+            });
+        }
+    }
+});
+
+frappe.realtime.on('realapp_reconciliation_progress', (data) => {
+    const frm = cur_frm;
+    if (frm && frm.doctype === 'Bank Statement Match Batch' && frm.doc.name === data.batch) {
+        frappe.show_progress(data.title, data.progress, data.total, data.description);
+        if (data.progress >= data.total) {
+            frappe.hide_progress();
+            frm.reload_doc();
+        }
+    }
+});
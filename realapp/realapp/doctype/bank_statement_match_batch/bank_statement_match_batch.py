@@ -0,0 +1,34 @@
+# Copyright (c) 2025, surendhranath and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class BankStatementMatchBatch(Document):
+	def validate(self):
+		if self.status in ("Matching", "Posting") and not self.is_new():
+			frappe.throw(f"Batch {self.name} is being processed; try again once it finishes.")
+
+	@frappe.whitelist()
+	def start_matching(self):
+		self._enqueue("realapp.reconciliation.match_batch", "Matching")
+
+	@frappe.whitelist()
+	def post_approved(self):
+		if self.status not in ("Matched", "Posting", "Failed"):
+			frappe.throw("Run matching before posting.")
+		self._enqueue("realapp.reconciliation.post_batch", "Posting")
+
+	def _enqueue(self, method, status):
+		self.check_permission("write")
+		self.db_set("status", status)
+		frappe.enqueue(
+			method,
+			queue="long",
+			timeout=3600,
+			job_id=f"{method}:{self.name}",
+			deduplicate=True,
+			enqueue_after_commit=True,
+			batch=self.name,
+		)
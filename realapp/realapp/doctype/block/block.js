@@ -10,9 +10,31 @@ frappe.ui.form.on('Block', {
     // When a Payment Scheme Template is added in available_payment_schemes
     refresh(frm) {
         frm.set_intro("Configure which Payment Scheme Templates are valid for this Block. Tower Milestone dates are shared across all templates.");
+
+        if (!frm.is_new() && (frm.doc.tower_milestones || []).length) {
+            frm.add_custom_button(__('Demand Letters'), () => open_demand_letter_dialog(frm), __('Create'));
+        }
     }
 });
 
+function open_demand_letter_dialog(frm) {
+    const reached = (frm.doc.tower_milestones || []).filter(m => m.milestone_date);
+    frappe.prompt([
+        {
+            fieldname: 'scheme_code',
+            fieldtype: 'Select',
+            label: __('Milestone'),
+            reqd: 1,
+            options: reached.map(m => ({ value: m.scheme_code, label: `${m.scheme_code} - ${m.milestone || ''}` })),
+        },
+        { fieldname: 'emails_per_minute', fieldtype: 'Int', label: __('Emails per Minute'), default: 60 },
+    ], (values) => {
+        frappe.db.insert({ doctype: 'Demand Letter Run', block: frm.doc.name, ...values }).then(doc => {
+            frappe.set_route('Form', 'Demand Letter Run', doc.name);
+        });
+    }, __('Send Demand Letters'), __('Create Run'));
+}
+
 frappe.ui.form.on('Block Payment Scheme', {
     payment_scheme_template: function(frm, cdt, cdn) {
         let row = locals[cdt][cdn];
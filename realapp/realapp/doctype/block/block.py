@@ -1,9 +1,157 @@
 # Copyright (c) 2025, surendhranath and contributors
 # For license information, please see license.txt
 
-# import frappe
+import frappe
 from frappe.model.document import Document
+from frappe.utils import getdate, now, today
+
+from realapp.cache import invalidate_collections, invalidate_customers
+from realapp.instrumentation import instrument
+from realapp.realapp.doctype.booking_order.booking_order import get_booking_customers
+
+# Towers with more schedules than this are updated in a background job
+SYNC_PROPAGATION_LIMIT = 500
+PROPAGATION_CHUNK_SIZE = 1000
 
 
 class Block(Document):
-	pass
+	@instrument()
+	def on_update(self):
+		changes = self._get_milestone_date_changes()
+		if not changes:
+			return
+
+		if frappe.db.count("Cost Sheet", {"block": self.name}) > SYNC_PROPAGATION_LIMIT:
+			# no diff is passed: the job applies the block's dates as they are when it runs,
+			# so jobs from saves in quick succession are idempotent and the last one wins
+			frappe.enqueue(
+				"realapp.realapp.doctype.block.block.propagate_milestone_dates",
+				queue="long",
+				enqueue_after_commit=True,
+				block=self.name,
+			)
+			frappe.msgprint(f"Milestone date changes for {self.name} are being applied in the background.")
+		else:
+			propagate_milestone_dates(self.name, changes, commit=False)
+
+	def _get_milestone_date_changes(self):
+		"""Return {scheme_code: new milestone_date} for tower milestones whose date moved."""
+		before = self.get_doc_before_save()
+		if not before:
+			return {}
+
+		old_dates = {r.scheme_code: r.milestone_date for r in before.get("tower_milestones") or []}
+		changes = {}
+		for row in self.get("tower_milestones") or []:
+			if not row.scheme_code or not row.milestone_date or row.scheme_code not in old_dates:
+				continue
+			old = old_dates[row.scheme_code]
+			if not old or getdate(old) != getdate(row.milestone_date):
+				changes[row.scheme_code] = str(getdate(row.milestone_date))
+		return changes
+
+
+def propagate_milestone_dates(block, changes=None, commit=True):
+	"""
+	Push moved tower milestone dates into every Cost Sheet / Booking Order
+	schedule in the block and into the due dates of unpaid invoices.
+	Without `changes`, the block's current date for every scheme_code is
+	applied. Updates are set-based per scheme_code and chunked by parent document.
+	"""
+	changes = frappe.parse_json(changes) if isinstance(changes, str) else changes
+	if changes is None:
+		changes = get_milestone_dates(block)
+	stamp = now()
+
+	for parenttype in ("Cost Sheet", "Booking Order"):
+		parents = frappe.get_all(parenttype, filters={"block": block, "docstatus": ("<", 2)}, pluck="name")
+		for chunk in _chunks(parents):
+			for scheme_code, milestone_date in changes.items():
+				frappe.db.sql(
+					f"""
+					UPDATE `tab{parenttype} Payment Schedule`
+					SET milestone_date = %(date)s
+					WHERE parenttype = %(parenttype)s
+					  AND parent IN %(parents)s
+					  AND scheme_code = %(scheme_code)s
+					  AND IFNULL(milestone_date, '1900-01-01') != %(date)s
+					""",
+					{"date": milestone_date, "parenttype": parenttype, "parents": chunk, "scheme_code": scheme_code},
+				)
+			frappe.db.sql(
+				f"UPDATE `tab{parenttype}` SET modified = %s WHERE name IN %s",
+				(stamp, chunk),
+			)
+			if commit:
+				frappe.db.commit()
+
+	booking_orders = frappe.get_all("Booking Order", filters={"block": block, "docstatus": 1}, pluck="name")
+	for chunk in _chunks(booking_orders):
+		for scheme_code, milestone_date in changes.items():
+			_update_invoice_due_dates(chunk, scheme_code, milestone_date)
+		if commit:
+			frappe.db.commit()
+
+	invalidate_collections(frappe.db.get_value("Block", block, "project"))
+	# due dates moved on the buyers' statements too
+	invalidate_customers(*get_booking_customers(booking_orders))
+
+
+def get_milestone_dates(block):
+	return {
+		r.scheme_code: str(getdate(r.milestone_date))
+		for r in frappe.get_all(
+			"Tower Milestone",
+			filters={"parent": block, "parenttype": "Block", "parentfield": "tower_milestones"},
+			fields=["scheme_code", "milestone_date"],
+		)
+		if r.scheme_code and r.milestone_date
+	}
+
+
+def _update_invoice_due_dates(booking_orders, scheme_code, milestone_date):
+	"""Move due dates of unpaid milestone invoices, never before their posting date."""
+	invoices = frappe.db.sql_list(
+		"""
+		SELECT DISTINCT si.name
+		FROM `tabSales Invoice` si
+		JOIN `tabSales Invoice Item` sii ON sii.parent = si.name
+		WHERE si.booking_order IN %(booking_orders)s
+		  AND si.docstatus = 1
+		  AND si.outstanding_amount > 0
+		  AND sii.milestone_code = %(scheme_code)s
+		""",
+		{"booking_orders": booking_orders, "scheme_code": scheme_code},
+	)
+	if not invoices:
+		return
+
+	values = {"date": milestone_date, "invoices": invoices, "today": today()}
+	frappe.db.sql(
+		"""
+		UPDATE `tabSales Invoice`
+		SET due_date = GREATEST(posting_date, %(date)s),
+			status = CASE
+				WHEN status IN ('Unpaid', 'Overdue') AND GREATEST(posting_date, %(date)s) < %(today)s THEN 'Overdue'
+				WHEN status IN ('Unpaid', 'Overdue') THEN 'Unpaid'
+				ELSE status
+			END
+		WHERE name IN %(invoices)s
+		""",
+		values,
+	)
+	# ERPNext derives overdue status from the invoice payment schedule
+	frappe.db.sql(
+		"""
+		UPDATE `tabPayment Schedule` ps
+		JOIN `tabSales Invoice` si ON si.name = ps.parent
+		SET ps.due_date = si.due_date
+		WHERE ps.parenttype = 'Sales Invoice' AND ps.parent IN %(invoices)s
+		""",
+		values,
+	)
+
+
+def _chunks(names, size=PROPAGATION_CHUNK_SIZE):
+	for i in range(0, len(names), size):
+		yield tuple(names[i : i + size])
@@ -1,9 +1,28 @@
 # Copyright (c) 2025, surendhranath and Contributors
 # See license.txt
 
-# import frappe
-from frappe.tests.utils import FrappeTestCase
+import frappe
+from frappe.utils import add_days, getdate, today
 
+from realapp.realapp.doctype.block.block import propagate_milestone_dates
+from realapp.tests.utils import RealappTestCase, make_cost_sheet
 
-class TestBlock(FrappeTestCase):
-	pass
+
+class TestBlock(RealappTestCase):
+	needs_company = False
+
+	def test_background_propagation_applies_current_dates(self):
+		cs = make_cost_sheet(self.fixture.units[0], self.fixture)
+		new_date = add_days(today(), 400)
+		# two saves in a row: the job sees the latest dates whichever save enqueued it
+		for date in (add_days(today(), 200), new_date):
+			frappe.db.set_value(
+				"Tower Milestone", {"parent": cs.block, "scheme_code": "C-2"}, "milestone_date", date
+			)
+
+		propagate_milestone_dates(cs.block, commit=False)
+
+		date = frappe.db.get_value(
+			"Cost Sheet Payment Schedule", {"parent": cs.name, "scheme_code": "C-2"}, "milestone_date"
+		)
+		self.assertEqual(getdate(date), getdate(new_date))
@@ -3,6 +3,7 @@
 
 frappe.ui.form.on('Booking Order', {
   setup(frm) {
+    frm.set_query('unit', () => realapp.sellable_unit_query(frm));
     frm.set_query("cost_sheet", () => {
       return {
         filters: {
@@ -22,6 +23,9 @@ frappe.ui.form.on('Booking Order', {
       frm.add_custom_button(__('Sales Invoice'), () => {
         open_milestone_dialog(frm);
       }, __('Create'));
+      frm.add_custom_button(__('Receipt'), () => {
+        open_receipt_dialog(frm);
+      }, __('Create'));
     }
   },
 
@@ -44,6 +48,12 @@ frappe.ui.form.on('Booking Order', {
 
 // ----------------- Helpers -----------------
 
+// Schedule fields mirrored from the Cost Sheet (SCHEDULE_SYNC_FIELDS in booking_order.py)
+const SCHEDULE_SYNC_FIELDS = [
+  "scheme_code", "milestone", "milestone_item", "particulars", "percentage",
+  "milestone_date", "amount", "gst_amount", "tds_amount", "net_payable"
+];
+
 function pull_cost_sheet_snapshot(frm) {
   frappe.call({
     method: "frappe.client.get",
@@ -69,21 +79,19 @@ function pull_cost_sheet_snapshot(frm) {
         payment_scheme_template: cs.payment_scheme_template
       });
 
-      // Pull child table rows
-      frm.clear_table("payment_schedule");
-      (cs.payment_schedule || []).forEach(row => {
-        let child = frm.add_child("payment_schedule");
-        frappe.model.set_value(child.doctype, child.name, "scheme_code", row.scheme_code);
-        frappe.model.set_value(child.doctype, child.name, "milestone", row.milestone);
-        frappe.model.set_value(child.doctype, child.name, "milestone_item", row.milestone_item);
-        frappe.model.set_value(child.doctype, child.name, "particulars", row.particulars);
-        frappe.model.set_value(child.doctype, child.name, "percentage", row.percentage);
-        frappe.model.set_value(child.doctype, child.name, "milestone_date", row.milestone_date);
-        frappe.model.set_value(child.doctype, child.name, "amount", row.amount);
-        frappe.model.set_value(child.doctype, child.name, "gst_amount", row.gst_amount);
-        frappe.model.set_value(child.doctype, child.name, "tds_amount", row.tds_amount);
-        frappe.model.set_value(child.doctype, child.name, "net_payable", row.net_payable);
+      // Pull child table rows, matched by scheme_code so saved rows keep their names
+      const existing = {};
+      (frm.doc.payment_schedule || []).forEach(d => {
+        (existing[d.scheme_code] = existing[d.scheme_code] || []).push(d);
       });
+      const rows = (cs.payment_schedule || []).map(row => {
+        const child = (existing[row.scheme_code] || []).shift() || frm.add_child("payment_schedule");
+        SCHEDULE_SYNC_FIELDS.forEach(field => { child[field] = row[field]; });
+        return child;
+      });
+      rows.forEach((d, i) => { d.idx = i + 1; });
+      frm.doc.payment_schedule = rows;
+      frm.dirty();
       frm.refresh_field("payment_schedule");
 
       compute_balance(frm);
@@ -112,7 +120,8 @@ function open_milestone_dialog(frm) {
         cannot_delete_rows: true,
         hide_row_index: true,
         in_place_edit: false,
-        data: (frm.doc.payment_schedule || []).map(r => {
+        // Invoiced milestones are tracked on the row itself; only offer the rest
+        data: (frm.doc.payment_schedule || []).filter(r => r.invoice_status !== 'Invoiced').map(r => {
           return {
             name: r.name,
             scheme_code: r.scheme_code,
@@ -181,3 +190,22 @@ function open_milestone_dialog(frm) {
 
   d.show();
 }
+
+// Lump-sum receipt, allocated oldest-due-first across this booking's open invoices
+function open_receipt_dialog(frm) {
+  frappe.prompt([
+    { fieldname: 'amount', fieldtype: 'Currency', label: __('Amount'), reqd: 1 },
+    { fieldname: 'mode_of_payment', fieldtype: 'Link', label: __('Mode of Payment'), options: 'Mode of Payment' },
+    { fieldname: 'reference_no', fieldtype: 'Data', label: __('Reference No') },
+    { fieldname: 'reference_date', fieldtype: 'Date', label: __('Reference Date'), default: frappe.datetime.get_today() }
+  ], (values) => {
+    frappe.call({
+      method: 'realapp.allocation.make_receipt',
+      args: Object.assign({ booking_order: frm.doc.name }, values),
+      freeze: true,
+      callback(r) {
+        if (r.message) frappe.set_route('Form', 'Payment Entry', r.message);
+      }
+    });
+  }, __('Receive Payment'), __('Create'));
+}
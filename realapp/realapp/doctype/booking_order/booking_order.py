@@ -3,24 +3,49 @@
 
 import frappe
 from frappe.model.document import Document
-from frappe.utils import flt
+from frappe.utils import cstr, flt
+
+from realapp.cache import invalidate_collections, invalidate_customers
+from realapp.instrumentation import instrument
+
+
+# Schedule fields mirrored from the Cost Sheet
+SCHEDULE_SYNC_FIELDS = (
+    "scheme_code",
+    "milestone",
+    "milestone_item",
+    "particulars",
+    "percentage",
+    "milestone_date",
+    "amount",
+    "gst_amount",
+    "tds_amount",
+    "net_payable",
+)
 
 
 class BookingOrder(Document):
+    @instrument()
     def validate(self):
         self._pull_cost_sheet_snapshot()
         self._compute_balance()
 
+    @instrument()
     def on_submit(self):
-        # Validate Unit Availability
-        unit = frappe.get_doc("Unit", self.unit)
-        if unit.status != "Available":
-            frappe.throw(f"Unit {self.unit} is not available (current status: {unit.status}).")
+        # Validate Unit Availability; lock the row so concurrent submits for the
+        # same unit queue here instead of both seeing "Available"
+        status = frappe.db.get_value("Unit", self.unit, "status", for_update=True)
+        if status != "Available":
+            frappe.throw(f"Unit {self.unit} is not available (current status: {status}).")
 
         # Mark as Booked
+        unit = frappe.get_doc("Unit", self.unit)
         unit.status = "Booked"
         unit.save(ignore_permissions=True)
+        invalidate_collections(self.project)
+        invalidate_customers(*get_booking_customers([self.name]))
 
+    @instrument()
     def on_cancel(self):
         # Revert Unit back to Available if booking cancelled
         if self.unit:
@@ -28,6 +53,8 @@ class BookingOrder(Document):
             if unit.status == "Booked":
                 unit.status = "Available"
                 unit.save(ignore_permissions=True)
+        invalidate_collections(self.project)
+        invalidate_customers(*get_booking_customers([self.name]))
 
     # ----------------- Helpers -----------------
 
@@ -51,21 +78,61 @@ class BookingOrder(Document):
         self.grand_total_payable = cs.grand_total_payable
         self.payment_scheme_template = cs.payment_scheme_template
 
-        # Clear & copy payment schedule
-        self.set("payment_schedule", [])
-        for row in cs.get("payment_schedule") or []:
-            self.append("payment_schedule", {
-                "scheme_code": row.scheme_code,
-                "milestone": row.milestone,
-                "milestone_item": row.milestone_item,
-                "particulars": row.particulars,
-                "percentage": row.percentage,
-                "milestone_date": row.milestone_date,
-                "amount": row.amount,
-                "gst_amount": row.gst_amount,
-                "tds_amount": row.tds_amount,
-                "net_payable": row.net_payable
-            })
+        self._sync_payment_schedule(cs.get("payment_schedule") or [])
+
+    def _sync_payment_schedule(self, source_rows):
+        """
+        Reconcile payment_schedule with the Cost Sheet rows by scheme_code.
+        Matching rows keep their name (and anything linked to it); only
+        real additions/removals insert or delete rows. Rows that differ from
+        what is stored are kept in flags so that update_child_table writes
+        just those on a draft save.
+        """
+        existing = {}
+        for d in self.get("payment_schedule") or []:
+            existing.setdefault(d.scheme_code, []).append(d)
+
+        rows = []
+        for src in source_rows:
+            values = {f: src.get(f) for f in SCHEDULE_SYNC_FIELDS}
+            matches = existing.get(src.scheme_code)
+            d = matches.pop(0) if matches else None
+
+            if d is None:
+                values["invoice_status"] = "Not Invoiced"
+                d = self.append("payment_schedule", values)
+            else:
+                for field, value in values.items():
+                    if _differs(d.get(field), value):
+                        d.set(field, value)
+            d.idx = len(rows) + 1
+            rows.append(d)
+
+        self.set("payment_schedule", rows)
+
+        # compared with the stored rows, not the incoming ones: the form may already carry the new values
+        before = self.get_doc_before_save()
+        stored = {d.name: d for d in (before.get("payment_schedule") if before else [])}
+        self.flags.schedule_changes = frappe._dict(
+            updated={d.name for d in rows if _row_changed(stored.get(d.name), d)}
+        )
+
+    def update_child_table(self, fieldname, df=None):
+        """Write only the schedule rows changed by _sync_payment_schedule on draft saves."""
+        changes = self.flags.schedule_changes
+        if fieldname != "payment_schedule" or not changes or self.is_new() or self._action != "save":
+            return super().update_child_table(fieldname, df)
+
+        # like Frappe's own sync: whatever is no longer on the document goes, however it left
+        names = [d.name for d in self.get("payment_schedule") if not d.is_new()]
+        filters = {"parent": self.name, "parenttype": self.doctype, "parentfield": fieldname}
+        if names:
+            filters["name"] = ("not in", names)
+        frappe.db.delete("Booking Order Payment Schedule", filters)
+
+        for d in self.get("payment_schedule"):
+            if d.is_new() or d.name in changes.updated:
+                d.db_update()
 
     def _compute_balance(self):
         """Compute balance payable = grand_total - advance"""
@@ -76,6 +143,19 @@ class BookingOrder(Document):
 
 # ---------------- Utilities ----------------
 
+def _row_changed(stored, row) -> bool:
+    if stored is None:
+        return True
+    return stored.idx != row.idx or any(_differs(stored.get(f), row.get(f)) for f in SCHEDULE_SYNC_FIELDS)
+
+
+def _differs(current, incoming) -> bool:
+    """Compare a stored child value with the Cost Sheet value, tolerating str/date/float forms."""
+    if isinstance(current, (int, float)) or isinstance(incoming, (int, float)):
+        return flt(current) != flt(incoming)
+    return cstr(current) != cstr(incoming)
+
+
 def get_item_defaults(item_code: str, company: str) -> dict:
     """Fetch defaults (uom, accounts, cost center) for given Item + Company."""
     if not item_code:
@@ -113,9 +193,36 @@ def get_item_defaults(item_code: str, company: str) -> dict:
     }
 
 
+@frappe.whitelist()
+@instrument()
+def get_pending_milestones(booking_order=None, due_on_or_before=None):
+    """
+    Schedule rows of submitted Booking Orders that are not invoiced yet.
+    Served by the (invoice_status, milestone_date) index on the child table.
+    """
+    filters = {
+        "parenttype": "Booking Order",
+        "docstatus": 1,
+        "invoice_status": "Not Invoiced",
+    }
+    if booking_order:
+        filters["parent"] = booking_order
+    if due_on_or_before:
+        filters["milestone_date"] = ["<=", due_on_or_before]
+
+    return frappe.get_all(
+        "Booking Order Payment Schedule",
+        filters=filters,
+        fields=["name", "parent as booking_order", "scheme_code", "milestone", "milestone_item",
+                "milestone_date", "amount", "net_payable"],
+        order_by="milestone_date asc, idx asc",
+    )
+
+
 # ---------------- Create Sales Invoice ----------------
 
 @frappe.whitelist()
+@instrument()
 def make_sales_invoice(source_name, target_doc=None, selected_rows=None):
     """
     Create Sales Invoice(s) from Booking Order milestones.
@@ -131,6 +238,10 @@ def make_sales_invoice(source_name, target_doc=None, selected_rows=None):
 
     chosen = [r for r in bo.payment_schedule if r.name in rows]
 
+    already = [r.scheme_code for r in chosen if r.invoice_status == "Invoiced"]
+    if already:
+        frappe.throw(f"Milestones already invoiced: {', '.join(already)}")
+
     if len(chosen) == 1:
         # single invoice → open form
         return _build_single_sales_invoice(bo, chosen[0])
@@ -175,6 +286,7 @@ def _build_single_sales_invoice(bo, row, save=False):
     # Add item
     si.append("items", {
         "item_code": row.milestone_item,
+        "milestone_code": row.scheme_code,
         "item_name": defaults.get("item_name"),
         "description": row.milestone or row.particulars,
         "qty": 1,
@@ -193,6 +305,27 @@ def _build_single_sales_invoice(bo, row, save=False):
     return si
 
 
+def get_booking_customers(booking_orders):
+    """
+    Customers whose statements show these bookings: the customer on their
+    invoices, and the party itself when it is a Customer (see statements.py).
+    """
+    if not booking_orders:
+        return set()
+    customers = set(frappe.get_all(
+        "Booking Order",
+        filters={"name": ("in", booking_orders), "party_type": "Customer"},
+        pluck="party",
+    ))
+    customers.update(frappe.get_all(
+        "Sales Invoice",
+        filters={"booking_order": ("in", booking_orders), "docstatus": (">", 0)},
+        pluck="customer",
+        distinct=True,
+    ))
+    return customers
+
+
 def ensure_customer_from_party(party_name, party_type):
     """
     Convert Lead/Opportunity into Customer if needed.
@@ -235,3 +368,14 @@ def ensure_customer_from_party(party_name, party_type):
 
     else:
         return frappe.get_doc("Customer", party_name)
+
+
+def on_doctype_update():
+    # velocity analytics range over booking dates within a project
+    frappe.db.add_index("Booking Order", ["project", "booking_date"])
+    # follow-up queues sort and filter on the collection rollups
+    frappe.db.add_index("Booking Order", ["project", "overdue_amount"])
+    frappe.db.add_index("Booking Order", ["outstanding_amount"])
+    frappe.db.add_index("Booking Order", ["last_payment_date"])
+    # archival keeps a quote while a live booking refers to it
+    frappe.db.add_index("Booking Order", ["cost_sheet", "docstatus"])
@@ -1,9 +1,174 @@
 # Copyright (c) 2025, surendhranath and Contributors
 # See license.txt
 
-# import frappe
-from frappe.tests.utils import FrappeTestCase
+import frappe
+from frappe.utils import add_days, flt, getdate, today
 
+from realapp.allocation import make_receipt
+from realapp.instrumentation import measure
+from realapp.realapp.doctype.booking_order.booking_order import get_booking_customers, make_sales_invoice
+from realapp.realapp.doctype.cost_sheet.cost_sheet import make_booking_order as map_booking_order
+from realapp.rollups import ROLLUP_FIELDS, rebuild_rollups
+from realapp.tests.utils import (
+	QUERY_BUDGETS,
+	RealappTestCase,
+	get_company,
+	make_booking_order,
+	make_cost_sheet,
+)
 
-class TestBookingOrder(FrappeTestCase):
-	pass
+
+class TestBookingOrder(RealappTestCase):
+	def _unit(self, i):
+		# cost sheet tests use the first units of the fixture
+		return self.fixture.units[-(i + 1)]
+
+	def test_make_booking_order_query_budget(self):
+		cs = make_cost_sheet(self._unit(0), self.fixture)
+
+		with self.assertQueryCount(QUERY_BUDGETS["make_booking_order"]):
+			bo = map_booking_order(cs.name)
+
+		bo.company = get_company()
+		bo.booking_date = frappe.utils.today()
+		with self.assertQueryCount(QUERY_BUDGETS["booking_order_insert"]):
+			bo.insert()
+
+		self.assertEqual(len(bo.payment_schedule), len(cs.payment_schedule))
+
+	def test_resave_keeps_schedule_rows(self):
+		bo = make_booking_order(make_cost_sheet(self._unit(1), self.fixture))
+		names = [d.name for d in bo.payment_schedule]
+
+		bo.reload()
+		bo.special_conditions = "Corner preference noted"
+		with self.assertQueryCount(QUERY_BUDGETS["booking_order_resave_unchanged"]):
+			bo.save()
+
+		bo.reload()
+		self.assertEqual([d.name for d in bo.payment_schedule], names)
+
+	def test_rows_dropped_on_the_form_leave_the_database(self):
+		cs = make_cost_sheet(self._unit(10), self.fixture)
+		bo = make_booking_order(cs)
+		old_names = {d.name for d in bo.payment_schedule}
+
+		# what an older form did on a unit / cost sheet change: clear the table and add every row again
+		bo.set("payment_schedule", [])
+		for d in cs.payment_schedule:
+			bo.append("payment_schedule", {"scheme_code": d.scheme_code, "amount": d.amount})
+		bo.save()
+
+		stored = frappe.get_all(
+			"Booking Order Payment Schedule",
+			filters={"parent": bo.name, "parenttype": "Booking Order"},
+			pluck="scheme_code",
+		)
+		self.assertEqual(sorted(stored), sorted(d.scheme_code for d in cs.payment_schedule))
+		self.assertFalse(old_names & {d.name for d in bo.payment_schedule})
+
+		# a row deleted in the grid is put back from the Cost Sheet, once
+		bo.payment_schedule.pop()
+		bo.save()
+		self.assertEqual(
+			frappe.db.count("Booking Order Payment Schedule", {"parent": bo.name, "parenttype": "Booking Order"}),
+			len(cs.payment_schedule),
+		)
+
+	def test_submit_and_cancel_query_budget(self):
+		bo = make_booking_order(make_cost_sheet(self._unit(2), self.fixture))
+
+		with self.assertQueryCount(QUERY_BUDGETS["booking_order_submit"]):
+			bo.submit()
+		self.assertEqual(frappe.db.get_value("Unit", bo.unit, "status"), "Booked")
+
+		with self.assertQueryCount(QUERY_BUDGETS["booking_order_cancel"]):
+			bo.cancel()
+		self.assertEqual(frappe.db.get_value("Unit", bo.unit, "status"), "Available")
+
+	def test_multi_milestone_invoicing_query_budget(self):
+		counts = []
+		for i, milestones in ((3, 2), (5, 3)):
+			bo = make_booking_order(make_cost_sheet(self._unit(i), self.fixture))
+			bo.submit()
+			rows = [d.name for d in bo.payment_schedule[:milestones]]
+			with measure() as sample:
+				make_sales_invoice(bo.name, selected_rows=frappe.as_json(rows))
+			counts.append(sample["queries"])
+
+		# every further milestone costs one invoice's worth of queries, nothing shared grows
+		self.assertLessEqual(counts[1] - counts[0], QUERY_BUDGETS["sales_invoice_per_milestone"])
+		self.assertLessEqual(counts[1], QUERY_BUDGETS["sales_invoice_per_milestone"] * 3)
+
+		codes = frappe.get_all(
+			"Sales Invoice Item",
+			filters={"parent": ("in", frappe.get_all("Sales Invoice", {"booking_order": bo.name}, pluck="name"))},
+			pluck="milestone_code",
+		)
+		self.assertEqual(sorted(codes), sorted(d.scheme_code for d in bo.payment_schedule[:3]))
+
+	def test_rebuild_corrects_drifted_rollups(self):
+		bo = make_booking_order(make_cost_sheet(self._unit(4), self.fixture))
+		bo.submit()
+		self.assertEqual(rebuild_rollups([bo.name], commit=False), [])
+
+		frappe.db.set_value("Booking Order", bo.name, {"outstanding_amount": 123, "overdue_amount": 45})
+		self.assertEqual(rebuild_rollups([bo.name], commit=False), [bo.name])
+		self.assertEqual(
+			frappe.db.get_value("Booking Order", bo.name, ["outstanding_amount", "overdue_amount"]),
+			(0, 0),
+		)
+
+	def test_rollups_follow_invoices_and_receipts(self):
+		bo = make_booking_order(make_cost_sheet(self._unit(6), self.fixture))
+		bo.submit()
+
+		# an invoice already past due: posted 20 days ago, due 10 days ago
+		si = make_sales_invoice(bo.name, selected_rows=frappe.as_json([bo.payment_schedule[0].name]))
+		si.set_posting_time = 1
+		si.posting_date = add_days(today(), -20)
+		si.due_date = add_days(today(), -10)
+		si.insert()
+		si.submit()
+		total = flt(si.rounded_total or si.grand_total, 2)
+		self._assert_rollups(bo.name, invoiced=total, collected=0, outstanding=total, overdue=total, last_payment_date=None)
+
+		pe = frappe.get_doc("Payment Entry", make_receipt(bo.name, 1000))
+		pe.submit()
+		self._assert_rollups(
+			bo.name,
+			invoiced=total,
+			collected=1000,
+			outstanding=total - 1000,
+			overdue=total - 1000,
+			last_payment_date=getdate(pe.posting_date),
+		)
+
+		pe.cancel()
+		self._assert_rollups(bo.name, invoiced=total, collected=0, outstanding=total, overdue=total, last_payment_date=None)
+
+		si.reload()
+		si.cancel()
+		self._assert_rollups(bo.name, invoiced=0, collected=0, outstanding=0, overdue=0, last_payment_date=None)
+
+	def test_booking_customers_come_from_its_invoices(self):
+		bo = make_booking_order(make_cost_sheet(self._unit(8), self.fixture))
+		bo.submit()
+		self.assertEqual(get_booking_customers([bo.name]), {self.fixture.customer})
+
+		si = make_sales_invoice(bo.name, selected_rows=frappe.as_json([bo.payment_schedule[0].name]))
+		si.insert()
+		si.submit()
+		# a Lead booking: its statement sits under the customer it was invoiced to, not the lead
+		frappe.db.set_value("Booking Order", bo.name, {"party_type": "Lead", "party": "CRM-LEAD-TEST"})
+		self.assertEqual(get_booking_customers([bo.name]), {si.customer})
+
+	def _assert_rollups(self, booking_order, invoiced, collected, outstanding, overdue, last_payment_date):
+		values = frappe.db.get_value("Booking Order", booking_order, ROLLUP_FIELDS, as_dict=True)
+		self.assertAlmostEqual(flt(values.invoiced_amount), invoiced, places=2)
+		self.assertAlmostEqual(flt(values.collected_amount), collected, places=2)
+		self.assertAlmostEqual(flt(values.outstanding_amount), outstanding, places=2)
+		self.assertAlmostEqual(flt(values.overdue_amount), overdue, places=2)
+		self.assertEqual(getdate(values.last_payment_date) if values.last_payment_date else None, last_payment_date)
+		# the incremental updates leave nothing for a rebuild to correct
+		self.assertEqual(rebuild_rollups([booking_order], commit=False), [])
@@ -1,9 +1,14 @@
 # Copyright (c) 2025, surendhranath and contributors
 # For license information, please see license.txt
 
-# import frappe
+import frappe
 from frappe.model.document import Document
 
 
 class BookingOrderPaymentSchedule(Document):
 	pass
+
+
+def on_doctype_update():
+	# "Due but not invoiced" lookups filter on status and sort/range on milestone date
+	frappe.db.add_index("Booking Order Payment Schedule", ["invoice_status", "milestone_date"])
@@ -0,0 +1,8 @@
+// Copyright (c) 2025, surendhranath and contributors
+// For license information, please see license.txt
+
+// frappe.ui.form.on("Collection Snapshot", {
+// 	refresh(frm) {
+
+// 	},
+// });
@@ -4,6 +4,7 @@
 frappe.ui.form.on('Cost Sheet', {
   setup(frm) {
     frm.set_query('payment_scheme_template', () => ({ filters: { is_active: 1 } }));
+    frm.set_query('unit', () => realapp.sellable_unit_query(frm));
   },
 
   refresh(frm) {
@@ -136,7 +137,7 @@ function recalc_header_from_base(frm) {
 
   frappe.call({
     method: 'realapp.realapp.doctype.cost_sheet.cost_sheet.compute_header_values',
-    args: { base_price_per_sft: base, salable_area: area, value_excluding_bp: ex_bp }
+    args: { base_price_per_sft: base, salable_area: area, value_excluding_bp: ex_bp, car_parking_amount: car_parking }
   }).then(r => {
     const v = (r && r.message) || {};
     frm.set_value({
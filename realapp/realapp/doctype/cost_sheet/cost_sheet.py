@@ -1,33 +1,115 @@
 # Copyright (c) 2025
 # For license information, please see license.txt
 
+import hashlib
+import json
+
 import frappe
 from frappe.model.document import Document
-from frappe.utils import flt
+from frappe.utils import cstr, flt
 from frappe.model.mapper import get_mapped_doc
 
+from realapp.instrumentation import instrument
+
+# Everything validate() derives; a save that edits any of them is recomputed
+COMPUTED_FIELDS = (
+    "project",
+    "block",
+    "floor_number",
+    "salable_area",
+    "value_excluding_bp",
+    "basic_price_per_sft",
+    "full_unit_value",
+    "aos_value",
+    "aos_gst",
+    "aos_value_gst",
+    "tds_amount",
+    "net_payable",
+    "effective_rate_per_sft",
+    "maintenance_charges",
+    "maintenance_gst",
+    "maintenance_amount",
+    "corpus_fund",
+    "refundable_caution_deposit",
+    "move_in_charges",
+    "move_in_gst",
+    "move_in_amount",
+    "registration_charges",
+    "before_registration_total",
+    "grand_total_payable",
+)
+COMPUTED_SCHEDULE_FIELDS = ("amount", "gst_amount", "tds_amount", "net_payable")
+
 
 class CostSheet(Document):
+    @instrument()
     def validate(self):
         """Main validation pipeline"""
+        if not self.unit:
+            frappe.throw("Please select a Unit before proceeding.")
+
+        unit_state = frappe.db.get_value("Unit", self.unit, ["modified", "status"], as_dict=True)
+        if not unit_state:
+            frappe.throw(f"Unit {self.unit} not found.")
+
+        self._settings = frappe.get_cached_doc("Realapp Settings")
+
+        # Nothing that feeds the computation changed (party, remarks, ...) and no computed
+        # value was edited by the client: skip the pipeline
+        if (
+            not self.is_new()
+            and self._get_inputs_fingerprint(unit_state) == self.inputs_fingerprint
+            and not self._computed_values_changed()
+        ):
+            self._check_unit_availability(unit_state.status)
+            return
+
         self._pull_unit_snapshot()
         self._apply_type_rules()
-        self._check_unit_availability()
+        self._check_unit_availability(self._unit_ctx.status)
         self._ensure_payment_schedule_rows()
         self._compute_header_values()
         self._compute_before_registration()
         self._compute_grand_total()
+        self.inputs_fingerprint = self._get_inputs_fingerprint(unit_state)
+
+    def _get_inputs_fingerprint(self, unit_state) -> str:
+        """Hash of every input the computation depends on (Unit & Settings by version)."""
+        inputs = [
+            self.unit,
+            cstr(unit_state.modified),
+            cstr(self._settings.modified),
+            self.cost_sheet_type,
+            flt(self.basic_price_per_sft) if self.cost_sheet_type != "Standard" else None,
+            self.payment_scheme_template,
+            [(d.scheme_code, flt(d.percentage)) for d in self.get("payment_schedule") or []],
+        ]
+        return hashlib.sha1(json.dumps(inputs, default=str).encode()).hexdigest()
+
+    def _computed_values_changed(self) -> bool:
+        """True if a derived field differs from the stored document (e.g. sent by a client)."""
+        before = self.get_doc_before_save()
+        if not before:
+            return True
+        if any(_differs(self.get(f), before.get(f)) for f in COMPUTED_FIELDS):
+            return True
+
+        rows = self.get("payment_schedule") or []
+        old_rows = before.get("payment_schedule") or []
+        if len(rows) != len(old_rows):
+            return True
+        return any(
+            _differs(d.get(f), old.get(f)) for d, old in zip(rows, old_rows) for f in COMPUTED_SCHEDULE_FIELDS
+        )
 
     # ------------------------------------------------------------------------
     # Core Sync from Unit
     # ------------------------------------------------------------------------
     def _pull_unit_snapshot(self):
         """Always pull latest computed and input values from Unit."""
-        if not self.unit:
-            frappe.throw("Please select a Unit before proceeding.")
-
-        u = frappe.get_doc("Unit", self.unit)
+        self._apply_unit_snapshot(frappe.get_doc("Unit", self.unit))
 
+    def _apply_unit_snapshot(self, u):
         # Sync identifiers
         self.project = u.project
         self.block = u.block
@@ -65,10 +147,10 @@ class CostSheet(Document):
             # Negotiated → user can input manually, fallback to Unit rate
             self.basic_price_per_sft = self.basic_price_per_sft or self._unit_ctx.base_rate
 
-    def _check_unit_availability(self):
+    def _check_unit_availability(self, status):
         """Ensure Unit is not already sold or booked."""
-        if self._unit_ctx.status in ("Booked", "Blocked", "Sold"):
-            frappe.throw(f"Unit {self.unit} is {self._unit_ctx.status} and cannot be sold.")
+        if status in ("Booked", "Blocked", "Sold"):
+            frappe.throw(f"Unit {self.unit} is {status} and cannot be sold.")
 
     def _ensure_payment_schedule_rows(self):
         """Auto-load Payment Scheme rows if template is selected but table is empty."""
@@ -105,7 +187,7 @@ class CostSheet(Document):
             self._spread_schedule_amounts(0)
             return
 
-        s = frappe.get_single("Realapp Settings")
+        s = self._settings
         gst_rate = flt(s.gst_rate or 5)
         tds_rate = flt(s.tds_rate or 1)
 
@@ -137,7 +219,7 @@ class CostSheet(Document):
 
     def _compute_before_registration(self):
         """Compute Maintenance, Move-in, Corpus, Refundable Deposits etc."""
-        s = frappe.get_single("Realapp Settings")
+        s = self._settings
         area = flt(self.salable_area)
 
         maint_rate = flt(s.maintenance_rate_per_sft)
@@ -181,22 +263,30 @@ class CostSheet(Document):
 # Whitelisted Utility Methods
 # ------------------------------------------------------------------------
 @frappe.whitelist()
+@instrument()
 def get_payment_scheme_rows(template: str, block: str = None):
     """Fetch Payment Scheme rows merged with milestone dates."""
     if not template:
         return []
 
     doc = frappe.get_doc("Payment Scheme Template", template)
+    milestone_dates = _milestone_dates(frappe.get_doc("Block", block)) if block else {}
+    return _scheme_rows(doc, milestone_dates)
+
 
-    milestone_dates = {}
-    if block:
-        blk = frappe.get_doc("Block", block)
-        for t in blk.get("tower_milestones") or []:
-            if t.scheme_code:
-                milestone_dates[t.scheme_code] = t.milestone_date
+def _differs(value, old):
+    if isinstance(value, (int, float)) or isinstance(old, (int, float)):
+        return abs(flt(value) - flt(old)) >= 0.005
+    return cstr(value) != cstr(old)
 
+
+def _milestone_dates(block_doc):
+    return {t.scheme_code: t.milestone_date for t in block_doc.get("tower_milestones") or [] if t.scheme_code}
+
+
+def _scheme_rows(template_doc, milestone_dates):
     out = []
-    for d in doc.get("payment_scheme_details") or []:
+    for d in template_doc.get("payment_scheme_details") or []:
         out.append({
             "scheme_code": d.scheme_code,
             "milestone": d.milestone,
@@ -209,21 +299,25 @@ def get_payment_scheme_rows(template: str, block: str = None):
 
 
 @frappe.whitelist()
-def compute_header_values(base_price_per_sft: float, salable_area: float, value_excluding_bp: float):
-    """Used for client recalculation."""
+@instrument()
+def compute_header_values(
+    base_price_per_sft: float, salable_area: float, value_excluding_bp: float, car_parking_amount: float = 0
+):
+    """Used for client recalculation; same formula as CostSheet._compute_header_values."""
     base = flt(base_price_per_sft)
     area = flt(salable_area)
     ex_bp = flt(value_excluding_bp)
+    car_park = flt(car_parking_amount)
 
     if area <= 0:
         return frappe._dict(full_unit_value=0, aos_value=0, aos_gst=0, aos_value_gst=0,
                             tds_amount=0, net_payable=0, effective_rate_per_sft=0)
 
-    s = frappe.get_single("Realapp Settings")
+    s = frappe.get_cached_doc("Realapp Settings")
     gst_rate = flt(s.gst_rate or 5)
     tds_rate = flt(s.tds_rate or 1)
 
-    aos = flt(base * area + ex_bp, 2)
+    aos = flt(base * area + ex_bp + car_park, 2)
     aos_gst = flt(aos * gst_rate / 100.0, 2)
     aos_with_gst = flt(aos + aos_gst, 2)
     tds = flt(aos * tds_rate / 100.0, 2)
@@ -241,9 +335,10 @@ def compute_header_values(base_price_per_sft: float, salable_area: float, value_
 
 
 @frappe.whitelist()
+@instrument()
 def compute_before_registration(salable_area: float):
     """Client-side recalculation of before-registration totals."""
-    s = frappe.get_single("Realapp Settings")
+    s = frappe.get_cached_doc("Realapp Settings")
     area = flt(salable_area)
 
     maint_rate = flt(s.maintenance_rate_per_sft)
@@ -276,7 +371,101 @@ def compute_before_registration(salable_area: float):
     )
 
 
+QUOTE_FIELDS = (
+    "basic_price_per_sft",
+    "aos_value",
+    "aos_gst",
+    "aos_value_gst",
+    "tds_amount",
+    "net_payable",
+    "effective_rate_per_sft",
+    "before_registration_total",
+    "grand_total_payable",
+)
+SCHEDULE_FIELDS = ("scheme_code", "milestone", "percentage", "milestone_date", "amount", "gst_amount", "tds_amount", "net_payable")
+MAX_QUOTE_SCENARIOS = 20
+
+
+@frappe.whitelist()
+@instrument()
+def get_quote_matrix(unit: str, scenarios=None):
+    """
+    Compare quotes for one unit without saving anything. `scenarios` is a
+    list of {payment_scheme_template, cost_sheet_type, basic_price_per_sft,
+    label}; by default, every scheme available in the unit's block at the
+    standard rate. Returns each scenario with its schedule, and `matrix`:
+    QUOTE_FIELDS mapped to one value per scenario.
+    """
+    frappe.has_permission("Cost Sheet", "read", throw=True)
+    if isinstance(scenarios, str):
+        scenarios = json.loads(scenarios)
+
+    # everything the computation reads is loaded once and shared by the scenarios
+    u = frappe.get_doc("Unit", unit)
+    settings = frappe.get_cached_doc("Realapp Settings")
+    block = frappe.get_doc("Block", u.block) if u.block else None
+    available = [r.payment_scheme_template for r in (block.get("available_payment_schemes") or [] if block else [])]
+
+    scenarios = scenarios or [{"payment_scheme_template": t, "cost_sheet_type": "Standard"} for t in available]
+    if len(scenarios) > MAX_QUOTE_SCENARIOS:
+        frappe.throw(f"At most {MAX_QUOTE_SCENARIOS} scenarios can be compared at once.")
+    for sc in scenarios:
+        template = sc.get("payment_scheme_template")
+        if template and available and template not in available:
+            frappe.throw(f"Payment Scheme {template} is not available in Block {u.block}.")
+
+    milestone_dates = _milestone_dates(block) if block else {}
+    scheme_rows = {
+        t: _scheme_rows(frappe.get_doc("Payment Scheme Template", t), milestone_dates)
+        for t in {sc.get("payment_scheme_template") for sc in scenarios}
+        if t
+    }
+
+    quotes = []
+    for i, sc in enumerate(scenarios):
+        cs = frappe.get_doc({
+            "doctype": "Cost Sheet",
+            "unit": u.name,
+            "cost_sheet_type": sc.get("cost_sheet_type") or "Standard",
+            "basic_price_per_sft": flt(sc.get("basic_price_per_sft")),
+            "payment_scheme_template": sc.get("payment_scheme_template"),
+            "payment_schedule": scheme_rows.get(sc.get("payment_scheme_template")) or [],
+        })
+        # the same pipeline as validate(), on an unsaved document
+        cs._settings = settings
+        cs._apply_unit_snapshot(u)
+        cs._apply_type_rules()
+        cs._check_unit_availability(u.status)
+        cs._compute_header_values()
+        cs._compute_before_registration()
+        cs._compute_grand_total()
+
+        quotes.append({
+            "label": sc.get("label") or _scenario_label(cs, i),
+            "payment_scheme_template": cs.payment_scheme_template,
+            "cost_sheet_type": cs.cost_sheet_type,
+            **{f: flt(cs.get(f), 2) for f in QUOTE_FIELDS},
+            "payment_schedule": [{f: d.get(f) for f in SCHEDULE_FIELDS} for d in cs.payment_schedule],
+        })
+
+    return {
+        "unit": u.name,
+        "salable_area": flt(u.salable_area),
+        "scenarios": quotes,
+        "matrix": {f: [q[f] for q in quotes] for f in QUOTE_FIELDS},
+    }
+
+
+def _scenario_label(cs, i):
+    if not cs.payment_scheme_template:
+        return f"Scenario {i + 1}"
+    if cs.cost_sheet_type == "Standard":
+        return cs.payment_scheme_template
+    return f"{cs.payment_scheme_template} @ {flt(cs.basic_price_per_sft, 2)}"
+
+
 @frappe.whitelist()
+@instrument()
 def make_booking_order(source_name, target_doc=None):
     """Create Booking Order from Cost Sheet."""
     def postprocess(source, target):
@@ -310,6 +499,7 @@ def make_booking_order(source_name, target_doc=None):
                 "gst_amount": d.gst_amount,
                 "tds_amount": d.tds_amount,
                 "net_payable": d.net_payable,
+                "invoice_status": "Not Invoiced",
             })
 
         frappe.db.set_value("Cost Sheet", source.name, "booking_order", target.name)
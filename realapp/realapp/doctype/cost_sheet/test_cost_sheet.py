@@ -1,9 +1,76 @@
 # Copyright (c) 2025, surendhranath and Contributors
 # See license.txt
 
-# import frappe
-from frappe.tests.utils import FrappeTestCase
+import frappe
+from frappe.utils import flt
 
+from realapp.tests.utils import QUERY_BUDGETS, RealappTestCase, make_cost_sheet
 
-class TestCostSheet(FrappeTestCase):
-	pass
+
+class TestCostSheet(RealappTestCase):
+	needs_company = False
+
+	def test_cost_sheet_insert_query_budget(self):
+		with self.assertQueryCount(QUERY_BUDGETS["cost_sheet_insert"]):
+			cs = make_cost_sheet(self.fixture.units[0], self.fixture)
+
+		unit = frappe.get_doc("Unit", cs.unit)
+		self.assertEqual(len(cs.payment_schedule), 4)
+		self.assertEqual(
+			flt(cs.aos_value),
+			flt(unit.basic_price_per_sft * unit.salable_area + unit.value_excluding_bp + unit.car_parking_amount, 2),
+		)
+		self.assertEqual(flt(sum(flt(d.amount) for d in cs.payment_schedule), 2), flt(cs.aos_value, 2))
+
+	def test_unchanged_resave_skips_recomputation(self):
+		cs = make_cost_sheet(self.fixture.units[1], self.fixture)
+		fingerprint = cs.inputs_fingerprint
+
+		cs.reload()
+		with self.assertQueryCount(QUERY_BUDGETS["cost_sheet_resave_unchanged"]):
+			cs.save()
+
+		self.assertEqual(cs.inputs_fingerprint, fingerprint)
+
+	def test_client_sent_computed_values_are_recomputed(self):
+		cs = make_cost_sheet(self.fixture.units[11], self.fixture)
+		aos_value, first_amount = flt(cs.aos_value), flt(cs.payment_schedule[0].amount)
+
+		cs.reload()
+		cs.aos_value = aos_value - 300000
+		cs.basic_price_per_sft = flt(cs.basic_price_per_sft) + 100
+		cs.payment_schedule[0].amount = first_amount - 1
+		cs.save()
+
+		self.assertEqual(flt(cs.aos_value), aos_value)
+		self.assertEqual(flt(cs.payment_schedule[0].amount), first_amount)
+
+	def test_negotiated_rate_change_recomputes(self):
+		cs = make_cost_sheet(self.fixture.units[2], self.fixture, cost_sheet_type="Negotiated")
+		cs.basic_price_per_sft = flt(cs.basic_price_per_sft) - 100
+		old_aos = flt(cs.aos_value)
+		cs.save()
+
+		self.assertEqual(flt(old_aos - cs.aos_value, 2), flt(100 * cs.salable_area, 2))
+
+	def test_quote_matrix_matches_saved_cost_sheet(self):
+		from realapp.realapp.doctype.cost_sheet.cost_sheet import get_quote_matrix
+
+		unit = self.fixture.units[3]
+		base = flt(frappe.db.get_value("Unit", unit, "basic_price_per_sft"))
+		count = frappe.db.count("Cost Sheet")
+		with self.assertQueryCount(QUERY_BUDGETS["quote_matrix"]):
+			quote = get_quote_matrix(unit, [
+				{"payment_scheme_template": self.fixture.template},
+				{"payment_scheme_template": self.fixture.template, "cost_sheet_type": "Negotiated", "basic_price_per_sft": base - 100},
+			])
+
+		self.assertEqual(frappe.db.count("Cost Sheet"), count)
+		cs = make_cost_sheet(unit, self.fixture)
+		standard = quote["scenarios"][0]
+		self.assertEqual(standard["grand_total_payable"], flt(cs.grand_total_payable, 2))
+		self.assertEqual([d["amount"] for d in standard["payment_schedule"]], [d.amount for d in cs.payment_schedule])
+		self.assertEqual(
+			flt(quote["matrix"]["aos_value"][0] - quote["matrix"]["aos_value"][1], 2),
+			flt(100 * cs.salable_area, 2),
+		)
@@ -0,0 +1,14 @@
+# Copyright (c) 2025, surendhranath and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class DemandLetter(Document):
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_index("Demand Letter", ["booking_order", "scheme_code"])
+	frappe.db.add_index("Demand Letter", ["status", "email_queue"])
@@ -0,0 +1,34 @@
+// Copyright (c) 2025, surendhranath and contributors
+// For license information, please see license.txt
+
+frappe.ui.form.on('Demand Letter Run', {
+    block(frm) {
+        frm.set_value('scheme_code', '');
+    },
+
+    refresh(frm) {
+        if (!frm.is_new() && !['Queued', 'Running'].includes(frm.doc.status)) {
+            const label = frm.doc.status === 'Draft' ? __('Send Demand Letters') : __('Send Remaining');
+            frm.add_custom_button(label, () => {
+                frm.call('start').then(() => frm.reload_doc());
+            }).addClass('btn-primary');
+        }
+
+        if (!frm.is_new()) {
+            frm.add_custom_button(__('Demand Letters'), () => {
+                frappe.set_route('List', 'Demand Letter', { run: frm.doc.name });
+            }, __('View'));
+        }
+    }
+});
+
+frappe.realtime.on('realapp_demand_letter_progress', (data) => {
+    const frm = cur_frm;
+    if (frm && frm.doctype === 'Demand Letter Run' && frm.doc.name === data.run) {
+        frappe.show_progress(__('Queueing demand letters'), data.progress, data.total, `${data.progress} / ${data.total}`);
+        if (data.progress >= data.total) {
+            frappe.hide_progress();
+            frm.reload_doc();
+        }
+    }
+});
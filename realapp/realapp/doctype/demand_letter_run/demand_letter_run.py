@@ -0,0 +1,25 @@
+# Copyright (c) 2025, surendhranath and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class DemandLetterRun(Document):
+	@frappe.whitelist()
+	def start(self):
+		"""Queue the run; bookings whose letter is already queued or sent are skipped."""
+		self.check_permission("write")
+		if self.status in ("Queued", "Running"):
+			frappe.throw(f"Demand Letter Run {self.name} is already {self.status}.")
+
+		self.db_set("status", "Queued")
+		frappe.enqueue(
+			"realapp.demand_letters.run_demand_letters",
+			queue="long",
+			timeout=6 * 3600,
+			job_id=f"realapp-demand-letter-run:{self.name}",
+			deduplicate=True,
+			enqueue_after_commit=True,
+			run=self.name,
+		)
@@ -0,0 +1,46 @@
+# Copyright (c) 2025, surendhranath and Contributors
+# See license.txt
+
+import frappe
+
+from realapp.demand_letters import get_pending_letters
+from realapp.tests.utils import RealappTestCase, make_booking_order, make_cost_sheet
+
+
+class TestDemandLetterRun(RealappTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		cls.booking = make_booking_order(make_cost_sheet(cls.fixture.units[9], cls.fixture))
+		cls.booking.submit()
+		cls.row = cls.booking.payment_schedule[0]
+
+	def tearDown(self):
+		frappe.db.delete("Demand Letter", {"booking_order": self.booking.name})
+
+	def _pending(self):
+		letters = get_pending_letters(self.booking.block, self.row.scheme_code)
+		return [l for l in letters if l.booking_order == self.booking.name]
+
+	def _letter(self, status):
+		return frappe.get_doc({
+			"doctype": "Demand Letter",
+			"booking_order": self.booking.name,
+			"block": self.booking.block,
+			"scheme_code": self.row.scheme_code,
+			"status": status,
+		}).insert(ignore_permissions=True)
+
+	def test_letter_carries_schedule_amounts(self):
+		(letter,) = self._pending()
+		self.assertEqual(letter.net_payable, self.row.net_payable)
+		self.assertEqual(letter.due_date, self.row.milestone_date)
+
+	def test_sent_letters_are_skipped(self):
+		self._letter("Sent")
+		self.assertEqual(self._pending(), [])
+
+	def test_failed_letters_are_retried(self):
+		failed = self._letter("Failed")
+		(letter,) = self._pending()
+		self.assertEqual(letter.previous_letter, failed.name)
@@ -0,0 +1,15 @@
+# Copyright (c) 2025, surendhranath and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class InterestAccrual(Document):
+	pass
+
+
+def on_doctype_update():
+	# one row per invoice per day; history lookups go by invoice, billing runs by date
+	frappe.db.add_index("Interest Accrual", ["sales_invoice", "accrual_date"])
+	frappe.db.add_index("Interest Accrual", ["accrual_date", "debit_note"])
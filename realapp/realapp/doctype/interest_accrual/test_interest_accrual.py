@@ -0,0 +1,64 @@
+# Copyright (c) 2025, surendhranath and Contributors
+# See license.txt
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from realapp.interest import _create_debit_notes, accrue_interest
+from realapp.utils import bulk_insert_rows
+
+DAILY = 0.365 / 365  # 36.5% p.a. -> 0.1% per day
+
+
+class TestInterestAccrual(FrappeTestCase):
+	def test_unpaid_balance_accrues_per_day(self):
+		self.assertAlmostEqual(accrue_interest(100000, "2026-01-01", "2026-01-31", [], DAILY), 3000)
+
+	def test_partial_payment_reduces_balance_from_its_date(self):
+		# 100k for 10 days, then 40k for 20 days
+		interest = accrue_interest(100000, "2026-01-01", "2026-01-31", [("2026-01-11", 60000)], DAILY)
+		self.assertAlmostEqual(interest, 1000 + 800)
+
+	def test_payment_before_interest_start_only_reduces_principal(self):
+		interest = accrue_interest(100000, "2026-01-10", "2026-01-20", [("2026-01-05", 50000)], DAILY)
+		self.assertAlmostEqual(interest, 500)
+
+	def test_fully_paid_stops_accruing(self):
+		interest = accrue_interest(100000, "2026-01-01", "2026-03-01", [("2026-01-06", 100000)], DAILY)
+		self.assertAlmostEqual(interest, 500)
+
+
+class TestInterestDebitNotes(FrappeTestCase):
+	def _accrue(self, invoice, accrual_date, interest, billed=0, debit_note=None):
+		bulk_insert_rows(
+			"Interest Accrual",
+			("accrual_date", "sales_invoice", "interest_amount", "billed_interest", "debit_note"),
+			[{
+				"accrual_date": accrual_date,
+				"sales_invoice": f"_Test Realapp {invoice}",
+				"interest_amount": interest,
+				"billed_interest": billed,
+				"debit_note": debit_note,
+			}],
+		)
+
+	def test_latest_unbilled_accrual_per_invoice_is_billed(self):
+		# still overdue on the run date
+		self._accrue("SINV-OPEN", "2026-02-27", 100)
+		self._accrue("SINV-OPEN", "2026-02-28", 150)
+		# paid off between runs: no row on the run date
+		self._accrue("SINV-PAID", "2026-02-10", 80)
+		# billed last month, accrued further since
+		self._accrue("SINV-BILLED", "2026-01-31", 50, billed=50, debit_note="DN-1")
+		self._accrue("SINV-BILLED", "2026-02-28", 70, billed=50)
+		# latest row already billed: the older unbilled row must not be billed again
+		self._accrue("SINV-DONE", "2026-02-20", 40)
+		self._accrue("SINV-DONE", "2026-02-21", 60, billed=60, debit_note="DN-2")
+
+		with patch("realapp.interest._make_debit_note", side_effect=lambda row, *_: f"DN-{row.sales_invoice}") as make:
+			_create_debit_notes("Interest", "2026-02-28")
+
+		billed = {c.args[0].sales_invoice.rsplit(" ", 1)[-1]: c.args[0].amount for c in make.call_args_list}
+		self.assertEqual(billed, {"SINV-BILLED": 20, "SINV-OPEN": 150, "SINV-PAID": 80})
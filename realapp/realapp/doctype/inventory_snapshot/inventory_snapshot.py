@@ -0,0 +1,15 @@
+# Copyright (c) 2025, surendhranath and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class InventorySnapshot(Document):
+	pass
+
+
+def on_doctype_update():
+	# trend queries read one block (or project) over a date range
+	frappe.db.add_index("Inventory Snapshot", ["block", "snapshot_date"])
+	frappe.db.add_index("Inventory Snapshot", ["project", "snapshot_date"])
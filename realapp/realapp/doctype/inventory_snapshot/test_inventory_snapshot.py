@@ -0,0 +1,32 @@
+# Copyright (c) 2025, surendhranath and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import today
+
+from realapp.tasks import take_daily_snapshots
+from realapp.tests.utils import PREFIX, make_block_with_units
+
+
+class TestInventorySnapshot(FrappeTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		cls.units = make_block_with_units(f"{PREFIX} Snapshot Block")
+		cls.block = frappe.db.get_value("Unit", cls.units[0], "block")
+
+	def test_snapshot_counts_every_unit_once(self):
+		take_daily_snapshots()
+		take_daily_snapshots()  # re-run replaces the day's rows
+
+		counted = frappe.get_all(
+			"Inventory Snapshot",
+			filters={"snapshot_date": today(), "block": self.block},
+			fields=["sum(unit_count) as units"],
+		)[0].units
+		self.assertEqual(counted, len(self.units))
+		self.assertEqual(
+			sum(r.unit_count for r in frappe.get_all("Inventory Snapshot", {"snapshot_date": today()}, ["unit_count"])),
+			frappe.db.count("Unit"),
+		)
@@ -0,0 +1,15 @@
+// Copyright (c) 2025, surendhranath and contributors
+// For license information, please see license.txt
+
+frappe.ui.form.on('Realapp Archive', {
+    refresh(frm) {
+        if (frm.is_new()) return;
+        frm.add_custom_button(__('Restore'), () => {
+            frappe.confirm(__('Restore {0} {1}?', [frm.doc.reference_doctype, frm.doc.reference_name]), () => {
+                frm.call('restore').then((r) => {
+                    frappe.set_route('Form', r.message.doctype, r.message.name);
+                });
+            });
+        }).addClass('btn-primary');
+    },
+});
@@ -0,0 +1,19 @@
+# Copyright (c) 2025, surendhranath and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+from realapp.archive import restore_archived
+
+
+class RealappArchive(Document):
+	@frappe.whitelist()
+	def restore(self):
+		"""Write the archived document and its child rows back, then drop this entry."""
+		return restore_archived(self.name)
+
+
+def on_doctype_update():
+	frappe.db.add_index("Realapp Archive", ["reference_doctype", "reference_name"])
+	frappe.db.add_index("Realapp Archive", ["reference_doctype", "creation"])
@@ -0,0 +1,80 @@
+# Copyright (c) 2025, surendhranath and Contributors
+# See license.txt
+
+from unittest.mock import patch
+
+import frappe
+from frappe.utils import add_days, flt, now_datetime
+
+from realapp.archive import (
+	MAX_CHUNKS_PER_POLICY,
+	archive_documents,
+	archive_stale_documents,
+	get_archivable,
+	restore_archived,
+)
+from realapp.tests.utils import RealappTestCase, make_booking_order, make_cost_sheet
+
+
+class TestRealappArchive(RealappTestCase):
+	needs_company = False
+
+	def test_stale_draft_round_trip(self):
+		cs = make_cost_sheet(self.fixture.units[0], self.fixture)
+		frappe.db.set_value("Cost Sheet", cs.name, "modified", add_days(now_datetime(), -400), update_modified=False)
+		self.assertIn(cs.name, get_archivable("Cost Sheet", add_days(now_datetime(), -180), 1000))
+
+		archive_documents("Cost Sheet", [cs.name], "Stale Draft")
+		self.assertFalse(frappe.db.exists("Cost Sheet", cs.name))
+		self.assertFalse(frappe.db.count("Cost Sheet Payment Schedule", {"parent": cs.name}))
+		archive = frappe.db.get_value("Realapp Archive", {"reference_doctype": "Cost Sheet", "reference_name": cs.name})
+
+		restore_archived(archive)
+		restored = frappe.get_doc("Cost Sheet", cs.name)
+		self.assertEqual(flt(restored.grand_total_payable), flt(cs.grand_total_payable))
+		self.assertEqual([d.amount for d in restored.payment_schedule], [d.amount for d in cs.payment_schedule])
+		self.assertFalse(frappe.db.exists("Realapp Archive", archive))
+		self.assertNotIn(cs.name, get_archivable("Cost Sheet", add_days(now_datetime(), -180), 1000))
+
+	def test_each_policy_has_its_own_chunk_budget(self):
+		settings = frappe._dict(
+			enable_archival=1, archive_drafts_after_days=1, archive_cancelled_after_days=1, archive_batch_size=2
+		)
+		# an endless draft backlog must not hold up the cancelled bookings
+		with patch("frappe.get_cached_doc", return_value=settings), patch(
+			"realapp.archive.get_archivable", return_value=["A", "B"]
+		), patch("realapp.archive.archive_documents") as archive:
+			archived = archive_stale_documents(commit=False)
+
+		self.assertEqual(archived, {"Cost Sheet": 2 * MAX_CHUNKS_PER_POLICY, "Booking Order": 2 * MAX_CHUNKS_PER_POLICY})
+		self.assertEqual(archive.call_count, 2 * MAX_CHUNKS_PER_POLICY)
+
+
+class TestArchiveCancelledBooking(RealappTestCase):
+	def test_cancelled_booking_round_trip(self):
+		cs = make_cost_sheet(self.fixture.units[14], self.fixture)
+		bo = make_booking_order(cs)
+		bo.submit()
+		bo.cancel()
+		bo.add_comment("Comment", "buyer withdrew")
+		cutoff = add_days(now_datetime(), -180)
+		for doctype, name in (("Cost Sheet", cs.name), ("Booking Order", bo.name)):
+			frappe.db.set_value(doctype, name, "modified", add_days(now_datetime(), -400), update_modified=False)
+
+		# the cancelled booking still links the quote; it could be amended
+		self.assertNotIn(cs.name, get_archivable("Cost Sheet", cutoff, 1000))
+		self.assertIn(bo.name, get_archivable("Booking Order", cutoff, 1000))
+
+		archive_documents("Booking Order", [bo.name], "Cancelled")
+		self.assertIsNone(frappe.db.get_value("Cost Sheet", cs.name, "booking_order"))
+		self.assertFalse(frappe.db.count("Comment", {"reference_doctype": "Booking Order", "reference_name": bo.name}))
+		# nothing left pointing at the archived booking: the quote saves and can go next
+		frappe.get_doc("Cost Sheet", cs.name).save()
+		self.assertIn(cs.name, get_archivable("Cost Sheet", add_days(now_datetime(), 1), 1000))
+
+		restore_archived(frappe.db.get_value("Realapp Archive", {"reference_name": bo.name}))
+		self.assertEqual(frappe.db.get_value("Cost Sheet", cs.name, "booking_order"), bo.name)
+		self.assertEqual(frappe.get_doc("Booking Order", bo.name).docstatus, 2)
+		self.assertTrue(
+			frappe.db.exists("Comment", {"reference_doctype": "Booking Order", "reference_name": bo.name, "content": "buyer withdrew"})
+		)
@@ -9,6 +9,42 @@
 frappe.ui.form.on('Realapp Settings', {
     refresh: function(frm) {
         frm.set_intro('These settings act as default values for Unit pricing and charges. Unit overrides take priority.');
+
+        if (frm.doc.enable_performance_tracking) {
+            frm.add_custom_button(__('Performance Stats'), () => show_performance_stats(), __('Actions'));
+        }
     }
 });
 
+function show_performance_stats() {
+    frappe.call({
+        method: 'realapp.instrumentation.get_performance_stats',
+        callback(r) {
+            const stats = r.message || {};
+            const fmt = v => frappe.format(v, { fieldtype: 'Float', precision: 1 });
+            const rows = Object.keys(stats).map(name => {
+                const s = stats[name];
+                return `<tr>
+                    <td>${frappe.utils.escape_html(name)}</td>
+                    <td class="text-right">${s.count}</td>
+                    <td class="text-right">${fmt(s.wall_ms.p50)} / ${fmt(s.wall_ms.p90)} / ${fmt(s.wall_ms.p99)}</td>
+                    <td class="text-right">${fmt(s.queries.p50)} / ${fmt(s.queries.p99)}</td>
+                    <td class="text-right">${fmt(s.query_ms.p50)} / ${fmt(s.query_ms.p99)}</td>
+                    <td class="text-right">${fmt(s.cache_hits.p50)}</td>
+                </tr>`;
+            }).join('');
+
+            frappe.msgprint({
+                title: __('Performance Stats (rolling window)'),
+                wide: true,
+                message: rows ? `<table class="table table-bordered table-sm">
+                    <thead><tr>
+                        <th>${__('Call')}</th><th>${__('Samples')}</th>
+                        <th>${__('Wall ms p50/p90/p99')}</th><th>${__('Queries p50/p99')}</th>
+                        <th>${__('Query ms p50/p99')}</th><th>${__('Cache hits p50')}</th>
+                    </tr></thead><tbody>${rows}</tbody></table>` : __('No samples recorded yet.')
+            });
+        }
+    });
+}
+
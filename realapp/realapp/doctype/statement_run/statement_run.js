@@ -0,0 +1,30 @@
+// Copyright (c) 2025, surendhranath and contributors
+// For license information, please see license.txt
+
+frappe.ui.form.on('Statement Run', {
+    refresh(frm) {
+        if (frm.is_new() || ['Queued', 'Running'].includes(frm.doc.status)) return;
+
+        const label = frm.doc.status === 'Failed' && frm.doc.completed_customers ? __('Resume') : __('Generate Statements');
+        frm.add_custom_button(label, () => {
+            frm.call('start').then(() => frm.reload_doc());
+        }).addClass('btn-primary');
+
+        if (frm.doc.status === 'Failed' && frm.doc.completed_customers) {
+            frm.add_custom_button(__('Restart From Scratch'), () => {
+                frm.call('start', { restart: 1 }).then(() => frm.reload_doc());
+            });
+        }
+    }
+});
+
+frappe.realtime.on('realapp_statement_progress', (data) => {
+    const frm = cur_frm;
+    if (frm && frm.doctype === 'Statement Run' && frm.doc.name === data.run) {
+        frappe.show_progress(__('Generating statements'), data.progress, data.total, `${data.progress} / ${data.total}`);
+        if (data.progress >= data.total) {
+            frappe.hide_progress();
+            frm.reload_doc();
+        }
+    }
+});
@@ -0,0 +1,36 @@
+# Copyright (c) 2025, surendhranath and contributors
+# For license information, please see license.txt
+
+import os
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import cint
+
+from realapp.statements import get_zip_path
+
+
+class StatementRun(Document):
+	@frappe.whitelist()
+	def start(self, restart=0):
+		"""Queue the run; resumes after the last completed customer unless restarted."""
+		self.check_permission("write")
+		if self.status in ("Queued", "Running"):
+			frappe.throw(f"Statement Run {self.name} is already {self.status}.")
+
+		if cint(restart) or self.status == "Completed":
+			zip_path = get_zip_path(self.name)
+			if os.path.exists(zip_path):
+				os.remove(zip_path)
+			self.db_set({"completed_customers": 0, "last_completed_customer": None, "output_file": None})
+
+		self.db_set("status", "Queued")
+		frappe.enqueue(
+			"realapp.statements.run_statements",
+			queue="long",
+			timeout=6 * 3600,
+			job_id=f"realapp-statement-run:{self.name}",
+			deduplicate=True,
+			enqueue_after_commit=True,
+			run=self.name,
+		)
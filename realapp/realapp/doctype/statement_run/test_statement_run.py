@@ -0,0 +1,26 @@
+# Copyright (c) 2025, surendhranath and Contributors
+# See license.txt
+
+import frappe
+
+from realapp.statements import get_statement_data
+from realapp.tests.utils import RealappTestCase, make_booking_order, make_cost_sheet
+
+
+class TestStatementRun(RealappTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		cls.booking = make_booking_order(make_cost_sheet(cls.fixture.units[8], cls.fixture))
+		cls.booking.submit()
+
+	def test_statement_lists_booking_schedule(self):
+		statement = get_statement_data([self.fixture.customer])[self.fixture.customer]
+		booking = next(bo for bo in statement["bookings"] if bo.name == self.booking.name)
+		self.assertEqual(len(booking.schedule), len(self.booking.payment_schedule))
+		self.assertGreater(statement["totals"]["scheduled"], 0)
+
+	def test_query_count_does_not_depend_on_customers(self):
+		customers = [self.fixture.customer, *frappe.get_all("Customer", pluck="name", limit=20)]
+		with self.assertQueryCount(5):
+			get_statement_data(list(dict.fromkeys(customers)))
@@ -1,9 +1,57 @@
 # Copyright (c) 2025, surendhranath and Contributors
 # See license.txt
 
-# import frappe
+import frappe
 from frappe.tests.utils import FrappeTestCase
+from frappe.utils import flt
+
+from realapp.realapp.doctype.unit.unit import sellable_unit_query
+from realapp.tests.utils import PREFIX, QUERY_BUDGETS, make_block_with_units
 
 
 class TestUnit(FrappeTestCase):
-	pass
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		cls.units = make_block_with_units(f"{PREFIX} Unit Block")
+
+	def test_hierarchy_from_floor(self):
+		unit = frappe.get_doc("Unit", self.units[0])
+		self.assertEqual(unit.block, f"{PREFIX} Unit Block")
+		self.assertEqual(unit.floor_number, 1)
+
+	def test_unit_save_query_budget(self):
+		unit = frappe.get_doc("Unit", self.units[1])
+		unit.basic_price_per_sft = 7000
+
+		with self.assertQueryCount(QUERY_BUDGETS["unit_save"]):
+			unit.save()
+
+		self.assertEqual(flt(unit.unit_base_amount), flt(unit.salable_area * 7000, 2))
+
+	def _search(self, txt):
+		return [r[0] for r in sellable_unit_query("Unit", txt, "name", 0, 50, {})]
+
+	def test_search_hides_unsellable_units(self):
+		unit = frappe.get_doc("Unit", self.units[2])
+		self.assertIn(unit.name, self._search(unit.name))
+
+		unit.status = "Booked"
+		unit.save()
+		self.assertNotIn(unit.name, self._search(unit.name))
+
+	def test_search_ranks_exact_name_first(self):
+		self.assertEqual(self._search(self.units[3].lower())[0], self.units[3])
+		# a block prefix matches every sellable unit of the block
+		self.assertTrue(set(self.units[3:]) <= set(self._search(f"{PREFIX} Unit Block")))
+
+	def test_search_includes_blank_status_and_pages_in_sql(self):
+		frappe.db.set_value("Unit", self.units[4], "status", None)
+		self.assertIn(self.units[4], self._search(self.units[4]))
+
+		first, second = (
+			[r[0] for r in sellable_unit_query("Unit", f"{PREFIX} Unit Block", "name", start, 2, {})]
+			for start in (0, 2)
+		)
+		self.assertEqual(len(first), 2)
+		self.assertFalse(set(first) & set(second))
@@ -3,11 +3,16 @@
 
 import frappe
 from frappe.model.document import Document
-from frappe.utils import flt
+from frappe.utils import cint, flt
 from frappe.model.mapper import get_mapped_doc
 
+from realapp.cache import invalidate_inventory
+from realapp.instrumentation import instrument
+from realapp.live_inventory import publish_unit_change
+
 
 class Unit(Document):
+    @instrument()
     def validate(self):
         # Ensure hierarchy & defaults before calculations
         self.set_hierarchy()
@@ -18,6 +23,14 @@ class Unit(Document):
         if not self.status:
             self.status = "Available"
 
+    def on_update(self):
+        invalidate_inventory(self.project)
+        publish_unit_change(self)
+
+    def on_trash(self):
+        invalidate_inventory(self.project)
+        publish_unit_change(self, deleted=True)
+
     # ------------------------------
     # Hierarchy / Defaults
     # ------------------------------
@@ -156,6 +169,7 @@ class Unit(Document):
 # Whitelisted: Create Cost Sheet from Unit
 # ------------------------------
 @frappe.whitelist()
+@instrument()
 def make_cost_sheet(source_name, target_doc=None):
     """Map Unit → Cost Sheet (used by Create button)."""
 
@@ -191,3 +205,60 @@ def make_cost_sheet(source_name, target_doc=None):
         target_doc,
         postprocess,
     )
+
+
+# ------------------------------
+# Link search: sellable units only
+# ------------------------------
+SELLABLE_STATUSES = ("Available", "")
+
+
+@frappe.whitelist()
+@frappe.validate_and_sanitize_search_inputs
+@instrument()
+def sellable_unit_query(doctype, txt, searchfield, start, page_len, filters):
+    """
+    Unit link search for Cost Sheet / Booking Order: sellable units only,
+    prefix-matched on unit name, block and flat type and ranked exact name >
+    name prefix > block > flat type. One indexed query per page, so it does
+    not depend on how many units the site has.
+    """
+    project = (filters or {}).get("project")
+    txt = (txt or "").strip()
+
+    return frappe.db.sql(
+        f"""
+        SELECT name, block, flat_type, floor_number
+        FROM `tabUnit`
+        WHERE (status IN %(statuses)s OR status IS NULL)
+          {"AND project = %(project)s" if project else ""}
+          AND (name LIKE %(prefix)s OR block LIKE %(prefix)s OR flat_type LIKE %(prefix)s)
+        ORDER BY
+          CASE
+            WHEN name = %(txt)s THEN 0
+            WHEN name LIKE %(prefix)s THEN 1
+            WHEN block LIKE %(prefix)s THEN 2
+            ELSE 3
+          END,
+          name
+        LIMIT %(page_len)s OFFSET %(start)s
+        """,
+        {
+            "statuses": SELLABLE_STATUSES,
+            "project": project,
+            "txt": txt,
+            "prefix": f"{_escape_like(txt)}%",
+            "page_len": cint(page_len),
+            "start": cint(start),
+        },
+    )
+
+
+def _escape_like(txt):
+    return txt.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def on_doctype_update():
+    # sellable-unit lookups read by status within a project (or across projects)
+    frappe.db.add_index("Unit", ["project", "status"])
+    frappe.db.add_index("Unit", ["status", "name"])
@@ -0,0 +1,38 @@
+// Copyright (c) 2025, surendhranath and contributors
+// For license information, please see license.txt
+
+frappe.query_reports["Cash Flow Projection"] = {
+  "filters": [
+    {
+      "fieldname": "company",
+      "label": __("Company"),
+      "fieldtype": "Link",
+      "options": "Company"
+    },
+    {
+      "fieldname": "project",
+      "label": __("Project"),
+      "fieldtype": "Link",
+      "options": "Project"
+    },
+    {
+      "fieldname": "block",
+      "label": __("Block"),
+      "fieldtype": "Link",
+      "options": "Block"
+    },
+    {
+      "fieldname": "group_by",
+      "label": __("Group By"),
+      "fieldtype": "Select",
+      "options": "Project\nBlock\nScheme Code",
+      "default": "Block"
+    },
+    {
+      "fieldname": "months",
+      "label": __("Months"),
+      "fieldtype": "Int",
+      "default": 24
+    }
+  ]
+};
@@ -0,0 +1,164 @@
+# Copyright (c) 2025, surendhranath
+# For license information, please see license.txt
+
+import frappe
+from frappe.utils import add_months, cint, flt, get_first_day, getdate, today
+
+from realapp.cache import collection_scopes, get_cached
+from realapp.instrumentation import instrument
+
+DEFAULT_MONTHS = 24
+OVERDUE = "overdue"
+GROUP_FIELDS = {
+    "Project": ("project",),
+    "Block": ("project", "block"),
+    "Scheme Code": ("project", "block", "scheme_code"),
+}
+
+
+@instrument()
+def execute(filters=None):
+    filters = frappe._dict(filters or {})
+    projection = get_projection(filters)
+
+    columns = get_columns(projection)
+    data = projection["rows"]
+    chart = get_chart(projection)
+    summary = get_summary(projection)
+
+    return columns, data, None, chart, summary
+
+
+@frappe.whitelist()
+@instrument()
+def get_cash_flow_projection(project=None, block=None, company=None, months=DEFAULT_MONTHS, group_by="Block"):
+    """Expected collections per month for submitted bookings, net of what is already collected."""
+    frappe.has_permission("Booking Order", "read", throw=True)
+    return get_projection(
+        frappe._dict(project=project, block=block, company=company, months=months, group_by=group_by)
+    )
+
+
+def get_projection(filters):
+    """Cached projection; rebuilt only after a booking, invoice or payment in scope changes."""
+    params = {
+        "company": filters.get("company"),
+        "project": filters.get("project"),
+        "block": filters.get("block"),
+        "months": min(max(cint(filters.get("months")) or DEFAULT_MONTHS, 1), 60),
+        "group_by": filters.get("group_by") if filters.get("group_by") in GROUP_FIELDS else "Block",
+        "start": str(get_first_day(today())),
+    }
+    return get_cached(
+        "cash_flow_projection",
+        collection_scopes(params["project"]),
+        params,
+        lambda: build_projection(frappe._dict(params)),
+    )
+
+
+def build_projection(params):
+    start = getdate(params.start)
+    periods = [add_months(start, i).strftime("%Y-%m") for i in range(params.months)]
+    keys = GROUP_FIELDS[params.group_by]
+
+    rows = {}
+    for r in get_remaining_by_month(params, keys):
+        group = tuple(r[k] for k in keys)
+        row = rows.get(group)
+        if row is None:
+            row = rows[group] = dict(zip(keys, group), **{OVERDUE: 0.0, "total": 0.0})
+            row.update({_period_field(p): 0.0 for p in periods})
+
+        field = OVERDUE if r.period == OVERDUE else _period_field(r.period)
+        row[field] += flt(r.remaining, 2)
+        row["total"] += flt(r.remaining, 2)
+
+    data = sorted(rows.values(), key=lambda d: tuple(d.get(k) or "" for k in keys))
+    totals = {f: sum(d[f] for d in data) for f in [OVERDUE, *map(_period_field, periods), "total"]}
+    return {"periods": periods, "group_by": params.group_by, "rows": data, "totals": totals}
+
+
+def get_remaining_by_month(params, keys):
+    """
+    One grouped pass over submitted schedule rows. A row's collected share is
+    the payments allocated to its invoice, pro-rated by the row's part of the
+    invoice; past-due balances are folded into a single overdue bucket.
+    """
+    conditions = ["bo.docstatus = 1", "ps.milestone_date < %(end)s"]
+    if params.company:
+        conditions.append("bo.company = %(company)s")
+    if params.project:
+        conditions.append("bo.project = %(project)s")
+    if params.block:
+        conditions.append("bo.block = %(block)s")
+
+    group_cols = ", ".join(f"x.{k}" for k in keys)
+    return frappe.db.sql(
+        f"""
+        SELECT {group_cols}, x.period, SUM(GREATEST(x.net_payable - x.collected, 0)) AS remaining
+        FROM (
+            SELECT
+                bo.project, bo.block, ps.scheme_code, ps.net_payable,
+                CASE WHEN ps.milestone_date < %(start)s THEN '{OVERDUE}'
+                    ELSE DATE_FORMAT(ps.milestone_date, '%%Y-%%m') END AS period,
+                IFNULL(paid.amount * ps.invoiced_amount / NULLIF(si.net_total, 0), 0) AS collected
+            FROM `tabBooking Order Payment Schedule` ps
+            JOIN `tabBooking Order` bo ON bo.name = ps.parent AND ps.parenttype = 'Booking Order'
+            LEFT JOIN `tabSales Invoice` si ON si.name = ps.sales_invoice AND si.docstatus = 1
+            LEFT JOIN (
+                SELECT per.reference_name, SUM(per.allocated_amount) AS amount
+                FROM `tabPayment Entry Reference` per
+                WHERE per.docstatus = 1 AND per.reference_doctype = 'Sales Invoice'
+                GROUP BY per.reference_name
+            ) paid ON paid.reference_name = si.name
+            WHERE {" AND ".join(conditions)}
+        ) x
+        GROUP BY {group_cols}, x.period
+        HAVING remaining > 0
+        """,
+        {**params, "end": add_months(getdate(params.start), params.months)},
+        as_dict=True,
+    )
+
+
+def get_columns(projection):
+    labels = {"project": ("Project", "Link", "Project", 140), "block": ("Block", "Link", "Block", 110),
+              "scheme_code": ("Scheme Code", "Data", None, 100)}
+    columns = []
+    for key in GROUP_FIELDS[projection["group_by"]]:
+        label, fieldtype, options, width = labels[key]
+        columns.append({"label": label, "fieldname": key, "fieldtype": fieldtype, "options": options, "width": width})
+
+    columns.append({"label": "Overdue", "fieldname": OVERDUE, "fieldtype": "Currency", "width": 120})
+    for period in projection["periods"]:
+        label = getdate(f"{period}-01").strftime("%b %Y")
+        columns.append({"label": label, "fieldname": _period_field(period), "fieldtype": "Currency", "width": 110})
+    columns.append({"label": "Total", "fieldname": "total", "fieldtype": "Currency", "width": 130})
+    return columns
+
+
+def get_chart(projection):
+    periods = projection["periods"]
+    return {
+        "data": {
+            "labels": [getdate(f"{p}-01").strftime("%b %y") for p in periods],
+            "datasets": [{"name": "Expected Collections", "values": [projection["totals"][_period_field(p)] for p in periods]}],
+        },
+        "type": "bar",
+        "fieldtype": "Currency",
+    }
+
+
+def get_summary(projection):
+    totals = projection["totals"]
+    next_12 = sum(totals[_period_field(p)] for p in projection["periods"][:12])
+    return [
+        {"label": "Overdue", "value": totals[OVERDUE], "datatype": "Currency", "indicator": "Red"},
+        {"label": "Next 12 Months", "value": next_12, "datatype": "Currency", "indicator": "Blue"},
+        {"label": "Total Expected", "value": totals["total"], "datatype": "Currency", "indicator": "Green"},
+    ]
+
+
+def _period_field(period):
+    return "m_" + period.replace("-", "_")
@@ -0,0 +1,43 @@
+# Copyright (c) 2025, surendhranath and Contributors
+# See license.txt
+
+import frappe
+from frappe.utils import add_months, flt, get_first_day, today
+
+from realapp.realapp.report.cash_flow_projection.cash_flow_projection import execute, get_projection
+from realapp.tests.utils import QUERY_BUDGETS, RealappTestCase, make_booking_order, make_cost_sheet
+
+
+class TestCashFlowProjection(RealappTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		cls.booking = make_booking_order(make_cost_sheet(cls.fixture.units[6], cls.fixture))
+		cls.booking.submit()
+
+	def test_projection_matches_uncollected_schedule(self):
+		end = add_months(get_first_day(today()), 24)
+		expected = sum(
+			flt(r[0], 2)
+			for r in frappe.db.sql(
+				"""
+				SELECT ps.net_payable FROM `tabBooking Order Payment Schedule` ps
+				JOIN `tabBooking Order` bo ON bo.name = ps.parent
+				WHERE bo.docstatus = 1 AND bo.project = %s AND ps.milestone_date < %s
+				  AND ps.sales_invoice IS NULL
+				""",
+				(self.fixture.project, end),
+			)
+		)
+		projection = get_projection(frappe._dict(project=self.fixture.project))
+		self.assertAlmostEqual(projection["totals"]["total"], expected, places=2)
+
+	def test_grouping_by_scheme_code(self):
+		columns, data, *_ = execute({"project": self.fixture.project, "group_by": "Scheme Code"})
+		self.assertEqual([c["fieldname"] for c in columns[:3]], ["project", "block", "scheme_code"])
+		self.assertTrue(all(row["scheme_code"] for row in data))
+
+	def test_repeat_call_is_served_from_cache(self):
+		get_projection(frappe._dict(project=self.fixture.project))
+		with self.assertQueryCount(QUERY_BUDGETS["cash_flow_projection_cached"]):
+			get_projection(frappe._dict(project=self.fixture.project))
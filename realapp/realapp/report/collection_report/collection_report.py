@@ -4,7 +4,10 @@
 import frappe
 from frappe.utils import today, getdate
 
+from realapp.instrumentation import instrument
 
+
+@instrument()
 def execute(filters=None):
     if not filters:
         filters = {}
@@ -99,10 +102,11 @@ def get_data(filters):
 
     data = frappe.db.sql(query, values, as_dict=True)
 
-    # 🔹 Enrich rows with Status + Last Remark
+    # 🔹 Enrich rows with Status + Last Remark (remarks fetched once for all invoices)
+    remarks = get_last_remarks({row["invoice_no"] for row in data})
     for row in data:
         row["status"] = get_status(row)
-        row["last_remark"] = get_last_remark(row["invoice_no"])
+        row["last_remark"] = remarks.get(row["invoice_no"], "")
 
     return data
 
@@ -124,17 +128,24 @@ def get_status(row):
         return "Partially Paid"
 
 
-def get_last_remark(invoice_no):
-    """Fetch last comment/note on Sales Invoice"""
-    remark = frappe.db.sql("""
-        SELECT content
-        FROM `tabComment`
-        WHERE reference_doctype = 'Sales Invoice'
-          AND reference_name = %s
-        ORDER BY creation DESC
-        LIMIT 1
-    """, (invoice_no,))
-    return remark[0][0] if remark else ""
+def get_last_remarks(invoices):
+    """Latest comment per Sales Invoice, for many invoices in one query"""
+    if not invoices:
+        return {}
+
+    rows = frappe.db.sql("""
+        SELECT c.reference_name, c.content
+        FROM `tabComment` c
+        JOIN (
+            SELECT reference_name, MAX(creation) AS creation
+            FROM `tabComment`
+            WHERE reference_doctype = 'Sales Invoice'
+              AND reference_name IN %(invoices)s
+            GROUP BY reference_name
+        ) latest ON latest.reference_name = c.reference_name AND latest.creation = c.creation
+        WHERE c.reference_doctype = 'Sales Invoice'
+    """, {"invoices": tuple(invoices)})
+    return dict(rows)
 
 
 def get_summary(data):
@@ -0,0 +1,42 @@
+# Copyright (c) 2025, surendhranath and Contributors
+# See license.txt
+
+import frappe
+
+from realapp.instrumentation import measure
+from realapp.realapp.doctype.booking_order.booking_order import make_sales_invoice
+from realapp.realapp.report.collection_report.collection_report import execute
+from realapp.tests.utils import QUERY_BUDGETS, RealappTestCase, make_booking_order, make_cost_sheet
+
+
+class TestCollectionReport(RealappTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		# the same report at two sizes: two invoices for the first unit, three for the second
+		cls.units = cls.fixture.units[4:6]
+		for unit, milestones in zip(cls.units, (2, 3)):
+			bo = make_booking_order(make_cost_sheet(unit, cls.fixture))
+			bo.submit()
+			make_sales_invoice(bo.name, selected_rows=frappe.as_json([d.name for d in bo.payment_schedule[:milestones]]))
+			for si in frappe.get_all("Sales Invoice", {"booking_order": bo.name, "docstatus": 0}, pluck="name"):
+				si = frappe.get_doc("Sales Invoice", si)
+				si.submit()
+				si.add_comment("Comment", "Called the buyer")
+
+	def test_query_count_does_not_grow_with_rows(self):
+		counts, sizes = [], []
+		for unit in self.units:
+			with measure() as sample:
+				_columns, data, *_ = execute({"unit": unit})
+			counts.append(sample["queries"])
+			sizes.append(len(data))
+
+		self.assertEqual(sizes, [2, 3])
+		self.assertEqual(counts[0], counts[1])
+		self.assertLessEqual(counts[1], QUERY_BUDGETS["collection_report"])
+
+	def test_rows_carry_status_and_last_remark(self):
+		_columns, data, *_ = execute({"unit": self.units[1]})
+		self.assertTrue(all(row["status"] for row in data))
+		self.assertTrue(all(row["last_remark"] for row in data))
@@ -0,0 +1,32 @@
+// Copyright (c) 2025, surendhranath and contributors
+// For license information, please see license.txt
+
+frappe.query_reports["Milestone Collection Pivot"] = {
+  "filters": [
+    {
+      "fieldname": "company",
+      "label": __("Company"),
+      "fieldtype": "Link",
+      "options": "Company"
+    },
+    {
+      "fieldname": "project",
+      "label": __("Project"),
+      "fieldtype": "Link",
+      "options": "Project"
+    },
+    {
+      "fieldname": "block",
+      "label": __("Block"),
+      "fieldtype": "Link",
+      "options": "Block"
+    },
+    {
+      "fieldname": "row_by",
+      "label": __("Rows"),
+      "fieldtype": "Select",
+      "options": "Block\nUnit",
+      "default": "Block"
+    }
+  ]
+};
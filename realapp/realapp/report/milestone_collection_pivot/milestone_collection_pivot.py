@@ -0,0 +1,172 @@
+# Copyright (c) 2025, surendhranath
+# For license information, please see license.txt
+
+import re
+
+import frappe
+from frappe.utils import flt
+
+from realapp.cache import collection_scopes, get_cached
+from realapp.instrumentation import instrument
+
+MEASURES = ("billed", "collected", "outstanding")
+ROW_FIELDS = {"Block": "block", "Unit": "unit"}
+
+
+@instrument()
+def execute(filters=None):
+    filters = frappe._dict(filters or {})
+    pivot = get_pivot(filters)
+    return get_columns(pivot), get_data(pivot), None, None, get_summary(pivot)
+
+
+@frappe.whitelist()
+@instrument()
+def get_collection_pivot(project=None, block=None, company=None, row_by="Block"):
+    """
+    Billed / collected / outstanding per block (or unit) and scheme code, as
+    a columnar payload: `rows` and `scheme_codes` label the axes and each
+    measure is a list of rows, each a list of values in scheme code order.
+    """
+    frappe.has_permission("Booking Order", "read", throw=True)
+    return get_pivot(frappe._dict(project=project, block=block, company=company, row_by=row_by))
+
+
+def get_pivot(filters):
+    params = {
+        "company": filters.get("company"),
+        "project": filters.get("project"),
+        "block": filters.get("block"),
+        "row_by": filters.get("row_by") if filters.get("row_by") in ROW_FIELDS else "Block",
+    }
+    return get_cached(
+        "milestone_collection_pivot",
+        collection_scopes(params["project"]),
+        params,
+        lambda: build_pivot(frappe._dict(params)),
+    )
+
+
+def build_pivot(params):
+    conditions, values = _conditions(params)
+    codes = get_scheme_codes(conditions, values)
+    pivot = {"row_by": params.row_by, "scheme_codes": codes, "rows": [], **{m: [] for m in MEASURES}}
+    if not codes:
+        pivot["totals"] = {m: [] for m in MEASURES}
+        return pivot
+
+    for r in get_matrix(params, codes, conditions, values):
+        pivot["rows"].append(r[0])
+        for m, measure in enumerate(MEASURES):
+            # columns come back as all codes' billed, then collected, then outstanding
+            pivot[measure].append([flt(v, 2) for v in r[1 + m * len(codes): 1 + (m + 1) * len(codes)]])
+
+    pivot["totals"] = {m: [flt(sum(col), 2) for col in zip(*pivot[m])] for m in MEASURES}
+    return pivot
+
+
+def get_matrix(params, codes, conditions, values):
+    """The whole matrix in one pass: each cell is a conditional sum over the milestone invoice items."""
+    cells = []
+    for measure in MEASURES:
+        cells += [
+            f"SUM(CASE WHEN x.code = %(code_{i})s THEN x.{measure} ELSE 0 END)" for i in range(len(codes))
+        ]
+    values.update({f"code_{i}": code for i, code in enumerate(codes)})
+
+    # an item's share of its invoice carries the same share of the payments and outstanding
+    return frappe.db.sql(
+        f"""
+        SELECT x.row_key, {", ".join(cells)}
+        FROM (
+            SELECT
+                bo.{ROW_FIELDS[params.row_by]} AS row_key,
+                sii.milestone_code AS code,
+                IF(si.rounded_total > 0, si.rounded_total, si.grand_total) * sii.net_amount
+                    / NULLIF(si.net_total, 0) AS billed,
+                IFNULL(paid.amount, 0) * sii.net_amount / NULLIF(si.net_total, 0) AS collected,
+                si.outstanding_amount * sii.net_amount / NULLIF(si.net_total, 0) AS outstanding
+            FROM `tabSales Invoice Item` sii
+            JOIN `tabSales Invoice` si ON si.name = sii.parent
+            JOIN `tabBooking Order` bo ON bo.name = si.booking_order
+            LEFT JOIN (
+                SELECT per.reference_name, SUM(per.allocated_amount) AS amount
+                FROM `tabPayment Entry Reference` per
+                WHERE per.docstatus = 1 AND per.reference_doctype = 'Sales Invoice'
+                GROUP BY per.reference_name
+            ) paid ON paid.reference_name = si.name
+            WHERE {conditions}
+        ) x
+        GROUP BY x.row_key
+        ORDER BY x.row_key
+        """,
+        values,
+    )
+
+
+def get_scheme_codes(conditions, values):
+    codes = frappe.db.sql_list(
+        f"""
+        SELECT DISTINCT sii.milestone_code
+        FROM `tabSales Invoice Item` sii
+        JOIN `tabSales Invoice` si ON si.name = sii.parent
+        JOIN `tabBooking Order` bo ON bo.name = si.booking_order
+        WHERE {conditions}
+        """,
+        values,
+    )
+    return sorted(codes, key=_natural_key)
+
+
+def get_columns(pivot):
+    row_field = ROW_FIELDS[pivot["row_by"]]
+    columns = [{"label": pivot["row_by"], "fieldname": row_field, "fieldtype": "Link", "options": pivot["row_by"], "width": 140}]
+    for i, code in enumerate(pivot["scheme_codes"]):
+        for measure in MEASURES:
+            columns.append({
+                "label": f"{code} {measure.title()}",
+                "fieldname": f"{measure}_{i}",
+                "fieldtype": "Currency",
+                "width": 120,
+            })
+    for measure in MEASURES:
+        columns.append({"label": f"Total {measure.title()}", "fieldname": measure, "fieldtype": "Currency", "width": 130})
+    return columns
+
+
+def get_data(pivot):
+    row_field = ROW_FIELDS[pivot["row_by"]]
+    data = []
+    for r, key in enumerate(pivot["rows"]):
+        row = {row_field: key}
+        for measure in MEASURES:
+            cells = pivot[measure][r]
+            row.update({f"{measure}_{i}": v for i, v in enumerate(cells)})
+            row[measure] = flt(sum(cells), 2)
+        data.append(row)
+    return data
+
+
+def get_summary(pivot):
+    totals = {m: sum(pivot["totals"][m]) for m in MEASURES}
+    return [
+        {"label": "Billed", "value": totals["billed"], "datatype": "Currency", "indicator": "Blue"},
+        {"label": "Collected", "value": totals["collected"], "datatype": "Currency", "indicator": "Green"},
+        {"label": "Outstanding", "value": totals["outstanding"], "datatype": "Currency", "indicator": "Red"},
+    ]
+
+
+def _conditions(params):
+    conditions = ["si.docstatus = 1", "si.is_return = 0", "IFNULL(sii.milestone_code, '') != ''"]
+    if params.company:
+        conditions.append("bo.company = %(company)s")
+    if params.project:
+        conditions.append("bo.project = %(project)s")
+    if params.block:
+        conditions.append("bo.block = %(block)s")
+    return " AND ".join(conditions), dict(params)
+
+
+def _natural_key(code):
+    """C-2 before C-10."""
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", code)]
@@ -0,0 +1,62 @@
+# Copyright (c) 2025, surendhranath and Contributors
+# See license.txt
+
+import frappe
+from frappe.utils import flt
+
+from realapp.allocation import make_receipt
+from realapp.realapp.doctype.booking_order.booking_order import make_sales_invoice
+from realapp.realapp.report.milestone_collection_pivot.milestone_collection_pivot import execute, get_pivot
+from realapp.tests.utils import RealappTestCase, make_booking_order, make_cost_sheet
+
+
+class TestMilestoneCollectionPivot(RealappTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		cls.booking = make_booking_order(make_cost_sheet(cls.fixture.units[10], cls.fixture))
+		cls.booking.submit()
+
+		# C-1 and C-2 invoiced, C-1 fully collected
+		rows = cls.booking.payment_schedule[:2]
+		make_sales_invoice(cls.booking.name, selected_rows=frappe.as_json([d.name for d in rows]))
+		cls.billed = {}
+		for si in frappe.get_all("Sales Invoice", {"booking_order": cls.booking.name, "docstatus": 0}, pluck="name"):
+			si = frappe.get_doc("Sales Invoice", si)
+			si.submit()
+			cls.billed[si.items[0].milestone_code] = flt(si.rounded_total or si.grand_total, 2)
+
+		receipt = make_receipt(cls.booking.name, cls.billed["C-1"])
+		frappe.get_doc("Payment Entry", receipt).submit()
+
+	def _cells(self, pivot, measure):
+		row = pivot[measure][pivot["rows"].index(self.booking.unit)]
+		return dict(zip(pivot["scheme_codes"], row))
+
+	def test_cells_match_invoices_and_receipt(self):
+		pivot = get_pivot(frappe._dict(project=self.fixture.project, row_by="Unit"))
+
+		billed = self._cells(pivot, "billed")
+		collected = self._cells(pivot, "collected")
+		outstanding = self._cells(pivot, "outstanding")
+		self.assertAlmostEqual(billed["C-1"], self.billed["C-1"], places=2)
+		self.assertAlmostEqual(billed["C-2"], self.billed["C-2"], places=2)
+		self.assertEqual(billed.get("C-3", 0), 0)
+		self.assertAlmostEqual(collected["C-1"], self.billed["C-1"], places=2)
+		self.assertEqual(collected["C-2"], 0)
+		self.assertEqual(outstanding["C-1"], 0)
+		self.assertAlmostEqual(outstanding["C-2"], self.billed["C-2"], places=2)
+
+	def test_payload_is_columnar(self):
+		pivot = get_pivot(frappe._dict(project=self.fixture.project))
+		self.assertTrue(pivot["rows"])
+		for measure in ("billed", "collected", "outstanding"):
+			self.assertEqual(len(pivot[measure]), len(pivot["rows"]))
+			self.assertTrue(all(len(cells) == len(pivot["scheme_codes"]) for cells in pivot[measure]))
+
+	def test_report_flattens_matrix(self):
+		columns, data, *_ = execute({"project": self.fixture.project, "block": self.booking.block})
+		self.assertEqual(columns[0]["fieldname"], "block")
+		row = next(r for r in data if r["block"] == self.booking.block)
+		self.assertGreaterEqual(row["billed"], self.billed["C-1"] + self.billed["C-2"] - 0.01)
+		self.assertGreaterEqual(row["collected"], self.billed["C-1"] - 0.01)
@@ -0,0 +1,26 @@
+// Copyright (c) 2025, surendhranath and contributors
+// For license information, please see license.txt
+
+frappe.query_reports["Sales Velocity"] = {
+  "filters": [
+    {
+      "fieldname": "project",
+      "label": __("Project"),
+      "fieldtype": "Link",
+      "options": "Project",
+      "reqd": 1
+    },
+    {
+      "fieldname": "block",
+      "label": __("Block"),
+      "fieldtype": "Link",
+      "options": "Block"
+    },
+    {
+      "fieldname": "weeks",
+      "label": __("Weeks"),
+      "fieldtype": "Int",
+      "default": 12
+    }
+  ]
+};
@@ -0,0 +1,183 @@
+# Copyright (c) 2025, surendhranath
+# For license information, please see license.txt
+
+import frappe
+from frappe.utils import add_days, cint, flt, getdate, today
+
+from realapp.cache import get_cached, inventory_scopes
+from realapp.instrumentation import instrument
+
+DEFAULT_WEEKS = 12
+WEEKS_PER_MONTH = 52 / 12
+
+
+@instrument()
+def execute(filters=None):
+    filters = frappe._dict(filters or {})
+    if not filters.get("project"):
+        return get_columns(), []
+
+    dashboard = get_dashboard(filters.project, filters.get("weeks"))
+    data = dashboard["rows"]
+    if filters.get("block"):
+        data = [row for row in data if row["block"] == filters.block]
+
+    return get_columns(), data, None, get_chart(dashboard), get_summary(dashboard)
+
+
+@frappe.whitelist()
+@instrument()
+def get_sales_velocity(project, weeks=DEFAULT_WEEKS):
+    """Velocity, pricing and inventory runway per block and flat type for one project."""
+    frappe.has_permission("Booking Order", "read", throw=True)
+    return get_dashboard(project, weeks)
+
+
+def get_dashboard(project, weeks=None):
+    params = {
+        "project": project,
+        "weeks": min(max(cint(weeks) or DEFAULT_WEEKS, 1), 104),
+        "as_on": today(),
+    }
+    return get_cached("sales_velocity", inventory_scopes(project), params, lambda: build_dashboard(frappe._dict(params)))
+
+
+def build_dashboard(params):
+    params.from_date = add_days(getdate(params.as_on), -7 * params.weeks)
+    weekly = get_weekly_bookings(params)
+
+    rows = []
+    for r in get_block_metrics(params):
+        monthly_rate = flt(r.recent_bookings) / params.weeks * WEEKS_PER_MONTH
+        booked_rate = _weighted(r, ("standard_rate", "standard_count"), ("negotiated_rate", "negotiated_count"))
+        rows.append({
+            "block": r.block,
+            "flat_type": r.flat_type,
+            "total_units": cint(r.total_units),
+            "available_units": cint(r.available_units),
+            "booked_units": cint(r.booked_units),
+            "recent_bookings": cint(r.recent_bookings),
+            "bookings_per_week": flt(flt(r.recent_bookings) / params.weeks, 2),
+            "share_of_bookings": flt(r.share_of_bookings, 2),
+            "list_rate": flt(r.list_rate, 2),
+            "standard_rate": flt(r.standard_rate, 2),
+            "negotiated_rate": flt(r.negotiated_rate, 2),
+            "discount_pct": flt((1 - booked_rate / flt(r.booked_list_rate)) * 100, 2) if booked_rate and r.booked_list_rate else 0,
+            "months_of_inventory": flt(cint(r.available_units) / monthly_rate, 1) if monthly_rate else None,
+        })
+
+    return {"project": params.project, "weeks": params.weeks, "from_date": str(params.from_date), "rows": rows, "weekly": weekly}
+
+
+def get_block_metrics(params):
+    """Inventory, list vs booked price and recent bookings per block/flat type, with each group's share of the project."""
+    return frappe.db.sql(
+        """
+        SELECT
+            u.block,
+            IFNULL(u.flat_type, '') AS flat_type,
+            COUNT(*) AS total_units,
+            SUM(u.status = 'Available') AS available_units,
+            COUNT(bo.name) AS booked_units,
+            SUM(IFNULL(bo.booking_date >= %(from_date)s, 0)) AS recent_bookings,
+            100 * SUM(IFNULL(bo.booking_date >= %(from_date)s, 0))
+                / NULLIF(SUM(SUM(IFNULL(bo.booking_date >= %(from_date)s, 0))) OVER (), 0) AS share_of_bookings,
+            AVG(u.basic_price_per_sft) AS list_rate,
+            AVG(CASE WHEN bo.name IS NOT NULL THEN u.basic_price_per_sft END) AS booked_list_rate,
+            AVG(CASE WHEN cs.cost_sheet_type = 'Standard' THEN cs.basic_price_per_sft END) AS standard_rate,
+            SUM(cs.cost_sheet_type = 'Standard') AS standard_count,
+            AVG(CASE WHEN cs.cost_sheet_type = 'Negotiated' THEN cs.basic_price_per_sft END) AS negotiated_rate,
+            SUM(cs.cost_sheet_type = 'Negotiated') AS negotiated_count
+        FROM `tabUnit` u
+        LEFT JOIN `tabBooking Order` bo ON bo.unit = u.name AND bo.docstatus = 1
+        LEFT JOIN `tabCost Sheet` cs ON cs.name = bo.cost_sheet
+        WHERE u.project = %(project)s
+        GROUP BY u.block, IFNULL(u.flat_type, '')
+        ORDER BY u.block, flat_type
+        """,
+        params,
+        as_dict=True,
+    )
+
+
+def get_weekly_bookings(params):
+    """Bookings per ISO week with a trailing 4-week average and running total per block/flat type."""
+    return frappe.db.sql(
+        """
+        SELECT
+            block, flat_type, week_start, bookings,
+            SUM(bookings) OVER (
+                PARTITION BY block, flat_type ORDER BY TO_DAYS(week_start)
+                RANGE BETWEEN 21 PRECEDING AND CURRENT ROW
+            ) / 4 AS rolling_4w,
+            SUM(bookings) OVER (PARTITION BY block, flat_type ORDER BY week_start) AS cumulative
+        FROM (
+            SELECT
+                bo.block,
+                IFNULL(u.flat_type, '') AS flat_type,
+                DATE_SUB(bo.booking_date, INTERVAL WEEKDAY(bo.booking_date) DAY) AS week_start,
+                COUNT(*) AS bookings
+            FROM `tabBooking Order` bo
+            JOIN `tabUnit` u ON u.name = bo.unit
+            WHERE bo.docstatus = 1 AND bo.project = %(project)s AND bo.booking_date >= %(from_date)s
+            GROUP BY bo.block, IFNULL(u.flat_type, ''), week_start
+        ) w
+        ORDER BY week_start, block, flat_type
+        """,
+        params,
+        as_dict=True,
+    )
+
+
+def get_columns():
+    return [
+        {"label": "Block", "fieldname": "block", "fieldtype": "Link", "options": "Block", "width": 110},
+        {"label": "Flat Type", "fieldname": "flat_type", "fieldtype": "Data", "width": 90},
+        {"label": "Total Units", "fieldname": "total_units", "fieldtype": "Int", "width": 90},
+        {"label": "Available", "fieldname": "available_units", "fieldtype": "Int", "width": 90},
+        {"label": "Booked", "fieldname": "booked_units", "fieldtype": "Int", "width": 90},
+        {"label": "Booked in Window", "fieldname": "recent_bookings", "fieldtype": "Int", "width": 120},
+        {"label": "Bookings / Week", "fieldname": "bookings_per_week", "fieldtype": "Float", "width": 120},
+        {"label": "Share of Bookings %", "fieldname": "share_of_bookings", "fieldtype": "Percent", "width": 130},
+        {"label": "List Rate / Sft", "fieldname": "list_rate", "fieldtype": "Currency", "width": 120},
+        {"label": "Standard Rate / Sft", "fieldname": "standard_rate", "fieldtype": "Currency", "width": 130},
+        {"label": "Negotiated Rate / Sft", "fieldname": "negotiated_rate", "fieldtype": "Currency", "width": 140},
+        {"label": "Discount %", "fieldname": "discount_pct", "fieldtype": "Percent", "width": 100},
+        {"label": "Months of Inventory", "fieldname": "months_of_inventory", "fieldtype": "Float", "width": 140},
+    ]
+
+
+def get_chart(dashboard):
+    weeks = {}
+    for r in dashboard["weekly"]:
+        weeks[str(r.week_start)] = weeks.get(str(r.week_start), 0) + cint(r.bookings)
+    labels = sorted(weeks)
+    return {
+        "data": {"labels": labels, "datasets": [{"name": "Bookings", "values": [weeks[w] for w in labels]}]},
+        "type": "line",
+    }
+
+
+def get_summary(dashboard):
+    rows = dashboard["rows"]
+    available = sum(r["available_units"] for r in rows)
+    recent = sum(r["recent_bookings"] for r in rows)
+    monthly_rate = recent / dashboard["weeks"] * WEEKS_PER_MONTH
+    return [
+        {"label": "Available Units", "value": available, "indicator": "Blue"},
+        {"label": "Bookings / Week", "value": flt(recent / dashboard["weeks"], 2), "datatype": "Float", "indicator": "Green"},
+        {
+            "label": "Months of Inventory",
+            "value": flt(available / monthly_rate, 1) if monthly_rate else "-",
+            "datatype": "Float",
+            "indicator": "Orange",
+        },
+    ]
+
+
+def _weighted(row, *pairs):
+    """Average booked rate across Standard and Negotiated sheets, weighted by count."""
+    total = sum(flt(row[c]) for _r, c in pairs)
+    if not total:
+        return 0
+    return sum(flt(row[r]) * flt(row[c]) for r, c in pairs) / total
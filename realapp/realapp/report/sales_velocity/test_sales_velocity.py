@@ -0,0 +1,19 @@
+# Copyright (c) 2025, surendhranath and Contributors
+# See license.txt
+
+from realapp.realapp.report.sales_velocity.sales_velocity import execute
+from realapp.tests.utils import RealappTestCase, make_booking_order, make_cost_sheet
+
+
+class TestSalesVelocity(RealappTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		make_booking_order(make_cost_sheet(cls.fixture.units[7], cls.fixture)).submit()
+
+	def test_velocity_counts_recent_booking(self):
+		_columns, data, _msg, chart, _summary = execute({"project": self.fixture.project})
+
+		self.assertEqual(sum(r["total_units"] for r in data), len(self.fixture.units))
+		self.assertGreaterEqual(sum(r["recent_bookings"] for r in data), 1)
+		self.assertGreaterEqual(sum(chart["data"]["datasets"][0]["values"]), 1)
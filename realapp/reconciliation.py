@@ -0,0 +1,374 @@
+# Copyright (c) 2025, surendhranath
+# For license information, please see license.txt
+
+"""
+Bank statement reconciliation against open booking invoices.
+
+`match_batch` streams the statement CSV of a Bank Statement Match Batch,
+scores every credit line against an in-memory index of open invoices
+(keyed by amount, by unit / flat number and by invoice number, each bucket
+sorted by due date and searched with bisect) and bulk inserts the results
+as Bank Statement Lines for review. `post_batch` turns approved lines into
+submitted Payment Entries in committed chunks.
+"""
+
+import csv
+import re
+from bisect import bisect_left
+
+import frappe
+from frappe.utils import cint, flt, getdate
+
+from realapp.allocation import apply_allocation
+from realapp.utils import bulk_insert_rows
+
+CHUNK_SIZE = 500
+MIN_CONFIDENCE = 50
+WEIGHTS = {"invoice": 60, "amount": 50, "unit": 35, "date": 15}
+HEADER_ALIASES = {
+    "date": ("date", "transaction date", "txn date", "tran date", "value date", "posting date"),
+    "narration": ("narration", "description", "particulars", "remarks", "details", "transaction details"),
+    "amount": ("credit", "credit amount", "deposit", "deposits", "deposit amount", "cr amount", "amount"),
+    "reference_no": ("reference", "reference no", "ref no", "ref no./cheque no.", "cheque no", "chq/ref no", "utr"),
+}
+LINE_FIELDS = (
+    "batch",
+    "line_no",
+    "transaction_date",
+    "amount",
+    "reference_no",
+    "narration",
+    "sales_invoice",
+    "booking_order",
+    "unit",
+    "customer",
+    "confidence",
+    "match_basis",
+    "approved",
+)
+
+
+def match_batch(batch):
+    doc = frappe.get_doc("Bank Statement Match Batch", batch)
+    try:
+        # re-matching keeps lines that were already posted
+        posted = set(
+            frappe.get_all(
+                "Bank Statement Line", filters={"batch": batch, "payment_entry": ("is", "set")}, pluck="line_no"
+            )
+        )
+        frappe.db.delete("Bank Statement Line", {"batch": batch, "payment_entry": ("is", "not set")})
+
+        index = InvoiceIndex(get_open_invoices(doc.company), cint(doc.date_window_days) or 10)
+        auto_approve = flt(doc.auto_approve_confidence) or 100
+        total = 0
+        for chunk in _chunks(read_statement(_file_path(doc.statement_file))):
+            rows = []
+            for line in chunk:
+                total += 1
+                if line["line_no"] in posted:
+                    continue
+                rows.append(_match_row(batch, line, index, auto_approve))
+            bulk_insert_rows("Bank Statement Line", LINE_FIELDS, rows)
+            frappe.db.commit()
+            # the line count is unknown until the file ends; report lines read so far
+            _progress(batch, "Matching statement lines", total, total + CHUNK_SIZE, f"{total} lines read")
+
+        _update_counts(doc, status="Matched")
+    except Exception:
+        frappe.db.rollback()
+        doc.db_set("status", "Failed")
+        frappe.log_error(title=f"Bank statement matching failed for {batch}")
+        frappe.db.commit()
+        raise
+
+
+def post_batch(batch):
+    """Create and submit one Payment Entry per approved, unposted line, committing every chunk."""
+    doc = frappe.get_doc("Bank Statement Match Batch", batch)
+    pending = frappe.db.count(
+        "Bank Statement Line", {"batch": batch, "approved": 1, "payment_entry": ("is", "not set")}
+    )
+    done, failed, after = 0, 0, -1
+    while True:
+        lines = frappe.get_all(
+            "Bank Statement Line",
+            filters={
+                "batch": batch,
+                "approved": 1,
+                "payment_entry": ("is", "not set"),
+                "sales_invoice": ("is", "set"),
+                "line_no": (">", after),
+            },
+            fields=["name", "line_no", "transaction_date", "amount", "reference_no", "sales_invoice"],
+            order_by="line_no",
+            limit=CHUNK_SIZE,
+        )
+        if not lines:
+            break
+        after = lines[-1].line_no
+
+        invoices = {
+            inv.name: inv
+            for inv in frappe.get_all(
+                "Sales Invoice",
+                filters={"name": ("in", [l.sales_invoice for l in lines]), "docstatus": 1},
+                fields=["name", "customer", "booking_order", "debit_to", "due_date", "grand_total",
+                        "rounded_total", "outstanding_amount"],
+            )
+        }
+        for line in lines:
+            frappe.db.savepoint("realapp_reconciliation")
+            try:
+                payment_entry = _make_payment_entry(doc, line, invoices[line.sales_invoice])
+                frappe.db.set_value("Bank Statement Line", line.name, "payment_entry", payment_entry)
+                done += 1
+            except Exception:
+                frappe.db.rollback(save_point="realapp_reconciliation")
+                frappe.log_error(title=f"Posting bank statement line {batch}/{line.line_no} failed")
+                failed += 1
+
+        frappe.db.commit()
+        _progress(batch, "Posting Payment Entries", done + failed, pending, f"{done} posted, {failed} failed")
+
+    _update_counts(doc, status="Failed" if failed else "Posted")
+
+
+def read_statement(path):
+    """Yield credit lines from a statement CSV as dicts; reads the file row by row."""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        columns = None
+        for line_no, row in enumerate(reader, 1):
+            if columns is None:
+                # banks put account details above the header row
+                columns = _header_columns(row)
+                continue
+            amount = _parse_amount(_cell(row, columns["amount"]))
+            if amount <= 0:
+                continue
+            try:
+                transaction_date = getdate(_cell(row, columns["date"]), parse_day_first=True)
+            except Exception:
+                continue
+            yield {
+                "line_no": line_no,
+                "transaction_date": transaction_date,
+                "amount": amount,
+                "narration": _cell(row, columns.get("narration")),
+                "reference_no": _cell(row, columns.get("reference_no")),
+            }
+
+    if columns is None:
+        frappe.throw("Could not find a date and a credit/amount column in the statement file.")
+
+
+def get_open_invoices(company):
+    return frappe.db.sql(
+        """
+        SELECT si.name, si.customer, si.booking_order, si.realapp_unit AS unit, si.due_date,
+            si.outstanding_amount, u.flat_number
+        FROM `tabSales Invoice` si
+        LEFT JOIN `tabUnit` u ON u.name = si.realapp_unit
+        WHERE si.docstatus = 1 AND si.company = %s AND si.outstanding_amount > 0
+          AND IFNULL(si.booking_order, '') != ''
+        """,
+        (company,),
+        as_dict=True,
+    )
+
+
+class InvoiceIndex:
+    """Open invoices bucketed by amount (paise), unit token and invoice number; buckets sorted by due date."""
+
+    def __init__(self, invoices, window_days):
+        self.window = window_days
+        self.used = set()
+        self.by_amount, self.by_unit, self.by_invoice = {}, {}, {}
+        for inv in sorted(invoices, key=lambda i: (getdate(i.due_date).toordinal(), i.name)):
+            inv.due_ordinal = getdate(inv.due_date).toordinal()
+            self.by_amount.setdefault(_paise(inv.outstanding_amount), []).append(inv)
+            self.by_invoice[_normalize(inv.name)] = inv
+            for key in {_normalize(inv.unit), _normalize(inv.flat_number)}:
+                if len(key) >= 3:
+                    self.by_unit.setdefault(key, []).append(inv)
+        self.amount_ordinals = {k: [i.due_ordinal for i in v] for k, v in self.by_amount.items()}
+
+    def best_match(self, line):
+        """(invoice, confidence, basis) for the best unused candidate, or (None, 0, "")."""
+        tokens = _tokens(line["narration"], line["reference_no"])
+        ordinal = line["transaction_date"].toordinal()
+        paise = _paise(line["amount"])
+
+        candidates = {}
+        for token in tokens:
+            inv = self.by_invoice.get(token)
+            if inv:
+                candidates[inv.name] = inv
+            for inv in self.by_unit.get(token, ()):
+                candidates[inv.name] = inv
+        for inv in self._near(paise, ordinal):
+            candidates[inv.name] = inv
+
+        best, best_score, best_basis = None, 0, ""
+        for inv in candidates.values():
+            if inv.name in self.used:
+                continue
+            basis = []
+            if _normalize(inv.name) in tokens:
+                basis.append("invoice")
+            if _paise(inv.outstanding_amount) == paise:
+                basis.append("amount")
+            if {_normalize(inv.unit), _normalize(inv.flat_number)} & tokens:
+                basis.append("unit")
+            score = sum(WEIGHTS[b] for b in basis)
+            days = abs(inv.due_ordinal - ordinal)
+            if days <= self.window:
+                basis.append("date")
+                score += WEIGHTS["date"] * (1 - days / (self.window + 1))
+            score = min(score, 100)
+            if score > best_score:
+                best, best_score, best_basis = inv, score, basis
+
+        if best is None or best_score < MIN_CONFIDENCE:
+            return None, flt(best_score, 1), ""
+        self.used.add(best.name)
+        return best, flt(best_score, 1), "+".join(best_basis)
+
+    def _near(self, paise, ordinal):
+        """Same-amount invoices ordered outwards from the transaction date, within the window."""
+        bucket = self.by_amount.get(paise)
+        if not bucket:
+            return []
+        ordinals = self.amount_ordinals[paise]
+        lo = bisect_left(ordinals, ordinal - self.window)
+        hi = bisect_left(ordinals, ordinal + self.window + 1)
+        if lo < hi:
+            return sorted(bucket[lo:hi], key=lambda i: abs(i.due_ordinal - ordinal))
+        # nothing due near the credit: fall back to the oldest unused invoice of that amount
+        return next(([i] for i in bucket if i.name not in self.used), [])
+
+
+# ----------------- Helpers -----------------
+
+def _match_row(batch, line, index, auto_approve):
+    inv, confidence, basis = index.best_match(line)
+    return {
+        "batch": batch,
+        "line_no": line["line_no"],
+        "transaction_date": line["transaction_date"],
+        "amount": line["amount"],
+        "reference_no": (line["reference_no"] or "")[:140],
+        "narration": line["narration"],
+        "sales_invoice": inv.name if inv else None,
+        "booking_order": inv.booking_order if inv else None,
+        "unit": inv.unit if inv else None,
+        "customer": inv.customer if inv else None,
+        "confidence": confidence,
+        "match_basis": basis,
+        "approved": 1 if inv and confidence >= auto_approve else 0,
+    }
+
+
+def _make_payment_entry(batch_doc, line, invoice):
+    pe = frappe.get_doc({
+        "doctype": "Payment Entry",
+        "payment_type": "Receive",
+        "company": batch_doc.company,
+        "posting_date": line.transaction_date,
+        "party_type": "Customer",
+        "party": invoice.customer,
+        "booking_order": invoice.booking_order,
+        "paid_from": invoice.debit_to,
+        "paid_to": batch_doc.bank_account,
+        "paid_amount": line.amount,
+        "received_amount": line.amount,
+        "reference_no": line.reference_no or f"{batch_doc.name}/{line.line_no}",
+        "reference_date": line.transaction_date,
+    })
+    apply_allocation(pe, [invoice])
+    pe.insert(ignore_permissions=True)
+    pe.submit()
+    return pe.name
+
+
+def _update_counts(doc, status):
+    counts = frappe.db.sql(
+        """
+        SELECT COUNT(*), SUM(IFNULL(sales_invoice, '') != ''), SUM(approved), SUM(IFNULL(payment_entry, '') != '')
+        FROM `tabBank Statement Line` WHERE batch = %s
+        """,
+        (doc.name,),
+    )[0]
+    doc.db_set({
+        "status": status,
+        "total_lines": cint(counts[0]),
+        "matched_lines": cint(counts[1]),
+        "approved_lines": cint(counts[2]),
+        "posted_lines": cint(counts[3]),
+    })
+    frappe.db.commit()
+    _progress(doc.name, "Done", 1, 1, status)
+
+
+def _header_columns(row):
+    labels = [c.strip().lower() for c in row]
+    columns = {}
+    for key, aliases in HEADER_ALIASES.items():
+        # first alias wins, so a "Credit" column is preferred over a signed "Amount"
+        for alias in aliases:
+            if alias in labels:
+                columns[key] = labels.index(alias)
+                break
+    return columns if "date" in columns and "amount" in columns else None
+
+
+def _cell(row, index):
+    if index is None or index >= len(row):
+        return ""
+    return row[index].strip()
+
+
+def _parse_amount(value):
+    return flt((value or "").upper().replace(",", "").replace("CR", "").strip(), 2)
+
+
+def _tokens(*texts):
+    """Alphanumeric tokens plus joined neighbours, so 'T01 F03 02' also yields 'T01F0302'."""
+    words = [w for w in re.split(r"[^A-Z0-9]+", " ".join(t or "" for t in texts).upper()) if w]
+    tokens = set(words)
+    for n in (2, 3):
+        tokens.update("".join(words[i:i + n]) for i in range(len(words) - n + 1))
+    return {t for t in tokens if len(t) >= 3}
+
+
+def _normalize(value):
+    return re.sub(r"[^A-Z0-9]", "", (value or "").upper())
+
+
+def _paise(amount):
+    return int(round(flt(amount) * 100))
+
+
+def _file_path(file_url):
+    return frappe.get_doc("File", {"file_url": file_url}).get_full_path()
+
+
+def _chunks(iterable, size=CHUNK_SIZE):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _progress(batch, title, progress, total, description):
+    frappe.publish_realtime(
+        "realapp_reconciliation_progress",
+        {"batch": batch, "title": title, "progress": progress, "total": max(total, 1), "description": description},
+        doctype="Bank Statement Match Batch",
+        docname=batch,
+    )
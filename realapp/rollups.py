@@ -0,0 +1,200 @@
+# Copyright (c) 2025, surendhranath
+# For license information, please see license.txt
+
+"""
+Collection rollups on Booking Order.
+
+`invoiced_amount`, `collected_amount`, `outstanding_amount`, `overdue_amount`
+and `last_payment_date` summarise a booking's milestone invoices and the
+receipts allocated to them, so list views and follow-up queues never join
+invoices and payments. Invoice and receipt submissions apply signed deltas
+in a single UPDATE; an invoice cancellation recomputes its booking, since
+ERPNext may unlink the invoice's payments on cancel. Overdue amounts also
+move with the calendar and are re-derived daily by `refresh_overdue`, and
+`rebuild_rollups` recomputes everything and corrects bookings that drifted.
+"""
+
+import frappe
+from frappe.utils import flt, getdate, today
+
+CHUNK_SIZE = 5000
+ROLLUP_FIELDS = ("invoiced_amount", "collected_amount", "outstanding_amount", "overdue_amount", "last_payment_date")
+
+
+def apply_invoice(doc):
+    """A booking invoice was submitted: it adds to invoiced, outstanding and (if already past due) overdue."""
+    total = flt(doc.rounded_total) or flt(doc.grand_total)
+    outstanding = total if doc.get("is_return") else flt(doc.outstanding_amount)
+    overdue = outstanding if not doc.get("is_return") and getdate(doc.due_date) < getdate(today()) else 0
+    frappe.db.sql(
+        """
+        UPDATE `tabBooking Order`
+        SET invoiced_amount = invoiced_amount + %(total)s,
+            collected_amount = collected_amount + %(advances)s,
+            outstanding_amount = outstanding_amount + %(outstanding)s,
+            overdue_amount = overdue_amount + %(overdue)s
+        WHERE name = %(booking_order)s
+        """,
+        {
+            "total": total,
+            # advances adjusted in the invoice are allocated without a Payment Entry submit
+            "advances": total - outstanding,
+            "outstanding": outstanding,
+            "overdue": overdue,
+            "booking_order": doc.booking_order,
+        },
+    )
+
+
+def apply_payment(doc, invoices, sign=1):
+    """
+    A receipt was submitted (sign=1) or cancelled (sign=-1). `invoices` maps
+    the booking invoices it references to their booking_order and due_date.
+    """
+    deltas = {}
+    for ref in doc.get("references") or []:
+        inv = invoices.get(ref.reference_name) if ref.reference_doctype == "Sales Invoice" else None
+        if not inv:
+            continue
+        amount = flt(ref.allocated_amount) * sign
+        d = deltas.setdefault(inv.booking_order, {"collected": 0.0, "overdue": 0.0})
+        d["collected"] += amount
+        if getdate(inv.due_date) < getdate(today()):
+            d["overdue"] += amount
+
+    for booking_order, d in deltas.items():
+        frappe.db.sql(
+            """
+            UPDATE `tabBooking Order`
+            SET collected_amount = collected_amount + %(collected)s,
+                outstanding_amount = outstanding_amount - %(collected)s,
+                overdue_amount = GREATEST(overdue_amount - %(overdue)s, 0)
+            WHERE name = %(booking_order)s
+            """,
+            {**d, "booking_order": booking_order},
+        )
+
+    if not deltas:
+        return
+    if sign > 0:
+        frappe.db.sql(
+            """
+            UPDATE `tabBooking Order`
+            SET last_payment_date = GREATEST(IFNULL(last_payment_date, %(posting_date)s), %(posting_date)s)
+            WHERE name IN %(booking_orders)s
+            """,
+            {"posting_date": doc.posting_date, "booking_orders": tuple(deltas)},
+        )
+    else:
+        _set_last_payment_date(tuple(deltas))
+
+
+def refresh_overdue(as_on=None):
+    """Daily: re-derive overdue amounts, which grow as due dates pass without any document changing."""
+    frappe.db.sql(
+        """
+        UPDATE `tabBooking Order` bo
+        LEFT JOIN (
+            SELECT booking_order, SUM(outstanding_amount) AS overdue
+            FROM `tabSales Invoice`
+            WHERE docstatus = 1 AND IFNULL(booking_order, '') != ''
+              AND outstanding_amount > 0 AND due_date < %(as_on)s
+            GROUP BY booking_order
+        ) od ON od.booking_order = bo.name
+        SET bo.overdue_amount = IFNULL(od.overdue, 0)
+        WHERE bo.docstatus = 1 AND (bo.outstanding_amount > 0 OR bo.overdue_amount > 0)
+        """,
+        {"as_on": getdate(as_on or today())},
+    )
+
+
+def rebuild_rollups(booking_orders=None, commit=True):
+    """Recompute rollups from invoices and payments; returns the bookings whose stored values had drifted."""
+    corrected, after = [], ""
+    pending = list(booking_orders or [])
+    while True:
+        if booking_orders:
+            names, pending = pending[:CHUNK_SIZE], pending[CHUNK_SIZE:]
+        else:
+            names = frappe.db.sql_list(
+                """
+                SELECT name FROM `tabBooking Order`
+                WHERE docstatus = 1 AND name > %s
+                ORDER BY name LIMIT %s
+                """,
+                (after, CHUNK_SIZE),
+            )
+        if not names:
+            break
+        after = names[-1]
+
+        for row in _computed_rollups(names):
+            expected = {f: row[f"new_{f}"] for f in ROLLUP_FIELDS}
+            if any(_differs(f, row[f], expected[f]) for f in ROLLUP_FIELDS):
+                frappe.db.set_value("Booking Order", row.name, expected, update_modified=False)
+                corrected.append(row.name)
+        if commit:
+            frappe.db.commit()
+
+    return corrected
+
+
+# ----------------- Helpers -----------------
+
+def _computed_rollups(names):
+    return frappe.db.sql(
+        """
+        SELECT
+            bo.name, bo.invoiced_amount, bo.collected_amount, bo.outstanding_amount, bo.overdue_amount,
+            bo.last_payment_date,
+            IFNULL(inv.invoiced, 0) AS new_invoiced_amount,
+            IFNULL(pay.collected, 0) AS new_collected_amount,
+            IFNULL(inv.outstanding, 0) AS new_outstanding_amount,
+            IFNULL(inv.overdue, 0) AS new_overdue_amount,
+            pay.last_payment_date AS new_last_payment_date
+        FROM `tabBooking Order` bo
+        LEFT JOIN (
+            SELECT booking_order,
+                SUM(IF(rounded_total != 0, rounded_total, grand_total)) AS invoiced,
+                SUM(outstanding_amount) AS outstanding,
+                SUM(IF(due_date < %(today)s AND outstanding_amount > 0, outstanding_amount, 0)) AS overdue
+            FROM `tabSales Invoice`
+            WHERE docstatus = 1 AND booking_order IN %(names)s
+            GROUP BY booking_order
+        ) inv ON inv.booking_order = bo.name
+        LEFT JOIN (
+            SELECT si.booking_order, SUM(per.allocated_amount) AS collected, MAX(pe.posting_date) AS last_payment_date
+            FROM `tabPayment Entry Reference` per
+            JOIN `tabPayment Entry` pe ON pe.name = per.parent
+            JOIN `tabSales Invoice` si ON si.name = per.reference_name
+            WHERE per.docstatus = 1 AND per.reference_doctype = 'Sales Invoice' AND si.booking_order IN %(names)s
+            GROUP BY si.booking_order
+        ) pay ON pay.booking_order = bo.name
+        WHERE bo.name IN %(names)s
+        """,
+        {"names": tuple(names), "today": getdate(today())},
+        as_dict=True,
+    )
+
+
+def _set_last_payment_date(booking_orders):
+    frappe.db.sql(
+        """
+        UPDATE `tabBooking Order` bo
+        SET bo.last_payment_date = (
+            SELECT MAX(pe.posting_date)
+            FROM `tabPayment Entry Reference` per
+            JOIN `tabPayment Entry` pe ON pe.name = per.parent
+            JOIN `tabSales Invoice` si ON si.name = per.reference_name
+            WHERE per.docstatus = 1 AND per.reference_doctype = 'Sales Invoice' AND si.booking_order = bo.name
+        )
+        WHERE bo.name IN %(booking_orders)s
+        """,
+        {"booking_orders": booking_orders},
+    )
+
+
+def _differs(field, current, expected):
+    if field == "last_payment_date":
+        return (getdate(current) if current else None) != (getdate(expected) if expected else None)
+    return abs(flt(current) - flt(expected)) >= 0.005
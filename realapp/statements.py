@@ -0,0 +1,260 @@
+# Copyright (c) 2025, surendhranath
+# For license information, please see license.txt
+
+"""
+Customer statements of account.
+
+`get_statement_data` fetches bookings, payment schedules, invoices and
+receipts for any number of customers with one query per entity type and
+groups them per customer in Python. `run_statements` (the Statement Run
+background job) renders the statements in chunks of customers: HTML is
+rendered in this process, PDFs in a spawned process pool, and each chunk
+is appended to the run's zip before the run records the last completed
+customer, so a failed or stopped run resumes where it left off.
+"""
+
+import os
+import zipfile
+
+import frappe
+from frappe.utils import cint, flt, get_site_path, getdate, today
+
+from realapp.utils import pdf_pool, render_pdf
+
+CHUNK_SIZE = 200
+TEMPLATE = "realapp/templates/statement_of_account.html"
+
+
+def get_statement_data(customers, as_on=None, company=None):
+    """{customer: statement} for the given customers; five queries regardless of how many."""
+    if not customers:
+        return {}
+    as_on = getdate(as_on or today())
+    values = {"customers": tuple(customers), "as_on": as_on, "company": company}
+    company_cond = "AND bo.company = %(company)s" if company else ""
+
+    # a booking belongs to a customer directly, or through the customer on its invoices
+    links = frappe.db.sql(
+        f"""
+        SELECT bo.name AS booking_order, bo.party AS customer
+        FROM `tabBooking Order` bo
+        WHERE bo.docstatus = 1 AND bo.party_type = 'Customer' AND bo.party IN %(customers)s {company_cond}
+        UNION
+        SELECT DISTINCT si.booking_order, si.customer
+        FROM `tabSales Invoice` si
+        JOIN `tabBooking Order` bo ON bo.name = si.booking_order
+        WHERE si.docstatus = 1 AND si.customer IN %(customers)s AND bo.docstatus = 1 {company_cond}
+        """,
+        values,
+        as_dict=True,
+    )
+    statements = {c: _empty_statement(c, as_on) for c in customers}
+    customer_of = {l.booking_order: l.customer for l in links}
+    if not customer_of:
+        return statements
+    values["booking_orders"] = tuple(customer_of)
+
+    bookings = frappe.db.sql(
+        """
+        SELECT name, booking_date, project, block, unit, salable_area, basic_price_per_sft,
+            net_payable, grand_total_payable
+        FROM `tabBooking Order`
+        WHERE name IN %(booking_orders)s
+        ORDER BY booking_date, name
+        """,
+        values,
+        as_dict=True,
+    )
+    by_booking = {}
+    for bo in bookings:
+        bo.schedule = []
+        by_booking[bo.name] = bo
+        statements[customer_of[bo.name]]["bookings"].append(bo)
+
+    for row in frappe.db.sql(
+        """
+        SELECT parent, scheme_code, milestone, milestone_date, amount, gst_amount, tds_amount, net_payable,
+            invoice_status, sales_invoice
+        FROM `tabBooking Order Payment Schedule`
+        WHERE parenttype = 'Booking Order' AND parent IN %(booking_orders)s
+        ORDER BY parent, idx
+        """,
+        values,
+        as_dict=True,
+    ):
+        by_booking[row.parent].schedule.append(row)
+
+    for inv in frappe.db.sql(
+        """
+        SELECT name, customer, booking_order, posting_date, due_date, grand_total, rounded_total,
+            outstanding_amount
+        FROM `tabSales Invoice`
+        WHERE docstatus = 1 AND booking_order IN %(booking_orders)s AND posting_date <= %(as_on)s
+        ORDER BY posting_date, name
+        """,
+        values,
+        as_dict=True,
+    ):
+        st = statements.get(inv.customer) or statements[customer_of[inv.booking_order]]
+        inv.amount = flt(inv.rounded_total or inv.grand_total)
+        inv.overdue = inv.outstanding_amount > 0 and getdate(inv.due_date) < as_on
+        st["invoices"].append(inv)
+
+    for pay in frappe.db.sql(
+        """
+        SELECT pe.name, pe.posting_date, pe.mode_of_payment, pe.reference_no, si.customer, si.booking_order,
+            per.reference_name AS sales_invoice, per.allocated_amount
+        FROM `tabPayment Entry Reference` per
+        JOIN `tabPayment Entry` pe ON pe.name = per.parent
+        JOIN `tabSales Invoice` si ON si.name = per.reference_name
+        WHERE per.docstatus = 1 AND per.reference_doctype = 'Sales Invoice'
+          AND si.booking_order IN %(booking_orders)s AND pe.posting_date <= %(as_on)s
+        ORDER BY pe.posting_date, pe.name
+        """,
+        values,
+        as_dict=True,
+    ):
+        st = statements.get(pay.customer) or statements[customer_of[pay.booking_order]]
+        st["receipts"].append(pay)
+
+    for st in statements.values():
+        _set_totals(st)
+    return statements
+
+
+def get_customer_statement(customer, as_on=None):
+    return get_statement_data([customer], as_on=as_on)[customer]
+
+
+# ----------------- Statement Run job -----------------
+
+def run_statements(run):
+    doc = frappe.get_doc("Statement Run", run)
+    doc.db_set("status", "Running")
+    frappe.db.commit()
+
+    customers = get_run_customers(doc)
+    done = cint(doc.completed_customers)
+    total = done + len(customers)
+    path = get_zip_path(doc.name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    pool = pdf_pool(doc.workers)
+    try:
+        for start in range(0, len(customers), CHUNK_SIZE):
+            chunk = customers[start:start + CHUNK_SIZE]
+            data = get_statement_data(chunk, as_on=doc.as_on_date, company=doc.company)
+            htmls = [_render_html(data[c], doc) for c in chunk]
+
+            pdfs = pool.map(render_pdf, htmls)
+            with zipfile.ZipFile(path, "a", compression=zipfile.ZIP_DEFLATED) as zf:
+                # a chunk interrupted after writing may be re-rendered on resume
+                written = set(zf.namelist())
+                for customer, pdf in zip(chunk, pdfs):
+                    if _pdf_name(customer) not in written:
+                        zf.writestr(_pdf_name(customer), pdf)
+
+            done += len(chunk)
+            doc.db_set({"completed_customers": done, "last_completed_customer": chunk[-1]})
+            frappe.db.commit()
+            _progress(doc.name, done, total)
+
+        _attach_zip(doc, path)
+        doc.db_set("status", "Completed")
+    except Exception:
+        frappe.db.rollback()
+        doc.db_set("status", "Failed")
+        frappe.log_error(title=f"Statement run {doc.name} failed")
+        raise
+    finally:
+        pool.shutdown()
+        frappe.db.commit()
+
+
+def get_run_customers(doc):
+    """Customers with a submitted booking in scope, after the last completed one (resume point)."""
+    conditions = ["bo.docstatus = 1"]
+    if doc.company:
+        conditions.append("bo.company = %(company)s")
+    if doc.project:
+        conditions.append("bo.project = %(project)s")
+    if doc.block:
+        conditions.append("bo.block = %(block)s")
+
+    return frappe.db.sql_list(
+        f"""
+        SELECT customer FROM (
+            SELECT bo.party AS customer FROM `tabBooking Order` bo
+            WHERE {" AND ".join(conditions)} AND bo.party_type = 'Customer'
+            UNION
+            SELECT si.customer FROM `tabSales Invoice` si
+            JOIN `tabBooking Order` bo ON bo.name = si.booking_order
+            WHERE {" AND ".join(conditions)} AND si.docstatus = 1
+        ) c
+        WHERE customer > %(after)s
+        ORDER BY customer
+        """,
+        {"company": doc.company, "project": doc.project, "block": doc.block, "after": doc.last_completed_customer or ""},
+    )
+
+
+def get_zip_path(run):
+    return get_site_path("private", "files", "statements", f"{run}.zip")
+
+
+# ----------------- Helpers -----------------
+
+def _empty_statement(customer, as_on):
+    return {"customer": customer, "as_on": as_on, "bookings": [], "invoices": [], "receipts": [], "totals": {}}
+
+
+def _set_totals(st):
+    scheduled = sum(flt(r.net_payable) for bo in st["bookings"] for r in bo.schedule)
+    invoiced = sum(inv.amount for inv in st["invoices"])
+    received = sum(flt(p.allocated_amount) for p in st["receipts"])
+    st["totals"] = {
+        "booking_value": sum(flt(bo.net_payable) for bo in st["bookings"]),
+        "scheduled": scheduled,
+        "invoiced": invoiced,
+        "received": received,
+        "outstanding": sum(flt(inv.outstanding_amount) for inv in st["invoices"]),
+        "overdue": sum(flt(inv.outstanding_amount) for inv in st["invoices"] if inv.overdue),
+        "not_yet_invoiced": max(scheduled - invoiced, 0),
+    }
+
+
+def _render_html(statement, doc):
+    return frappe.render_template(
+        TEMPLATE,
+        {
+            "statement": statement,
+            "customer_name": frappe.get_cached_value("Customer", statement["customer"], "customer_name"),
+            "company": doc.company,
+        },
+    )
+
+
+def _pdf_name(customer):
+    return "".join(c if c.isalnum() or c in " -_." else "_" for c in customer) + ".pdf"
+
+
+def _attach_zip(doc, path):
+    file_url = f"/private/files/statements/{doc.name}.zip"
+    if not frappe.db.exists("File", {"file_url": file_url}):
+        frappe.get_doc({
+            "doctype": "File",
+            "file_url": file_url,
+            "file_name": os.path.basename(path),
+            "attached_to_doctype": doc.doctype,
+            "attached_to_name": doc.name,
+            "is_private": 1,
+        }).insert(ignore_permissions=True)
+    doc.db_set("output_file", file_url)
+
+
+def _progress(run, done, total):
+    frappe.publish_realtime(
+        "realapp_statement_progress",
+        {"run": run, "progress": done, "total": max(total, 1)},
+        doctype="Statement Run",
+        docname=run,
+    )
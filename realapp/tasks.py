@@ -0,0 +1,92 @@
+# Copyright (c) 2025, surendhranath
+# For license information, please see license.txt
+
+"""Scheduled jobs for realapp."""
+
+import frappe
+from frappe.utils import getdate, today
+
+from realapp.utils import bulk_insert_rows
+
+DIMENSIONS = ("project", "block", "status", "flat_type")
+INVENTORY_FIELDS = ("project", "block", "status", "flat_type", "unit_count", "salable_area", "unit_value")
+COLLECTION_FIELDS = (
+    "project",
+    "block",
+    "booked_units",
+    "open_invoices",
+    "invoiced_amount",
+    "collected_amount",
+    "outstanding_amount",
+    "overdue_amount",
+)
+
+
+def take_daily_snapshots(snapshot_date=None):
+    """
+    Append today's aggregated inventory and collection figures to the
+    snapshot tables. Re-running for the same date replaces that day's rows.
+    """
+    snapshot_date = getdate(snapshot_date or today())
+
+    inventory = frappe.db.sql(
+        """
+        SELECT project, block, IFNULL(status, '') AS status, IFNULL(flat_type, '') AS flat_type,
+            COUNT(*) AS unit_count,
+            SUM(IFNULL(salable_area, 0)) AS salable_area,
+            SUM(IFNULL(full_unit_value, 0)) AS unit_value
+        FROM `tabUnit`
+        GROUP BY project, block, status, flat_type
+        """,
+        as_dict=True,
+    )
+    _replace_snapshot("Inventory Snapshot", snapshot_date, INVENTORY_FIELDS, inventory)
+    _replace_snapshot("Collection Snapshot", snapshot_date, COLLECTION_FIELDS, _collections_by_block(snapshot_date))
+
+
+# ----------------- Helpers -----------------
+
+def _collections_by_block(snapshot_date):
+    blocks = {}
+    for row in frappe.db.sql(
+        """
+        SELECT project, block, COUNT(*) AS booked_units
+        FROM `tabBooking Order`
+        WHERE docstatus = 1
+        GROUP BY project, block
+        """,
+        as_dict=True,
+    ):
+        blocks[(row.project, row.block)] = row
+
+    if frappe.db.table_exists("Sales Invoice"):
+        for row in frappe.db.sql(
+            """
+            SELECT realapp_project AS project, realapp_block AS block,
+                SUM(outstanding_amount > 0) AS open_invoices,
+                SUM(IF(rounded_total, rounded_total, grand_total)) AS invoiced_amount,
+                SUM(IF(rounded_total, rounded_total, grand_total) - outstanding_amount) AS collected_amount,
+                SUM(outstanding_amount) AS outstanding_amount,
+                SUM(IF(due_date < %(date)s, outstanding_amount, 0)) AS overdue_amount
+            FROM `tabSales Invoice`
+            WHERE docstatus = 1 AND IFNULL(booking_order, '') != ''
+            GROUP BY realapp_project, realapp_block
+            """,
+            {"date": snapshot_date},
+            as_dict=True,
+        ):
+            blocks.setdefault((row.project, row.block), frappe._dict(booked_units=0)).update(row)
+
+    return list(blocks.values())
+
+
+def _replace_snapshot(doctype, snapshot_date, fields, rows):
+    frappe.db.delete(doctype, {"snapshot_date": snapshot_date})
+    bulk_insert_rows(
+        doctype,
+        ("snapshot_date", *fields),
+        [
+            {"snapshot_date": snapshot_date, **{f: row.get(f) if f in DIMENSIONS else (row.get(f) or 0) for f in fields}}
+            for row in rows
+        ],
+    )
@@ -0,0 +1,21 @@
+# Copyright (c) 2025, surendhranath
+# For license information, please see license.txt
+
+import frappe
+
+from realapp.portal import validate_public_project, get_availability_listing, get_public_availability
+
+# the listing is cached per project by realapp.portal; the page cache is keyed on the path alone
+no_cache = 1
+
+
+def get_context(context):
+    project = frappe.form_dict.project
+    validate_public_project(project)
+
+    availability = get_public_availability(project)
+    context.title = f"Available Units - {project}"
+    context.project = project
+    context.available_units = availability["available_units"]
+    context.listing = get_availability_listing(project)
+    context.show_sidebar = False
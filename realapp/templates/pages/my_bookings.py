@@ -0,0 +1,17 @@
+# Copyright (c) 2025, surendhranath
+# For license information, please see license.txt
+
+import frappe
+
+from realapp.portal import get_buyer_statements, get_portal_customers
+
+no_cache = 1
+
+
+def get_context(context):
+    if frappe.session.user == "Guest":
+        frappe.throw("Log in to see your bookings.", frappe.PermissionError)
+
+    context.title = "My Bookings"
+    context.show_sidebar = True
+    context.statements = get_buyer_statements(get_portal_customers(frappe.session.user))
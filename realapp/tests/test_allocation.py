@@ -0,0 +1,32 @@
+# Copyright (c) 2025, surendhranath and Contributors
+# See license.txt
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from realapp.allocation import _receipt_customer, allocate
+
+
+def _inv(name, outstanding, customer="_Test Customer"):
+	return frappe._dict(name=name, outstanding_amount=outstanding, customer=customer)
+
+
+class TestReceiptAllocation(FrappeTestCase):
+	def test_oldest_due_first(self):
+		invoices = [_inv("SI-1", 100), _inv("SI-2", 300), _inv("SI-3", 500)]
+		result = [(inv.name, amount) for inv, amount in allocate(350, invoices)]
+		self.assertEqual(result, [("SI-1", 100), ("SI-2", 250)])
+
+	def test_excess_is_left_unallocated(self):
+		result = allocate(1000, [_inv("SI-1", 100), _inv("SI-2", 200)])
+		self.assertEqual(sum(amount for _inv, amount in result), 300)
+
+	def test_receipt_goes_to_the_invoiced_customer(self):
+		lead_booking = frappe._dict(party_type="Lead", party="CRM-LEAD-0001")
+		self.assertEqual(_receipt_customer(lead_booking, [_inv("SI-1", 100, "Converted Buyer")]), "Converted Buyer")
+
+		with patch("realapp.allocation.ensure_customer_from_party", return_value=frappe._dict(name="New Buyer")) as ensure:
+			self.assertEqual(_receipt_customer(lead_booking, []), "New Buyer")
+		ensure.assert_called_once_with("CRM-LEAD-0001", "Lead")
@@ -0,0 +1,72 @@
+# Copyright (c) 2025, surendhranath and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from realapp.feed import get_changes
+from realapp.tests.utils import PREFIX, RealappTestCase, make_block_with_units, make_booking_order, make_cost_sheet
+
+
+def _drain(doctype, cursor=None, limit=5):
+	records, tombstones = [], []
+	while True:
+		page = get_changes(doctype, cursor=cursor, limit=limit)
+		records += page["records"]
+		tombstones += page["tombstones"]
+		cursor = page["cursor"]
+		if not page["has_more"]:
+			return records, tombstones, cursor
+
+
+class TestChangeFeed(FrappeTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		cls.units = make_block_with_units(f"{PREFIX} Feed")
+
+	def test_keyset_pages_cover_every_change_once(self):
+		records, _tombstones, _cursor = _drain("Unit")
+		names = [r.name for r in records]
+		self.assertEqual(len(names), len(set(names)))
+		self.assertTrue(set(self.units) <= set(names))
+
+	def test_resuming_from_cursor_returns_only_new_changes(self):
+		*_, cursor = _drain("Unit")
+		frappe.db.set_value("Unit", self.units[0], "status", "Blocked")
+		records, _tombstones, _cursor = _drain("Unit", cursor)
+		self.assertEqual([r.name for r in records], [self.units[0]])
+
+	def test_deletion_is_a_tombstone(self):
+		*_, cursor = _drain("Unit")
+		frappe.delete_doc("Unit", self.units[-1])
+		_records, tombstones, _cursor = _drain("Unit", cursor)
+		self.assertEqual([(t["name"], t["reason"]) for t in tombstones], [(self.units[-1], "deleted")])
+
+	def test_tombstones_tied_with_records_are_returned_once(self):
+		*_, cursor = _drain("Unit")
+		frappe.delete_doc("Unit", self.units[-2])
+		stamp = frappe.db.get_value("Deleted Document", {"deleted_name": self.units[-2]}, "creation")
+		# a record changed at the very timestamp of the deletion
+		frappe.db.set_value("Unit", self.units[1], "modified", stamp, update_modified=False)
+
+		records, tombstones, _cursor = _drain("Unit", cursor, limit=1)
+		self.assertEqual([r.name for r in records], [self.units[1]])
+		self.assertEqual([t["name"] for t in tombstones], [self.units[-2]])
+
+	def test_child_tables_are_inlined(self):
+		records, *_ = _drain("Block", limit=50)
+		block = next(r for r in records if r.name == f"{PREFIX} Feed")
+		self.assertIn("tower_milestones", block)
+
+
+class TestChangeFeedCancellations(RealappTestCase):
+	def test_cancelled_document_is_a_tombstone(self):
+		*_, cursor = _drain("Booking Order")
+		bo = make_booking_order(make_cost_sheet(self.fixture.units[-8], self.fixture))
+		bo.submit()
+		bo.cancel()
+
+		records, tombstones, _cursor = _drain("Booking Order", cursor)
+		self.assertNotIn(bo.name, [r.name for r in records])
+		self.assertEqual([(t["name"], t["reason"]) for t in tombstones], [(bo.name, "cancelled")])
@@ -0,0 +1,38 @@
+# Copyright (c) 2025, surendhranath and Contributors
+# See license.txt
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from realapp.instrumentation import instrument
+
+
+@instrument("test.inner")
+def _inner():
+	return frappe.db.sql("SELECT 1")
+
+
+@instrument("test.outer")
+def _outer():
+	return [_inner(), _inner()]
+
+
+class TestInstrumentation(FrappeTestCase):
+	def tearDown(self):
+		frappe.local.realapp_perf_sampled = None
+
+	def test_sampling_decided_once_and_only_outermost_recorded(self):
+		settings = frappe._dict(enable_performance_tracking=1, performance_sample_rate=100)
+		frappe.local.realapp_perf_sampled = None
+		with (
+			patch("frappe.get_cached_doc", return_value=settings) as get_settings,
+			patch("realapp.instrumentation._record") as record,
+		):
+			_outer()
+			_outer()
+
+		get_settings.assert_called_once()
+		self.assertEqual([c.args[0] for c in record.call_args_list], ["test.outer", "test.outer"])
+		self.assertEqual(record.call_args.args[1]["queries"], 2)
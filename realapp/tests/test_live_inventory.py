@@ -0,0 +1,66 @@
+# Copyright (c) 2025, surendhranath and Contributors
+# See license.txt
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from realapp.live_inventory import (
+	FLUSH_KEY,
+	_key,
+	_push,
+	build_snapshot,
+	flush_inventory_deltas,
+	flush_pending_inventory,
+	get_sequence,
+)
+
+PROJECT = "_Test Realapp Live"
+
+
+class TestLiveInventory(FrappeTestCase):
+	def setUp(self):
+		frappe.cache().delete(_key(FLUSH_KEY, PROJECT))
+
+	def test_burst_within_window_is_one_message(self):
+		seq = get_sequence(PROJECT)
+		with patch("frappe.enqueue") as enqueue, patch("frappe.publish_realtime") as publish:
+			_push(PROJECT, ["U-1", "Blocked", 5000, 100])
+			_push(PROJECT, ["U-2", "Booked", 5000, 100])
+			_push(PROJECT, ["U-1", "Booked", 5100, 102])
+			_push(PROJECT, ["U-3", "Blocked", 5200, 104])
+			flush_inventory_deltas(**enqueue.call_args.kwargs)
+
+		# one flush per window, however many changes
+		self.assertEqual(enqueue.call_count, 1)
+		publish.assert_called_once()
+		message = publish.call_args.args[1]
+		self.assertEqual(message["seq"], seq + 1)
+		self.assertEqual(
+			sorted(message["units"]),
+			[["U-1", "Booked", 5100, 102], ["U-2", "Booked", 5000, 100], ["U-3", "Blocked", 5200, 104]],
+		)
+
+	def test_tail_of_a_window_goes_out_with_the_scheduler(self):
+		with patch("frappe.enqueue") as enqueue, patch("frappe.publish_realtime") as publish:
+			_push(PROJECT, ["U-4", "Blocked", 5000, 100])
+			flush_inventory_deltas(PROJECT)
+			# inside the window: queued, no new flush
+			_push(PROJECT, ["U-4", "Booked", 5000, 100])
+			self.assertEqual(enqueue.call_count, 1)
+
+			flush_pending_inventory()
+			self.assertEqual(publish.call_count, 1)
+
+			# the window has closed and nothing else changed
+			frappe.cache().delete(_key(FLUSH_KEY, PROJECT))
+			flush_pending_inventory()
+
+		self.assertEqual(publish.call_count, 2)
+		self.assertEqual(publish.call_args.args[1]["units"], [["U-4", "Booked", 5000, 100]])
+
+	def test_snapshot_carries_current_sequence(self):
+		snapshot = build_snapshot(PROJECT)
+		self.assertEqual(snapshot["seq"], get_sequence(PROJECT))
+		self.assertEqual(snapshot["fields"][0], "name")
@@ -0,0 +1,45 @@
+# Copyright (c) 2025, surendhranath and Contributors
+# See license.txt
+
+import unittest
+
+from frappe.tests.utils import FrappeTestCase
+
+from realapp.cache import invalidate_customers
+from realapp.portal import PRICE_BAND, _price_band, get_buyer_statements
+from realapp.tests.utils import erpnext_installed
+
+
+class TestAvailabilityPortal(FrappeTestCase):
+	def test_price_band_rounds_outwards(self):
+		self.assertEqual(_price_band(7_420_000, 8_130_000), [7_000_000, 8_500_000])
+
+	def test_band_hides_a_single_price(self):
+		for price in (7_420_000, 7_500_000):
+			low, high = _price_band(price, price)
+			self.assertEqual(high - low, PRICE_BAND)
+
+	def test_unpriced_units_have_no_band(self):
+		self.assertIsNone(_price_band(0, 0))
+
+
+class TestBuyerPortal(FrappeTestCase):
+	@classmethod
+	def setUpClass(cls):
+		if not erpnext_installed():
+			raise unittest.SkipTest("Buyer statements need ERPNext")
+		super().setUpClass()
+
+	def test_statements_are_cached_per_customer(self):
+		customers = ["_Test Portal Buyer 1", "_Test Portal Buyer 2"]
+		get_buyer_statements(customers)
+		with self.assertQueryCount(0):
+			get_buyer_statements(customers)
+
+	def test_customer_event_invalidates_only_that_customer(self):
+		customers = ["_Test Portal Buyer 3", "_Test Portal Buyer 4"]
+		get_buyer_statements(customers)
+		invalidate_customers(customers[0])
+		# the one stale statement is rebuilt in a single set-based pass
+		with self.assertQueryCount(1):
+			get_buyer_statements(customers)
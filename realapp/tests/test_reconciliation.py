@@ -0,0 +1,47 @@
+# Copyright (c) 2025, surendhranath and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import getdate
+
+from realapp.reconciliation import InvoiceIndex
+
+
+def _inv(name, amount, due_date, unit, flat_number):
+	return frappe._dict(
+		name=name, outstanding_amount=amount, due_date=due_date, unit=unit, flat_number=flat_number,
+		customer="_Test Customer", booking_order=f"BO-{name}",
+	)
+
+
+def _line(amount, date, narration, reference_no=""):
+	return {"amount": amount, "transaction_date": getdate(date), "narration": narration, "reference_no": reference_no}
+
+
+class TestBankStatementMatching(FrappeTestCase):
+	def setUp(self):
+		self.index = InvoiceIndex(
+			[
+				_inv("ACC-SINV-0001", 250000, "2026-03-01", "T01-F03-301", "301"),
+				_inv("ACC-SINV-0002", 250000, "2026-03-01", "T01-F04-401", "401"),
+				_inv("ACC-SINV-0003", 180000, "2026-05-01", "T02-F01-101", "101"),
+			],
+			window_days=10,
+		)
+
+	def test_unit_in_narration_disambiguates_equal_amounts(self):
+		inv, confidence, basis = self.index.best_match(_line(250000, "2026-03-03", "NEFT CR FLAT 401 TOWER 1"))
+		self.assertEqual(inv.name, "ACC-SINV-0002")
+		self.assertGreaterEqual(confidence, 85)
+		self.assertIn("unit", basis)
+
+	def test_invoice_is_not_matched_twice(self):
+		first, *_ = self.index.best_match(_line(180000, "2026-05-02", "IMPS T02 F01 101"))
+		second, *_ = self.index.best_match(_line(180000, "2026-05-02", "IMPS T02 F01 101"))
+		self.assertEqual(first.name, "ACC-SINV-0003")
+		self.assertIsNone(second)
+
+	def test_unrelated_credit_stays_unmatched(self):
+		inv, _confidence, _basis = self.index.best_match(_line(999, "2026-01-01", "INTEREST CREDIT"))
+		self.assertIsNone(inv)
@@ -0,0 +1,48 @@
+# Copyright (c) 2025, surendhranath and Contributors
+# See license.txt
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from realapp.events.sales_invoice import _matched_schedule_rows
+from realapp.patches.custom.backfill_schedule_invoice_status import assign_item_lines
+
+SCHEDULE = [
+	frappe._dict(name="R-1", scheme_code="C-1", milestone_item="Instalment", sales_invoice="SINV-1", invoice_status="Invoiced"),
+	frappe._dict(name="R-2", scheme_code="C-2", milestone_item="Instalment", sales_invoice=None, invoice_status="Not Invoiced"),
+	frappe._dict(name="R-3", scheme_code="C-3", milestone_item="Instalment", sales_invoice=None, invoice_status="Not Invoiced"),
+]
+
+
+def _invoice(name, *item_codes):
+	return frappe._dict(
+		name=name,
+		booking_order="BO-1",
+		items=[frappe._dict(item_code=code, amount=100) for code in item_codes],
+	)
+
+
+class TestSalesInvoiceEvents(FrappeTestCase):
+	def test_legacy_items_match_first_uninvoiced_rows(self):
+		with patch("frappe.get_all", return_value=SCHEDULE):
+			matched = _matched_schedule_rows(_invoice("SINV-2", "Instalment", "Instalment"))
+		self.assertEqual([row.name for row, _amount in matched], ["R-2", "R-3"])
+
+	def test_fully_invoiced_item_still_reports_duplicate(self):
+		schedule = [frappe._dict(SCHEDULE[0])]
+		with patch("frappe.get_all", return_value=schedule):
+			matched = _matched_schedule_rows(_invoice("SINV-2", "Instalment"))
+		self.assertEqual([row.sales_invoice for row, _amount in matched], ["SINV-1"])
+
+	def test_backfill_gives_item_only_lines_one_row_each(self):
+		rows = {"BO-1": [frappe._dict(r) for r in SCHEDULE]}
+		lines = [
+			frappe._dict(invoice="SINV-2", booking_order="BO-1", item_code="Instalment", amount=100),
+			frappe._dict(invoice="SINV-3", booking_order="BO-1", item_code="Instalment", amount=200),
+			frappe._dict(invoice="SINV-4", booking_order="BO-1", item_code="Instalment", amount=300),
+		]
+		assigned = assign_item_lines(lines, rows)
+		# R-1 stays with SINV-1; the third invoice finds no open row rather than taking one over
+		self.assertEqual([(row.name, invoice, amount) for row, invoice, amount in assigned], [("R-2", "SINV-2", 100), ("R-3", "SINV-3", 200)])
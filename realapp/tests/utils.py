@@ -0,0 +1,185 @@
+# Copyright (c) 2025, surendhranath and Contributors
+# See license.txt
+
+"""Shared fixture and query budgets for realapp workflow tests."""
+
+import unittest
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, today
+
+# Maximum SQL queries per workflow step. Raise a budget only together with
+# the change that needs it, so extra reads in a hot path are a conscious decision.
+QUERY_BUDGETS = {
+	"unit_save": 35,
+	"cost_sheet_insert": 70,
+	"cost_sheet_resave_unchanged": 25,
+	"quote_matrix": 15,
+	"make_booking_order": 30,
+	"booking_order_insert": 70,
+	"booking_order_resave_unchanged": 30,
+	"booking_order_submit": 90,
+	"booking_order_cancel": 90,
+	"sales_invoice_per_milestone": 80,
+	"collection_report": 6,
+	"cash_flow_projection_cached": 0,
+}
+
+PREFIX = "_Test Realapp"
+SCHEME_CODES = ("C-1", "C-2", "C-3", "C-4")
+FLOORS_PER_BLOCK = 3
+UNITS_PER_FLOOR = 4
+
+
+class RealappTestCase(FrappeTestCase):
+	"""Workflow tests on `make_realapp_fixture()`; skipped without ERPNext (and a Company, unless not needed)."""
+
+	needs_company = True
+
+	@classmethod
+	def setUpClass(cls):
+		if not erpnext_installed() or (cls.needs_company and not get_company()):
+			raise unittest.SkipTest(f"{cls.__name__} needs ERPNext{' and a Company' if cls.needs_company else ''}")
+		super().setUpClass()
+		cls.fixture = make_realapp_fixture()
+
+
+def erpnext_installed():
+	return "erpnext" in frappe.get_installed_apps()
+
+
+def get_company():
+	return frappe.db.get_value("Company", {"company_name": "_Test Company"}) or frappe.db.get_value("Company", {})
+
+
+def make_realapp_fixture(blocks=2):
+	"""Project → blocks → floors → units, with a payment scheme template and milestone items."""
+	project = _get_or_insert("Project", {"project_name": f"{PREFIX} Project"}, "project_name")
+	items = [_make_milestone_item(code) for code in SCHEME_CODES]
+	template = _make_template(items)
+	customer = _get_or_insert(
+		"Customer",
+		{
+			"customer_name": f"{PREFIX} Buyer",
+			"customer_group": "All Customer Groups",
+			"territory": "All Territories",
+		},
+		"customer_name",
+	)
+
+	units = []
+	for b in range(1, blocks + 1):
+		units += make_block_with_units(f"{PREFIX} B{b}", project, template)
+
+	return frappe._dict(project=project, template=template, customer=customer, items=items, units=units)
+
+
+def make_block_with_units(block_name, project=None, template=None):
+	"""Block with FLOORS_PER_BLOCK floors of UNITS_PER_FLOOR units; needs no ERPNext doctypes."""
+	block = _make_block(block_name, project, template)
+	units = []
+	for f in range(1, FLOORS_PER_BLOCK + 1):
+		floor = _get_or_insert(
+			"Floor",
+			{"floor_name": f"{block}-F{f}", "block": block, "floor_number": f},
+			"floor_name",
+		)
+		for u in range(1, UNITS_PER_FLOOR + 1):
+			units.append(make_unit(f"{floor}-{u:02d}", floor))
+	return units
+
+
+def make_unit(unit_name, floor, salable_area=1450):
+	if frappe.db.exists("Unit", unit_name):
+		return unit_name
+	return frappe.get_doc({
+		"doctype": "Unit",
+		"unit_name": unit_name,
+		"floor_name": floor,
+		"salable_area": salable_area,
+		"basic_price_per_sft": 6500,
+		"car_parking_amount": 300000,
+		"flat_type": "3 BHK",
+		"facing": "East",
+		"status": "Available",
+	}).insert().name
+
+
+def make_cost_sheet(unit, fixture, cost_sheet_type="Standard"):
+	return frappe.get_doc({
+		"doctype": "Cost Sheet",
+		"cost_sheet_type": cost_sheet_type,
+		"party_type": "Customer",
+		"party": fixture.customer,
+		"unit": unit,
+		"payment_scheme_template": fixture.template,
+	}).insert()
+
+
+def make_booking_order(cost_sheet, company=None):
+	from realapp.realapp.doctype.cost_sheet.cost_sheet import make_booking_order as _make
+
+	bo = _make(cost_sheet.name)
+	bo.company = company or get_company()
+	bo.booking_date = today()
+	return bo.insert()
+
+
+# ----------------- Helpers -----------------
+
+def _get_or_insert(doctype, values, key):
+	name = frappe.db.get_value(doctype, {key: values[key]})
+	if name:
+		return name
+	return frappe.get_doc({"doctype": doctype, **values}).insert().name
+
+
+def _make_milestone_item(code):
+	return _get_or_insert(
+		"Item",
+		{
+			"item_code": f"{PREFIX} Milestone {code}",
+			"item_group": "All Item Groups",
+			"stock_uom": "Nos",
+			"is_stock_item": 0,
+		},
+		"item_code",
+	)
+
+
+def _make_template(items):
+	name = f"{PREFIX} 25x4 Scheme"
+	if frappe.db.exists("Payment Scheme Template", name):
+		return name
+	particulars = ["Booking Specific", "Tower Specific", "Tower Specific", "Unit Specific"]
+	return frappe.get_doc({
+		"doctype": "Payment Scheme Template",
+		"scheme_name": name,
+		"is_active": 1,
+		"payment_scheme_details": [
+			{
+				"scheme_code": code,
+				"milestone": f"Milestone {code}",
+				"milestone_item": item,
+				"particulars": particulars[i],
+				"percentage": 25,
+			}
+			for i, (code, item) in enumerate(zip(SCHEME_CODES, items))
+		],
+	}).insert().name
+
+
+def _make_block(name, project, template):
+	if frappe.db.exists("Block", name):
+		return name
+	return frappe.get_doc({
+		"doctype": "Block",
+		"block": name,
+		"project": project,
+		"available_payment_schemes": [{"payment_scheme_template": template, "is_default": 1}] if template else [],
+		"tower_milestones": [
+			{"scheme_code": code, "milestone": f"Milestone {code}", "milestone_date": add_days(today(), 30 * i)}
+			for i, code in enumerate(SCHEME_CODES)
+		],
+	}).insert().name
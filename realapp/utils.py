@@ -0,0 +1,50 @@
+# Copyright (c) 2025, surendhranath
+# For license information, please see license.txt
+
+"""Small shared helpers for realapp batch jobs."""
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import frappe
+from frappe.utils import cint, now
+
+STANDARD_COLUMNS = ("name", "creation", "modified", "owner", "modified_by", "docstatus")
+
+
+def bulk_insert_rows(doctype, fields, rows, chunk_size=10000):
+    """
+    Insert plain rows (dicts) into a non-submittable doctype in one statement
+    per chunk, filling the standard columns. Bypasses controllers and hooks.
+    """
+    if not rows:
+        return
+
+    stamp, user = now(), frappe.session.user if getattr(frappe.local, "session", None) else "Administrator"
+    values = [
+        (frappe.generate_hash(length=10), stamp, stamp, user, user, 0) + tuple(row.get(f) for f in fields)
+        for row in rows
+    ]
+    frappe.db.bulk_insert(doctype, (*STANDARD_COLUMNS, *fields), values, chunk_size=chunk_size)
+
+
+def pdf_pool(workers=4):
+    """Process pool for rendering PDFs; each spawned worker connects to the current site."""
+    return ProcessPoolExecutor(
+        max_workers=max(cint(workers), 1),
+        mp_context=get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(frappe.local.site, frappe.local.sites_path),
+    )
+
+
+def render_pdf(html):
+    """Pool task: HTML to PDF bytes."""
+    from frappe.utils.pdf import get_pdf
+
+    return get_pdf(html)
+
+
+def _init_worker(site, sites_path):
+    frappe.init(site=site, sites_path=sites_path)
+    frappe.connect()